@@ -0,0 +1,35 @@
+"""Admin configuration for analytics app."""
+
+from django.contrib import admin
+from .models import DailyArticleUsage, Leaderboard
+
+
+@admin.register(DailyArticleUsage)
+class DailyArticleUsageAdmin(admin.ModelAdmin):
+    """Read-only admin for the daily usage rollups."""
+    
+    list_display = ('date', 'article', 'journal', 'views', 'unique_views', 'downloads', 'unique_downloads')
+    list_filter = ('journal',)
+    date_hierarchy = 'date'
+    raw_id_fields = ('article', 'journal')
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(Leaderboard)
+class LeaderboardAdmin(admin.ModelAdmin):
+    """Read-only admin for the precomputed top lists."""
+    
+    list_display = ('kind', 'journal', 'updated_at')
+    list_filter = ('kind',)
+    raw_id_fields = ('journal',)
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
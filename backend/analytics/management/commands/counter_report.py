@@ -0,0 +1,60 @@
+"""
+Management command to write a COUNTER-style usage report.
+
+Output is streamed row by row to stdout or to a file, so reports covering
+many years of article-level usage don't have to fit in memory.
+"""
+
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from analytics import reports
+
+
+class Command(BaseCommand):
+    help = 'Write a COUNTER-style (total/unique item requests per month) usage report as CSV or TSV'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--start', help='First month, YYYY-MM (default: 12 months ago)')
+        parser.add_argument('--end', help='Last month, YYYY-MM (default: this month)')
+        parser.add_argument(
+            '--journal',
+            type=int,
+            action='append',
+            help='Only include this journal ID (may be repeated)',
+        )
+        parser.add_argument('--level', choices=reports.LEVELS, default='journal')
+        parser.add_argument('--format', choices=list(reports.FORMATS), default='csv')
+        parser.add_argument('--output', help='File to write (default: stdout)')
+
+    def _month(self, value, default):
+        if not value:
+            return default
+        parsed = parse_date(value) if len(value) > 7 else parse_date(f'{value}-01')
+        if parsed is None:
+            raise CommandError(f'Invalid month "{value}" (use YYYY-MM).')
+        return parsed
+
+    def handle(self, *args, **options):
+        today = timezone.localdate()
+        end = self._month(options['end'], today)
+        start = self._month(options['start'], reports.month_start(end - timedelta(days=335)))
+        if start > end:
+            raise CommandError('--start must not be after --end.')
+
+        lines = reports.stream_counter_report(
+            start, end, options['level'], options['journal'], options['format']
+        )
+        if options['output']:
+            count = 0
+            with open(options['output'], 'w', newline='', encoding='utf-8') as handle:
+                for line in lines:
+                    handle.write(line)
+                    count += 1
+            self.stderr.write(self.style.SUCCESS(f'Wrote {count} lines to {options["output"]}.'))
+        else:
+            for line in lines:
+                self.stdout.write(line, ending='')
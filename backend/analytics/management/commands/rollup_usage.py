@@ -0,0 +1,49 @@
+"""
+Management command to roll buffered usage events up into daily totals.
+
+Run it periodically (e.g. every few minutes from cron). Only one run does
+work at a time; overlapping runs exit immediately.
+"""
+
+from django.core.cache import cache
+from django.db import transaction
+from django.core.management.base import BaseCommand
+
+from analytics.rollup import rollup_usage
+from analytics.trending import rebuild_trending
+
+
+LOCK_KEY = 'usage:rollup:lock'
+LOCK_TIMEOUT = 60 * 60
+
+
+class Command(BaseCommand):
+    help = 'Roll buffered article usage events up into per-article daily totals'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--window',
+            type=int,
+            default=10000,
+            help='Events aggregated per transaction (default: 10000)',
+        )
+        parser.add_argument(
+            '--rebuild-leaderboards',
+            action='store_true',
+            help='Also recompute the trending top lists from the stored scores',
+        )
+
+    def handle(self, *args, **options):
+        if not cache.add(LOCK_KEY, 1, LOCK_TIMEOUT):
+            self.stdout.write(self.style.WARNING('Another rollup is already running.'))
+            return
+
+        try:
+            processed = rollup_usage(window=max(options['window'], 1))
+            if options['rebuild_leaderboards']:
+                with transaction.atomic():
+                    rebuild_trending()
+        finally:
+            cache.delete(LOCK_KEY)
+
+        self.stdout.write(self.style.SUCCESS(f'Rolled up {processed} usage events.'))
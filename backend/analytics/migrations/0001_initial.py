@@ -0,0 +1,52 @@
+# Generated by Django 5.2.9 on 2026-10-19 06:41
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('articles', '0012_denormalized_counters'),
+        ('journals', '0021_denormalized_counters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UsageEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('event_type', models.CharField(choices=[('view', 'View'), ('download', 'Download')], max_length=10)),
+                ('client_hash', models.CharField(blank=True, help_text='Salted, daily-rotating hash of the client (no IPs are stored)', max_length=32)),
+                ('is_unique', models.BooleanField(default=True, help_text='First request of this type by this client for the article today')),
+                ('created_at', models.DateTimeField(db_index=True)),
+                ('article', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='usage_events', to='articles.article')),
+            ],
+            options={
+                'verbose_name': 'usage event',
+                'verbose_name_plural': 'usage events',
+            },
+        ),
+        migrations.CreateModel(
+            name='DailyArticleUsage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('views', models.PositiveIntegerField(default=0)),
+                ('downloads', models.PositiveIntegerField(default=0)),
+                ('unique_views', models.PositiveIntegerField(default=0)),
+                ('unique_downloads', models.PositiveIntegerField(default=0)),
+                ('article', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_usage', to='articles.article')),
+                ('journal', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='daily_article_usage', to='journals.journal')),
+            ],
+            options={
+                'verbose_name': 'daily article usage',
+                'verbose_name_plural': 'daily article usage',
+                'ordering': ['-date'],
+                'indexes': [models.Index(fields=['date'], name='analytics_d_date_db90ee_idx'), models.Index(fields=['journal', 'date'], name='analytics_d_journal_5f2e37_idx')],
+                'unique_together': {('article', 'date')},
+            },
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 5.2.9 on 2026-10-19 06:43
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0001_initial'),
+        ('articles', '0013_unique_readers'),
+        ('journals', '0021_denormalized_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dailyarticleusage',
+            name='readers',
+            field=models.BinaryField(blank=True, help_text='HyperLogLog sketch of the clients who viewed or downloaded the article', null=True),
+        ),
+        migrations.AlterField(
+            model_name='usageevent',
+            name='client_hash',
+            field=models.CharField(blank=True, help_text='Salted hash of the client (no IPs are stored)', max_length=32),
+        ),
+        migrations.CreateModel(
+            name='LifetimeReaders',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('readers', models.BinaryField()),
+                ('estimate', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('article', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='lifetime_readers', to='articles.article')),
+                ('journal', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='lifetime_readers', to='journals.journal')),
+            ],
+            options={
+                'verbose_name': 'lifetime readers',
+                'verbose_name_plural': 'lifetime readers',
+            },
+        ),
+        migrations.CreateModel(
+            name='DailyJournalReaders',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('readers', models.BinaryField()),
+                ('journal', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_readers', to='journals.journal')),
+            ],
+            options={
+                'verbose_name': 'daily journal readers',
+                'verbose_name_plural': 'daily journal readers',
+                'ordering': ['-date'],
+                'unique_together': {('journal', 'date')},
+            },
+        ),
+    ]
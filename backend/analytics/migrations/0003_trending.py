@@ -0,0 +1,44 @@
+# Generated by Django 5.2.9 on 2026-10-19 06:47
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0002_unique_readers'),
+        ('articles', '0013_unique_readers'),
+        ('journals', '0021_denormalized_counters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArticleTrend',
+            fields=[
+                ('article', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='trend', serialize=False, to='articles.article')),
+                ('score', models.FloatField(db_index=True)),
+                ('journal', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='article_trends', to='journals.journal')),
+            ],
+            options={
+                'verbose_name': 'article trend',
+                'verbose_name_plural': 'article trends',
+                'indexes': [models.Index(fields=['journal', '-score'], name='analytics_a_journal_96d233_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='Leaderboard',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('trending', 'Trending'), ('most_read_7', 'Most read (7 days)'), ('most_read_30', 'Most read (30 days)')], max_length=20)),
+                ('entries', models.JSONField(default=list)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('journal', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='leaderboards', to='journals.journal')),
+            ],
+            options={
+                'verbose_name': 'leaderboard',
+                'verbose_name_plural': 'leaderboards',
+                'constraints': [models.UniqueConstraint(fields=('kind', 'journal'), name='unique_leaderboard_per_journal'), models.UniqueConstraint(condition=models.Q(('journal__isnull', True)), fields=('kind',), name='unique_sitewide_leaderboard')],
+            },
+        ),
+    ]
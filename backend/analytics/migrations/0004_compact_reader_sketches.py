@@ -0,0 +1,34 @@
+# Generated by Django 5.2.9 on 2026-10-19 09:12
+
+from django.db import migrations
+
+from analytics.hll import HyperLogLog
+
+
+def compact_sketches(apps, schema_editor):
+    # Re-encode dense sketches with few readers in the sparse form
+    for model_name in ('DailyArticleUsage', 'DailyJournalReaders'):
+        model = apps.get_model('analytics', model_name)
+        batch = []
+        rows = model.objects.exclude(readers=None).only('pk', 'readers').order_by('pk').iterator(chunk_size=500)
+        for row in rows:
+            data = bytes(row.readers)
+            compact = HyperLogLog.from_bytes(data).to_bytes()
+            if len(compact) < len(data):
+                row.readers = compact
+                batch.append(row)
+            if len(batch) >= 500:
+                model.objects.bulk_update(batch, ['readers'])
+                batch = []
+        model.objects.bulk_update(batch, ['readers'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0003_trending'),
+    ]
+
+    operations = [
+        migrations.RunPython(compact_sketches, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.9 on 2026-10-19 07:45
+
+from django.db import migrations, models
+from django.db.models import F
+from django.db.models.functions import Greatest
+
+
+def backfill_unique_requests(apps, schema_editor):
+    # Which clients both viewed and downloaded wasn't recorded; the larger of
+    # the two unique counts is the closest lower bound
+    DailyArticleUsage = apps.get_model('analytics', 'DailyArticleUsage')
+    DailyArticleUsage.objects.update(unique_requests=Greatest('unique_views', 'unique_downloads'))
+    UsageEvent = apps.get_model('analytics', 'UsageEvent')
+    UsageEvent.objects.update(is_unique_request=F('is_unique'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0004_compact_reader_sketches'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dailyarticleusage',
+            name='unique_requests',
+            field=models.PositiveIntegerField(default=0, help_text='Clients who viewed or downloaded the article (each counted once)'),
+        ),
+        migrations.AddField(
+            model_name='usageevent',
+            name='is_unique_request',
+            field=models.BooleanField(default=True, help_text='First request of any type by this client for the article today'),
+        ),
+        migrations.RunPython(backfill_unique_requests, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,256 @@
+"""
+Article usage analytics models.
+
+Usage is recorded in two stages:
+- UsageEvent: an append-only buffer of individual views/downloads, written
+  in batches and emptied by the ``rollup_usage`` command
+- DailyArticleUsage: compact per-article, per-day totals that all range
+  queries run against (one row per article per day with any activity)
+
+Distinct readers are tracked with HyperLogLog sketches (analytics/hll.py):
+per article per day on DailyArticleUsage, per journal per day in
+DailyJournalReaders, and over all time in LifetimeReaders. Sketches for any
+date range are merged from the daily ones.
+
+Popular-article rankings are kept as bounded top-K lists in Leaderboard
+rows, maintained by the rollup (see analytics/trending.py).
+"""
+
+from django.db import models
+
+
+class UsageEventType(models.TextChoices):
+    """Kinds of usage that are counted."""
+    VIEW = 'view', 'View'
+    DOWNLOAD = 'download', 'Download'
+
+
+class UsageEvent(models.Model):
+    """
+    A single article view or download, waiting to be rolled up.
+
+    Rows are only ever inserted (in batches, see analytics/recorder.py) and
+    deleted once ``rollup_usage`` has folded them into DailyArticleUsage.
+    """
+
+    article = models.ForeignKey(
+        'articles.Article',
+        on_delete=models.CASCADE,
+        related_name='usage_events'
+    )
+    event_type = models.CharField(
+        max_length=10,
+        choices=UsageEventType.choices
+    )
+    client_hash = models.CharField(
+        max_length=32,
+        blank=True,
+        help_text='Salted hash of the client (no IPs are stored)'
+    )
+    is_unique = models.BooleanField(
+        default=True,
+        help_text='First request of this type by this client for the article today'
+    )
+    is_unique_request = models.BooleanField(
+        default=True,
+        help_text='First request of any type by this client for the article today'
+    )
+    created_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        verbose_name = 'usage event'
+        verbose_name_plural = 'usage events'
+
+    def __str__(self):
+        return f'{self.get_event_type_display()} of article {self.article_id} at {self.created_at}'
+
+
+class DailyArticleUsage(models.Model):
+    """
+    Views and downloads of one article on one day.
+
+    ``journal`` is denormalized from the article so per-journal ranges are a
+    single indexed scan.
+    """
+
+    article = models.ForeignKey(
+        'articles.Article',
+        on_delete=models.CASCADE,
+        related_name='daily_usage'
+    )
+    journal = models.ForeignKey(
+        'journals.Journal',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='daily_article_usage'
+    )
+    date = models.DateField()
+
+    views = models.PositiveIntegerField(default=0)
+    downloads = models.PositiveIntegerField(default=0)
+    unique_views = models.PositiveIntegerField(default=0)
+    unique_downloads = models.PositiveIntegerField(default=0)
+    unique_requests = models.PositiveIntegerField(
+        default=0,
+        help_text='Clients who viewed or downloaded the article (each counted once)'
+    )
+    readers = models.BinaryField(
+        null=True,
+        blank=True,
+        help_text='HyperLogLog sketch of the clients who viewed or downloaded the article'
+    )
+
+    class Meta:
+        verbose_name = 'daily article usage'
+        verbose_name_plural = 'daily article usage'
+        ordering = ['-date']
+        unique_together = ['article', 'date']
+        indexes = [
+            models.Index(fields=['date']),
+            models.Index(fields=['journal', 'date']),
+        ]
+
+    def __str__(self):
+        return f'Article {self.article_id} on {self.date}: {self.views} views, {self.downloads} downloads'
+
+
+class DailyJournalReaders(models.Model):
+    """Distinct readers of any article in a journal on one day (HyperLogLog sketch)."""
+
+    journal = models.ForeignKey(
+        'journals.Journal',
+        on_delete=models.CASCADE,
+        related_name='daily_readers'
+    )
+    date = models.DateField()
+    readers = models.BinaryField()
+
+    class Meta:
+        verbose_name = 'daily journal readers'
+        verbose_name_plural = 'daily journal readers'
+        ordering = ['-date']
+        unique_together = ['journal', 'date']
+
+    def __str__(self):
+        return f'Journal {self.journal_id} readers on {self.date}'
+
+
+class LifetimeReaders(models.Model):
+    """
+    All-time distinct readers of one article or one journal.
+
+    Exactly one of ``article``/``journal`` is set. ``estimate`` caches the
+    sketch's count; for articles it is also copied to Article.unique_readers.
+    """
+
+    article = models.OneToOneField(
+        'articles.Article',
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='lifetime_readers'
+    )
+    journal = models.OneToOneField(
+        'journals.Journal',
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='lifetime_readers'
+    )
+    readers = models.BinaryField()
+    estimate = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'lifetime readers'
+        verbose_name_plural = 'lifetime readers'
+
+    def __str__(self):
+        if self.article_id:
+            return f'Article {self.article_id}: ~{self.estimate} readers'
+        return f'Journal {self.journal_id}: ~{self.estimate} readers'
+
+
+class ArticleTrend(models.Model):
+    """
+    Exponentially time-decayed usage score of one article.
+
+    ``score`` is stored in forward-decay form (the log of the decayed sum,
+    scaled to a fixed epoch), so it only ever grows as events arrive and
+    rows can be compared without re-decaying them.
+    """
+
+    article = models.OneToOneField(
+        'articles.Article',
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='trend'
+    )
+    journal = models.ForeignKey(
+        'journals.Journal',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='article_trends'
+    )
+    score = models.FloatField(db_index=True)
+
+    class Meta:
+        verbose_name = 'article trend'
+        verbose_name_plural = 'article trends'
+        indexes = [
+            models.Index(fields=['journal', '-score']),
+        ]
+
+    def __str__(self):
+        return f'Article {self.article_id}: {self.score:.3f}'
+
+
+class LeaderboardKind(models.TextChoices):
+    """Rankings kept as top-K lists."""
+    TRENDING = 'trending', 'Trending'
+    MOST_READ_7 = 'most_read_7', 'Most read (7 days)'
+    MOST_READ_30 = 'most_read_30', 'Most read (30 days)'
+
+
+class Leaderboard(models.Model):
+    """
+    The top articles of one ranking, site-wide (no journal) or per journal.
+
+    ``entries`` is a list of ``[article_id, score]`` pairs, best first, never
+    longer than analytics.trending.TOP_K.
+    """
+
+    kind = models.CharField(
+        max_length=20,
+        choices=LeaderboardKind.choices
+    )
+    journal = models.ForeignKey(
+        'journals.Journal',
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='leaderboards'
+    )
+    entries = models.JSONField(default=list)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'leaderboard'
+        verbose_name_plural = 'leaderboards'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['kind', 'journal'],
+                name='unique_leaderboard_per_journal'
+            ),
+            models.UniqueConstraint(
+                fields=['kind'],
+                condition=models.Q(journal__isnull=True),
+                name='unique_sitewide_leaderboard'
+            ),
+        ]
+
+    def __str__(self):
+        scope = f'journal {self.journal_id}' if self.journal_id else 'site-wide'
+        return f'{self.get_kind_display()} ({scope})'
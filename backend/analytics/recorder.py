@@ -0,0 +1,129 @@
+"""
+Buffered recording of article usage events.
+
+Views call ``record_usage`` for every counted view or download. Events are
+collected in a per-process buffer and written with a single ``bulk_create``
+once the buffer is full or old enough, so a page view never costs an extra
+INSERT on its own. Whatever is left is flushed when the process exits.
+
+Clients are identified only by a salted hash of their address, user agent
+and the date (no IPs are stored), so the same client gets a new identifier
+every day. The hash feeds the unique-reader sketches, and whether a request
+is the client's first for that article today - of its type, and of any
+type (COUNTER's unique item request) - is decided with ``add`` on the
+dedicated ``usage`` cache, so it holds across workers without crowding the
+main cache.
+"""
+
+import atexit
+import hashlib
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils import timezone
+
+from .models import UsageEvent, UsageEventType
+
+
+logger = logging.getLogger(__name__)
+
+BUFFER_SIZE = 100
+FLUSH_INTERVAL = 30  # seconds
+UNIQUE_WINDOW = 60 * 60 * 24
+USAGE_CACHE = 'usage'
+
+_buffer = []
+_lock = threading.Lock()
+_last_flush = time.monotonic()
+
+
+def _client_address(request):
+    """
+    The client address seen by the outermost trusted proxy.
+
+    Each of the ``TRUSTED_PROXY_COUNT`` proxies appends the address it got
+    the request from to X-Forwarded-For, so the client's is the one the
+    outermost proxy added; anything before it is up to the client.
+    """
+    proxies = settings.TRUSTED_PROXY_COUNT
+    forwarded = request.META.get('HTTP_X_FORWARDED_FOR')
+    if proxies and forwarded:
+        hops = [hop.strip() for hop in forwarded.split(',')]
+        return hops[max(len(hops) - proxies, 0)]
+    return request.META.get('REMOTE_ADDR', '')
+
+
+def client_hash(request, day):
+    """Anonymous client identifier for ``day`` (IP + user agent + date, salted)."""
+    raw = '|'.join([
+        settings.SECRET_KEY,
+        day.isoformat(),
+        _client_address(request),
+        request.META.get('HTTP_USER_AGENT', ''),
+    ])
+    return hashlib.sha256(raw.encode()).hexdigest()[:32]
+
+
+def record_usage(request, article, event_type=UsageEventType.VIEW):
+    """Queue one view or download of ``article``."""
+    global _last_flush
+
+    # The hash changes daily, so it scopes the marker to today on its own
+    hashed = client_hash(request, timezone.localdate())
+    usage_cache = caches[USAGE_CACHE]
+    is_unique_request = usage_cache.add(f'usage:seen:{article.pk}:{hashed}', 1, UNIQUE_WINDOW)
+    is_unique = usage_cache.add(
+        f'usage:seen:{event_type}:{article.pk}:{hashed}', 1, UNIQUE_WINDOW
+    )
+    event = UsageEvent(
+        article_id=article.pk,
+        event_type=event_type,
+        client_hash=hashed,
+        is_unique=is_unique,
+        is_unique_request=is_unique_request,
+        created_at=timezone.now(),
+    )
+
+    with _lock:
+        _buffer.append(event)
+        due = (
+            len(_buffer) >= BUFFER_SIZE
+            or time.monotonic() - _last_flush >= FLUSH_INTERVAL
+        )
+    if due:
+        flush()
+
+
+def flush():
+    """Write all buffered events. Returns the number written."""
+    global _buffer, _last_flush
+
+    with _lock:
+        events, _buffer = _buffer, []
+        _last_flush = time.monotonic()
+    if not events:
+        return 0
+
+    try:
+        UsageEvent.objects.bulk_create(events, batch_size=500)
+    except Exception:
+        # Usage counting must never break the request that triggered the flush
+        logger.exception('Could not write %d usage events', len(events))
+        return 0
+    return len(events)
+
+
+
+def discard():
+    """Drop all buffered events without writing them. Returns the number dropped."""
+    global _buffer
+
+    with _lock:
+        events, _buffer = _buffer, []
+    return len(events)
+
+
+atexit.register(flush)
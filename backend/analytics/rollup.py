@@ -0,0 +1,219 @@
+"""
+Roll buffered usage events up into daily per-article totals.
+
+Events are processed in primary-key windows. Each window is aggregated in
+the database, added onto the matching DailyArticleUsage rows and deleted in
+the same transaction, so an event is counted exactly once even if a run is
+interrupted.
+
+The same pass folds each event's client hash into the HyperLogLog reader
+sketches: per article and per journal for the day, and over all time. The
+all-time article estimate is copied to Article.unique_readers. It also adds
+the events to the trending scores, and each run ends by refreshing the
+most-read leaderboards (see analytics/trending.py).
+"""
+
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Count, Max, Min, Q
+from django.db.models.functions import Coalesce, TruncDate
+
+from articles.models import Article
+
+from . import trending
+from .hll import HyperLogLog
+from .models import (
+    DailyArticleUsage, DailyJournalReaders, LifetimeReaders,
+    UsageEvent, UsageEventType,
+)
+
+
+COUNTED_FIELDS = ['views', 'downloads', 'unique_views', 'unique_downloads', 'unique_requests']
+
+EVENT_COUNTS = {
+    'views': Count('pk', filter=Q(event_type=UsageEventType.VIEW)),
+    'downloads': Count('pk', filter=Q(event_type=UsageEventType.DOWNLOAD)),
+    'unique_views': Count('pk', filter=Q(event_type=UsageEventType.VIEW, is_unique=True)),
+    'unique_downloads': Count('pk', filter=Q(event_type=UsageEventType.DOWNLOAD, is_unique=True)),
+    'unique_requests': Count('pk', filter=Q(is_unique_request=True)),
+}
+
+
+def _annotated(events):
+    return events.annotate(
+        day=TruncDate('created_at'),
+        journal_ref=Coalesce(
+            'article__journal_id',
+            'article__volume__journal_id',
+            'article__issue__volume__journal_id',
+        ),
+    )
+
+
+def _scan_events(events):
+    """
+    One pass over the events.
+
+    Returns the distinct client hashes per (article, day), (journal, day),
+    article and journal, and the trending score of each article's events.
+    """
+    readers = {
+        'article_day': defaultdict(set),
+        'journal_day': defaultdict(set),
+        'article': defaultdict(set),
+        'journal': defaultdict(set),
+    }
+    scores = {}
+    rows = _annotated(events).values_list(
+        'article_id', 'day', 'journal_ref', 'client_hash', 'event_type', 'created_at'
+    ).iterator(chunk_size=2000)
+    for article_id, day, journal_id, hashed, event_type, created_at in rows:
+        _, score = scores.get(article_id, (None, None))
+        scores[article_id] = (
+            journal_id,
+            trending.add_scores(score, trending.event_score(event_type, created_at)),
+        )
+        if not hashed:
+            continue
+        readers['article_day'][(article_id, day)].add(hashed)
+        readers['article'][article_id].add(hashed)
+        if journal_id:
+            readers['journal_day'][(journal_id, day)].add(hashed)
+            readers['journal'][journal_id].add(hashed)
+    return readers, scores
+
+
+def _merged(row_readers, hashes):
+    """Existing serialized sketch (or None) plus new hashes, as a sketch."""
+    sketch = HyperLogLog.from_bytes(bytes(row_readers)) if row_readers else HyperLogLog()
+    return sketch.update(hashes)
+
+
+def _store_sketches(model, queryset, key_of, new_row, readers, with_estimate=False):
+    """Merge ``readers`` ({key: hashes}) into the sketch rows of ``model``. Returns {key: sketch}."""
+    if not readers:
+        return {}
+    rows = {key_of(row): row for row in queryset.select_for_update()}
+    to_create, to_update, sketches = [], [], {}
+    for key, hashes in readers.items():
+        row = rows.get(key)
+        if row is None:
+            row = new_row(key)
+            to_create.append(row)
+        else:
+            to_update.append(row)
+        sketch = sketches[key] = _merged(row.readers, hashes)
+        row.readers = sketch.to_bytes()
+        if with_estimate:
+            row.estimate = sketch.count()
+
+    update_fields = ['readers', 'estimate'] if with_estimate else ['readers']
+    model.objects.bulk_create(to_create, batch_size=500)
+    model.objects.bulk_update(to_update, update_fields, batch_size=500)
+    return sketches
+
+
+def _roll_window(low, high):
+    """Fold events with low < id <= high into the daily table. Returns events processed."""
+    events = UsageEvent.objects.filter(pk__gt=low, pk__lte=high)
+    groups = list(
+        _annotated(events).values('article_id', 'day', 'journal_ref').annotate(
+            **EVENT_COUNTS
+        ).order_by()
+    )
+    if not groups:
+        return 0
+    readers, scores = _scan_events(events)
+
+    existing = {
+        (row.article_id, row.date): row
+        for row in DailyArticleUsage.objects.select_for_update().filter(
+            article_id__in={group['article_id'] for group in groups},
+            date__in={group['day'] for group in groups},
+        )
+    }
+
+    to_create, to_update = [], {}
+    for group in groups:
+        key = (group['article_id'], group['day'])
+        row = existing.get(key)
+        if row is None:
+            row = existing[key] = DailyArticleUsage(
+                article_id=group['article_id'],
+                journal_id=group['journal_ref'],
+                date=group['day'],
+            )
+            to_create.append(row)
+        elif row.pk:
+            to_update[key] = row
+        for field in COUNTED_FIELDS:
+            setattr(row, field, getattr(row, field) + group[field])
+
+    for key, hashes in readers['article_day'].items():
+        row = existing[key]
+        row.readers = _merged(row.readers, hashes).to_bytes()
+
+    DailyArticleUsage.objects.bulk_create(to_create, batch_size=500)
+    DailyArticleUsage.objects.bulk_update(
+        to_update.values(), COUNTED_FIELDS + ['readers'], batch_size=500
+    )
+
+    journal_days = readers['journal_day']
+    _store_sketches(
+        DailyJournalReaders,
+        DailyJournalReaders.objects.filter(
+            journal_id__in={journal_id for journal_id, _ in journal_days},
+            date__in={day for _, day in journal_days},
+        ),
+        lambda row: (row.journal_id, row.date),
+        lambda key: DailyJournalReaders(journal_id=key[0], date=key[1]),
+        journal_days,
+    )
+    article_sketches = _store_sketches(
+        LifetimeReaders,
+        LifetimeReaders.objects.filter(article_id__in=readers['article']),
+        lambda row: row.article_id,
+        lambda key: LifetimeReaders(article_id=key),
+        readers['article'],
+        with_estimate=True,
+    )
+    _store_sketches(
+        LifetimeReaders,
+        LifetimeReaders.objects.filter(journal_id__in=readers['journal']),
+        lambda row: row.journal_id,
+        lambda key: LifetimeReaders(journal_id=key),
+        readers['journal'],
+        with_estimate=True,
+    )
+    Article.objects.bulk_update(
+        [
+            Article(pk=article_id, unique_readers=sketch.count())
+            for article_id, sketch in article_sketches.items()
+        ],
+        ['unique_readers'],
+        batch_size=500,
+    )
+    trending.update_trending(scores)
+
+    processed, _ = events.delete()
+    return processed
+
+
+def rollup_usage(window=10000):
+    """Roll up every buffered event. Returns the number of events processed."""
+    bounds = UsageEvent.objects.aggregate(low=Min('pk'), high=Max('pk'))
+
+    processed = 0
+    if bounds['high'] is not None:
+        low = bounds['low'] - 1
+        while low < bounds['high']:
+            high = min(low + window, bounds['high'])
+            with transaction.atomic():
+                processed += _roll_window(low, high)
+            low = high
+
+    # Most-read windows move every day, so refresh them even without new events
+    with transaction.atomic():
+        trending.refresh_most_read()
+    return processed
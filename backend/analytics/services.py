@@ -0,0 +1,95 @@
+"""
+Range queries over the daily usage table.
+
+All functions take an inclusive ``start``/``end`` date range and optional
+``journal_id``/``article_id`` filters, and only ever read DailyArticleUsage,
+so their cost depends on the size of the range, not on the total traffic.
+"""
+
+from django.db.models import Sum, Value
+from django.db.models.functions import Coalesce, TruncMonth
+
+from .hll import merge_all
+from .models import DailyArticleUsage, DailyJournalReaders
+
+
+SUMS = {
+    'views': Coalesce(Sum('views'), Value(0)),
+    'downloads': Coalesce(Sum('downloads'), Value(0)),
+    'unique_views': Coalesce(Sum('unique_views'), Value(0)),
+    'unique_downloads': Coalesce(Sum('unique_downloads'), Value(0)),
+}
+
+GRANULARITIES = ('day', 'month')
+TOP_ARTICLE_ORDERINGS = ('views', 'downloads', 'unique_views', 'unique_downloads')
+
+
+def usage_queryset(start, end, journal_id=None, article_id=None):
+    queryset = DailyArticleUsage.objects.filter(date__gte=start, date__lte=end)
+    if journal_id is not None:
+        queryset = queryset.filter(journal_id=journal_id)
+    if article_id is not None:
+        queryset = queryset.filter(article_id=article_id)
+    return queryset.order_by()
+
+
+def usage_totals(start, end, journal_id=None, article_id=None):
+    """Summed views/downloads over the range."""
+    return usage_queryset(start, end, journal_id, article_id).aggregate(**SUMS)
+
+
+def usage_series(start, end, journal_id=None, article_id=None, granularity='day'):
+    """Totals per day or per month, oldest first (periods without usage are omitted)."""
+    queryset = usage_queryset(start, end, journal_id, article_id)
+    period = TruncMonth('date') if granularity == 'month' else 'date'
+    rows = queryset.annotate(period=period).values('period').annotate(**SUMS).order_by('period')
+    return list(rows)
+
+
+def unique_readers(start, end, journal_id=None, article_id=None):
+    """
+    Estimated distinct readers over the range (HyperLogLog, ~3% error).
+
+    Merges the daily sketches of the article, of the journal, or - with no
+    filter - of every journal, so readers active on several days are only
+    counted once.
+    """
+    if article_id is not None:
+        blobs = usage_queryset(start, end, article_id=article_id)
+    else:
+        blobs = DailyJournalReaders.objects.filter(date__gte=start, date__lte=end)
+        if journal_id is not None:
+            blobs = blobs.filter(journal_id=journal_id)
+    return merge_all(blobs.values_list('readers', flat=True).iterator(chunk_size=500)).count()
+
+
+def usage_by_journal(start, end):
+    """Totals per journal over the range, busiest first."""
+    rows = usage_queryset(start, end).values(
+        'journal_id', 'journal__title', 'journal__slug'
+    ).annotate(**SUMS).order_by('-views')
+    return [
+        {
+            'journal_id': row.pop('journal_id'),
+            'journal_title': row.pop('journal__title'),
+            'journal_slug': row.pop('journal__slug'),
+            **row,
+        }
+        for row in rows
+    ]
+
+
+def top_articles(start, end, journal_id=None, limit=10, order_by='views'):
+    """The most used articles over the range."""
+    rows = usage_queryset(start, end, journal_id).values(
+        'article_id', 'article__title', 'article__slug'
+    ).annotate(**SUMS).order_by(f'-{order_by}', 'article_id')[:limit]
+    return [
+        {
+            'article_id': row.pop('article_id'),
+            'article_title': row.pop('article__title'),
+            'article_slug': row.pop('article__slug'),
+            **row,
+        }
+        for row in rows
+    ]
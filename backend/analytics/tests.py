@@ -0,0 +1,310 @@
+from datetime import date, datetime, timezone
+from unittest import mock
+
+from django.core.cache import caches
+from django.test import RequestFactory, TestCase, override_settings
+
+from articles.models import Article
+from journals.models import Journal
+
+from . import recorder, trending
+from .hll import SPARSE_ENTRY_SIZE, SPARSE_HEADER_SIZE, HyperLogLog, merge_all
+from .models import (
+    DailyArticleUsage, DailyJournalReaders, LeaderboardKind, LifetimeReaders,
+    UsageEvent, UsageEventType,
+)
+from .reports import counter_report_rows
+from .rollup import rollup_usage
+
+
+def at(day, hour=12):
+    return datetime(2024, 3, day, hour, tzinfo=timezone.utc)
+
+
+class RecorderTests(TestCase):
+    """Buffered event recording (analytics/recorder.py)."""
+
+    @classmethod
+    def setUpTestData(cls):
+        journal = Journal.objects.create(title='Journal of Tests', slug='tests')
+        cls.article = Article.objects.create(title='Read', slug='read', journal=journal, status='published')
+
+    def setUp(self):
+        caches[recorder.USAGE_CACHE].clear()
+        recorder.flush()
+        UsageEvent.objects.all().delete()
+        self.enterContext(mock.patch.object(recorder, 'BUFFER_SIZE', 3))
+        self.enterContext(mock.patch.object(recorder, 'FLUSH_INTERVAL', 3600))
+        self.addCleanup(recorder.flush)
+
+    def request(self, address, **headers):
+        return RequestFactory().get('/', REMOTE_ADDR=address, HTTP_USER_AGENT='tests', **headers)
+
+    def test_flushes_when_the_buffer_is_full(self):
+        recorder.record_usage(self.request('10.0.0.1'), self.article)
+        recorder.record_usage(self.request('10.0.0.1'), self.article)
+        self.assertEqual(UsageEvent.objects.count(), 0)
+
+        recorder.record_usage(self.request('10.0.0.2'), self.article, UsageEventType.DOWNLOAD)
+        events = list(UsageEvent.objects.order_by('pk').values_list('event_type', 'is_unique', 'client_hash'))
+        self.assertEqual([(event_type, is_unique) for event_type, is_unique, _ in events], [
+            ('view', True), ('view', False), ('download', True),
+        ])
+        self.assertEqual(events[0][2], events[1][2])
+        self.assertNotEqual(events[0][2], events[2][2])
+        self.assertNotIn('10.0.0.1', events[0][2])
+
+    def test_one_unique_request_per_client_and_article(self):
+        recorder.record_usage(self.request('10.0.0.1'), self.article)
+        recorder.record_usage(self.request('10.0.0.1'), self.article, UsageEventType.DOWNLOAD)
+        recorder.record_usage(self.request('10.0.0.2'), self.article, UsageEventType.DOWNLOAD)
+        events = UsageEvent.objects.order_by('pk').values_list('event_type', 'is_unique', 'is_unique_request')
+        self.assertEqual(list(events), [
+            ('view', True, True), ('download', True, False), ('download', True, True),
+        ])
+
+    def test_flush_writes_the_buffer(self):
+        self.assertEqual(recorder.flush(), 0)
+        recorder.record_usage(self.request('10.0.0.1'), self.article)
+        recorder.record_usage(self.request('10.0.0.2'), self.article)
+        self.assertEqual(UsageEvent.objects.count(), 0)
+        self.assertEqual(recorder.flush(), 2)
+        self.assertEqual(UsageEvent.objects.count(), 2)
+        self.assertEqual(recorder.flush(), 0)
+
+    def test_client_hash_rotates_daily(self):
+        request = self.request('10.0.0.1')
+        first_day = recorder.client_hash(request, date(2024, 3, 1))
+        self.assertEqual(recorder.client_hash(self.request('10.0.0.1'), date(2024, 3, 1)), first_day)
+        self.assertNotEqual(recorder.client_hash(request, date(2024, 3, 2)), first_day)
+
+    @override_settings(TRUSTED_PROXY_COUNT=1)
+    def test_spoofed_forwarded_hops_are_ignored(self):
+        day = date(2024, 3, 1)
+        first = self.request('10.0.0.9', HTTP_X_FORWARDED_FOR='1.1.1.1, 203.0.113.5')
+        second = self.request('10.0.0.9', HTTP_X_FORWARDED_FOR='2.2.2.2, 203.0.113.5')
+        other = self.request('10.0.0.9', HTTP_X_FORWARDED_FOR='1.1.1.1, 203.0.113.6')
+        self.assertEqual(recorder.client_hash(first, day), recorder.client_hash(second, day))
+        self.assertNotEqual(recorder.client_hash(first, day), recorder.client_hash(other, day))
+        with override_settings(TRUSTED_PROXY_COUNT=0):
+            self.assertEqual(
+                recorder.client_hash(first, day), recorder.client_hash(self.request('10.0.0.9'), day)
+            )
+
+    def test_markers_stay_out_of_the_main_cache(self):
+        with mock.patch.object(caches['default'], 'add') as add:
+            recorder.record_usage(self.request('10.0.0.1'), self.article)
+        add.assert_not_called()
+
+
+class RollupTests(TestCase):
+    """Daily rollups of buffered events (analytics/rollup.py)."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.journal = Journal.objects.create(title='Journal of Tests', slug='tests')
+        cls.article = Article.objects.create(title='Read', slug='read', journal=cls.journal, status='published')
+
+    def events(self, *specs):
+        UsageEvent.objects.bulk_create([
+            UsageEvent(
+                article=self.article, event_type=event_type, client_hash=client,
+                is_unique=is_unique, is_unique_request=is_unique_request, created_at=created_at,
+            )
+            for event_type, client, is_unique, is_unique_request, created_at in specs
+        ])
+
+    def test_daily_totals(self):
+        self.events(
+            ('view', 'a', True, True, at(1)),
+            ('view', 'a', False, False, at(1, 13)),
+            ('view', 'b', True, True, at(1, 14)),
+            ('download', 'a', True, False, at(1, 15)),
+            ('view', 'c', True, True, at(2)),
+        )
+        self.assertEqual(rollup_usage(window=2), 5)
+        # A later run adds onto the existing rows
+        self.events(('download', 'b', True, False, at(1, 20)), ('download', 'b', False, False, at(1, 21)))
+        self.assertEqual(rollup_usage(), 2)
+
+        rows = DailyArticleUsage.objects.order_by('date').values_list(
+            'date', 'journal_id', 'views', 'downloads', 'unique_views', 'unique_downloads', 'unique_requests'
+        )
+        self.assertEqual(list(rows), [
+            (date(2024, 3, 1), self.journal.pk, 3, 3, 2, 2, 2),
+            (date(2024, 3, 2), self.journal.pk, 1, 0, 1, 0, 1),
+        ])
+        self.assertFalse(UsageEvent.objects.exists())
+
+        first_day = DailyArticleUsage.objects.get(date=date(2024, 3, 1))
+        self.assertEqual(HyperLogLog.from_bytes(bytes(first_day.readers)).count(), 2)
+        self.assertEqual(DailyJournalReaders.objects.count(), 2)
+        self.assertEqual(LifetimeReaders.objects.get(article=self.article).estimate, 3)
+        self.article.refresh_from_db()
+        self.assertEqual(self.article.unique_readers, 3)
+
+
+class CounterReportTests(TestCase):
+    """COUNTER-style reports (analytics/reports.py)."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.journal = Journal.objects.create(title='Journal of Tests', slug='tests', issn_online='1234-5678')
+        other = Journal.objects.create(title='Other', slug='other')
+        first = Article.objects.create(title='First', slug='first', journal=cls.journal, doi='10.1/first')
+        second = Article.objects.create(title='Second', slug='second', journal=cls.journal)
+        elsewhere = Article.objects.create(title='Elsewhere', slug='elsewhere', journal=other)
+        for article, journal, day, views, downloads, unique_requests in [
+            (first, cls.journal, date(2024, 1, 5), 10, 2, 6),
+            (first, cls.journal, date(2024, 2, 9), 4, 0, 3),
+            # Two clients viewed and downloaded: counted once each
+            (second, cls.journal, date(2024, 2, 10), 5, 5, 2),
+            (elsewhere, other, date(2024, 1, 1), 7, 0, 7),
+            # Moved to the other journal the next day
+            (elsewhere, cls.journal, date(2024, 1, 2), 3, 1, 2),
+            # Outside the reporting period
+            (first, cls.journal, date(2024, 4, 1), 100, 0, 100),
+        ]:
+            DailyArticleUsage.objects.create(
+                article=article, journal=journal, date=day, views=views, downloads=downloads,
+                unique_views=unique_requests, unique_downloads=min(downloads, unique_requests),
+                unique_requests=unique_requests,
+            )
+
+    def test_journal_report(self):
+        rows = list(counter_report_rows(
+            date(2024, 1, 15), date(2024, 3, 1), journal_ids=[self.journal.pk], include_header=False,
+        ))
+        self.assertEqual(rows[0], [
+            'Title', 'Publisher', 'Print_ISSN', 'Online_ISSN', 'Metric_Type',
+            'Reporting_Period_Total', 'Jan-2024', 'Feb-2024', 'Mar-2024',
+        ])
+        self.assertEqual(rows[1:], [
+            ['Journal of Tests', '', '', '1234-5678', 'Total_Item_Requests', 30, 16, 14, 0],
+            ['Journal of Tests', '', '', '1234-5678', 'Unique_Item_Requests', 13, 8, 5, 0],
+        ])
+
+    def test_article_report(self):
+        rows = list(counter_report_rows(date(2024, 1, 1), date(2024, 2, 29), level='article', include_header=False))
+        totals = {(row[0], row[4]): row[5:] for row in rows[1:]}
+        self.assertEqual(totals, {
+            ('First', 'Total_Item_Requests'): [16, 12, 4],
+            ('First', 'Unique_Item_Requests'): [9, 6, 3],
+            ('Second', 'Total_Item_Requests'): [10, 0, 10],
+            ('Second', 'Unique_Item_Requests'): [2, 0, 2],
+            # Rows under both journals add up
+            ('Elsewhere', 'Total_Item_Requests'): [11, 11, 0],
+            ('Elsewhere', 'Unique_Item_Requests'): [9, 9, 0],
+        })
+
+
+class HyperLogLogTests(TestCase):
+    """Unique-reader sketches (analytics/hll.py)."""
+
+    def test_estimate_within_error_bound(self):
+        # Standard error at precision 10 is 1.04 / sqrt(1024), about 3.3%
+        for n in [10, 100, 1000, 20000]:
+            estimate = HyperLogLog().update(f'client-{i}' for i in range(n)).count()
+            self.assertLessEqual(abs(estimate - n), max(1, 0.1 * n), n)
+
+    def test_duplicates_are_not_counted(self):
+        sketch = HyperLogLog().update(['a', 'b', 'a', 'b', 'a'])
+        self.assertEqual(sketch.count(), 2)
+
+    def test_merge(self):
+        first = HyperLogLog().update(f'client-{i}' for i in range(3000))
+        second = HyperLogLog().update(f'client-{i}' for i in range(2000, 6000))
+        union = HyperLogLog().update(f'client-{i}' for i in range(6000))
+
+        merged = merge_all([first.to_bytes(), None, second.to_bytes()])
+        self.assertEqual(merged.count(), union.count())
+        self.assertLessEqual(abs(merged.count() - 6000), 600)
+
+        self.assertEqual(HyperLogLog.from_bytes(first.to_bytes()).count(), first.count())
+        with self.assertRaises(ValueError):
+            first.merge(HyperLogLog(precision=8))
+
+    def test_sparse_and_dense_round_trip(self):
+        few = HyperLogLog().update(['a', 'b', 'c'])
+        self.assertTrue(few.is_sparse)
+        data = few.to_bytes()
+        self.assertEqual(len(data), SPARSE_HEADER_SIZE + 3 * SPARSE_ENTRY_SIZE)
+        restored = HyperLogLog.from_bytes(data)
+        self.assertTrue(restored.is_sparse)
+        self.assertEqual((restored.sparse, restored.count()), (few.sparse, 3))
+
+        # Switches to the dense registers at the break-even point
+        many = HyperLogLog().update(f'client-{i}' for i in range(1000))
+        self.assertFalse(many.is_sparse)
+        self.assertEqual(len(many.to_bytes()), 1024)
+        self.assertEqual(HyperLogLog.from_bytes(many.to_bytes()).registers, many.registers)
+
+        # Dense sketches (as stored before sparse encoding) read back and shrink
+        dense = HyperLogLog(registers=bytes(1024)).update(['a', 'b', 'c'])
+        self.assertEqual(dense.count(), 3)
+        self.assertEqual(dense.to_bytes(), data)
+
+        # Same estimates and merges across the two forms
+        values = [f'client-{i}' for i in range(200)]
+        sparse = HyperLogLog().update(values)
+        self.assertTrue(sparse.is_sparse)
+        self.assertEqual(sparse.count(), HyperLogLog(registers=bytes(1024)).update(values).count())
+        merged = HyperLogLog().update(['a']).merge(HyperLogLog.from_bytes(many.to_bytes()))
+        self.assertFalse(merged.is_sparse)
+        self.assertEqual(merged.count(), HyperLogLog().update(['a']).merge(many).count())
+        self.assertEqual(
+            HyperLogLog.from_bytes(many.to_bytes()).merge(few).count(),
+            HyperLogLog.from_bytes(many.to_bytes()).update(['a', 'b', 'c']).count(),
+        )
+
+
+class TrendingTests(TestCase):
+    """Decayed trending scores and top-K leaderboards (analytics/trending.py)."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.journal = Journal.objects.create(title='Journal of Tests', slug='tests')
+        cls.older = Article.objects.create(title='Older', slug='older', journal=cls.journal, status='published')
+        cls.newer = Article.objects.create(title='Newer', slug='newer', journal=cls.journal, status='published')
+
+    def add(self, article, count, created_at, event_type=UsageEventType.VIEW):
+        score = None
+        for _ in range(count):
+            score = trending.add_scores(score, trending.event_score(event_type, created_at))
+        trending.update_trending({article.pk: (self.journal.pk, score)})
+
+    def ranking(self, journal_id=None):
+        return [article_id for article_id, _ in trending.leaderboard(LeaderboardKind.TRENDING, journal_id)]
+
+    def test_decay(self):
+        score = trending.event_score(UsageEventType.VIEW, at(1))
+        self.assertAlmostEqual(trending.decayed_value(score, at(1)), 1.0)
+        self.assertAlmostEqual(trending.decayed_value(score, at(1) + trending.HALF_LIFE), 0.5)
+        download = trending.event_score(UsageEventType.DOWNLOAD, at(1))
+        self.assertAlmostEqual(trending.decayed_value(download, at(1)), 3.0)
+
+    def test_ranking_changes_as_events_age(self):
+        self.add(self.older, 4, at(1))
+        self.add(self.newer, 2, at(2))
+        self.assertEqual(self.ranking(), [self.older.pk, self.newer.pk])
+
+        # Four views from seven days ago weigh less than one from today
+        self.add(self.newer, 1, at(8))
+        self.assertEqual(self.ranking(), [self.newer.pk, self.older.pk])
+        self.assertEqual(self.ranking(self.journal.pk), [self.newer.pk, self.older.pk])
+
+        self.add(self.older, 3, at(8))
+        self.assertEqual(self.ranking(), [self.older.pk, self.newer.pk])
+
+        trending.rebuild_trending()
+        self.assertEqual(self.ranking(), [self.older.pk, self.newer.pk])
+
+    def test_leaderboard_is_bounded(self):
+        articles = [
+            Article.objects.create(title=f'A{i}', slug=f'a{i}', journal=self.journal, status='published')
+            for i in range(5)
+        ]
+        with mock.patch.object(trending, 'TOP_K', 3):
+            for i, article in enumerate(articles):
+                self.add(article, i + 1, at(1))
+        self.assertEqual(self.ranking(), [articles[4].pk, articles[3].pk, articles[2].pk])
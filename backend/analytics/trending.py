@@ -0,0 +1,189 @@
+"""
+Trending and most-read article rankings.
+
+Both rankings are kept as bounded top-K lists (Leaderboard rows, site-wide
+and per journal), so serving them never sorts the article table.
+
+Trending uses forward exponential decay: an event of weight ``w`` at time
+``t`` contributes ``w * exp(DECAY * (t - EPOCH))`` and an article's score is
+the log of the sum. The current decayed value is that sum scaled by
+``exp(-DECAY * (now - EPOCH))`` - the same factor for every article - so
+stored scores rank correctly at any moment without being re-decayed.
+Because scores only ever grow, merging a leaderboard with the articles that
+just received events gives the exact new top K.
+
+Most-read counts views + downloads over a sliding window of days. Totals
+drop as days leave the window, so these lists are recomputed from the daily
+rollups (one grouped scan of the window, kept in bounded heaps) at the end
+of each rollup run.
+"""
+
+import heapq
+import math
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone as dt_timezone
+from operator import itemgetter
+
+from django.db.models import F, Q, Sum
+from django.utils import timezone
+
+from .models import (
+    ArticleTrend, DailyArticleUsage, Leaderboard, LeaderboardKind, UsageEventType,
+)
+
+
+TOP_K = 50
+HALF_LIFE = timedelta(days=3)
+DECAY = math.log(2) / HALF_LIFE.total_seconds()
+EPOCH = datetime(2024, 1, 1, tzinfo=dt_timezone.utc)
+WEIGHTS = {
+    UsageEventType.VIEW: 1.0,
+    UsageEventType.DOWNLOAD: 3.0,
+}
+MOST_READ_WINDOWS = {
+    LeaderboardKind.MOST_READ_7: 7,
+    LeaderboardKind.MOST_READ_30: 30,
+}
+
+
+def event_score(event_type, created_at):
+    """Forward-decay score of a single event."""
+    return math.log(WEIGHTS[event_type]) + DECAY * (created_at - EPOCH).total_seconds()
+
+
+def add_scores(first, second):
+    """Combine two scores (log of the sum of their exponentials)."""
+    if first is None:
+        return second
+    high, low = max(first, second), min(first, second)
+    return high + math.log1p(math.exp(low - high))
+
+
+def decayed_value(score, now=None):
+    """Weighted event count represented by ``score``, decayed to ``now``."""
+    now = now or timezone.now()
+    return math.exp(score - DECAY * (now - EPOCH).total_seconds())
+
+
+def _leaderboards(kind, journal_ids, replace_all=False):
+    """
+    Locked Leaderboard rows of ``kind`` by journal ID (``None`` = site-wide).
+
+    Site-wide and ``journal_ids`` rows are always included (missing ones as
+    unsaved instances). With ``replace_all`` every other existing row of the
+    kind is included too, so a full recompute can empty stale lists.
+    """
+    queryset = Leaderboard.objects.select_for_update().filter(kind=kind)
+    if not replace_all:
+        queryset = queryset.filter(Q(journal__isnull=True) | Q(journal_id__in=journal_ids))
+    boards = {board.journal_id: board for board in queryset}
+    for scope in [None, *journal_ids]:
+        if scope not in boards:
+            boards[scope] = Leaderboard(kind=kind, journal_id=scope)
+    return boards
+
+
+def _save_leaderboards(boards):
+    now = timezone.now()
+    to_create, to_update = [], []
+    for board in boards.values():
+        board.updated_at = now
+        (to_update if board.pk else to_create).append(board)
+    Leaderboard.objects.bulk_create(to_create)
+    Leaderboard.objects.bulk_update(to_update, ['entries', 'updated_at'])
+
+
+def update_trending(scores):
+    """
+    Add a batch of event scores and update the trending leaderboards.
+
+    ``scores`` maps article ID to ``(journal_id, score)`` for the new events
+    only. Call inside a transaction.
+    """
+    if not scores:
+        return
+    trends = ArticleTrend.objects.select_for_update().in_bulk(list(scores))
+    to_create, to_update, changed = [], [], {}
+    for article_id, (journal_id, score) in scores.items():
+        trend = trends.get(article_id)
+        if trend is None:
+            trend = ArticleTrend(article_id=article_id, journal_id=journal_id, score=score)
+            to_create.append(trend)
+        else:
+            trend.score = add_scores(trend.score, score)
+            trend.journal_id = journal_id
+            to_update.append(trend)
+        changed[article_id] = (journal_id, trend.score)
+    ArticleTrend.objects.bulk_create(to_create, batch_size=500)
+    ArticleTrend.objects.bulk_update(to_update, ['score', 'journal'], batch_size=500)
+
+    boards = _leaderboards(
+        LeaderboardKind.TRENDING,
+        {journal_id for journal_id, _ in changed.values() if journal_id},
+    )
+    for scope, board in boards.items():
+        merged = dict(board.entries)
+        for article_id, (journal_id, score) in changed.items():
+            if scope is None or journal_id == scope:
+                merged[article_id] = score
+            else:
+                # The article moved to another journal
+                merged.pop(article_id, None)
+        board.entries = [
+            [article_id, score]
+            for article_id, score in heapq.nlargest(TOP_K, merged.items(), key=itemgetter(1))
+        ]
+    _save_leaderboards(boards)
+
+
+def rebuild_trending():
+    """Recompute the trending leaderboards from ArticleTrend (one indexed query per scope)."""
+    journal_ids = list(ArticleTrend.objects.exclude(journal__isnull=True).values_list(
+        'journal_id', flat=True
+    ).order_by().distinct())
+    boards = _leaderboards(LeaderboardKind.TRENDING, journal_ids, replace_all=True)
+    for scope, board in boards.items():
+        trends = ArticleTrend.objects.all() if scope is None else ArticleTrend.objects.filter(journal_id=scope)
+        board.entries = [
+            list(entry) for entry in trends.order_by('-score').values_list('article_id', 'score')[:TOP_K]
+        ]
+    _save_leaderboards(boards)
+
+
+def refresh_most_read(today=None):
+    """Recompute the most-read leaderboards for every window ending ``today``."""
+    today = today or timezone.localdate()
+    for kind, days in MOST_READ_WINDOWS.items():
+        rows = DailyArticleUsage.objects.filter(
+            date__gt=today - timedelta(days=days), date__lte=today
+        ).values('article_id', 'journal_id').annotate(
+            total=Sum(F('views') + F('downloads'))
+        ).order_by().iterator(chunk_size=2000)
+
+        heaps = defaultdict(list)
+        for row in rows:
+            # Ties go to the lower article ID
+            item = (row['total'], -row['article_id'])
+            for scope in {None, row['journal_id']}:
+                heap = heaps[scope]
+                if len(heap) < TOP_K:
+                    heapq.heappush(heap, item)
+                else:
+                    heapq.heappushpop(heap, item)
+
+        boards = _leaderboards(
+            kind, [scope for scope in heaps if scope is not None], replace_all=True
+        )
+        for scope, board in boards.items():
+            board.entries = [
+                [-negated_id, total] for total, negated_id in sorted(heaps.get(scope, []), reverse=True)
+            ]
+        _save_leaderboards(boards)
+
+
+def leaderboard(kind, journal_id=None):
+    """``[article_id, score]`` entries of a ranking, best first."""
+    entries = Leaderboard.objects.filter(kind=kind, journal_id=journal_id).values_list(
+        'entries', flat=True
+    ).first()
+    return entries or []
@@ -0,0 +1,14 @@
+"""URL configuration for analytics app."""
+
+from django.urls import path
+from . import views
+
+app_name = 'analytics'
+
+urlpatterns = [
+    # Admin endpoints
+    path('admin/usage/', views.UsageSummaryView.as_view(), name='admin_usage_summary'),
+    path('admin/usage/journals/', views.UsageByJournalView.as_view(), name='admin_usage_by_journal'),
+    path('admin/usage/top-articles/', views.TopArticlesView.as_view(), name='admin_usage_top_articles'),
+    path('admin/reports/counter/', views.CounterReportView.as_view(), name='admin_counter_report'),
+]
@@ -0,0 +1,161 @@
+"""Views for analytics app."""
+
+from datetime import timedelta
+
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import IsAuthenticated, IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from . import reports, services
+
+
+DEFAULT_RANGE_DAYS = 30
+MAX_TOP_ARTICLES = 100
+
+
+def _date_param(request, name, default):
+    value = request.query_params.get(name)
+    if not value:
+        return default
+    # Whole months (YYYY-MM) are accepted as their first day
+    parsed = parse_date(value) if len(value) > 7 else parse_date(f'{value}-01')
+    if parsed is None:
+        raise ValidationError({name: 'Use the YYYY-MM-DD or YYYY-MM format.'})
+    return parsed
+
+
+def _int_param(request, name, default=None):
+    value = request.query_params.get(name)
+    if value in (None, ''):
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        raise ValidationError({name: 'Must be an integer.'})
+
+
+def _date_range(request):
+    """Inclusive (start, end) from ?start=&end=, defaulting to the last 30 days."""
+    end = _date_param(request, 'end', timezone.localdate())
+    start = _date_param(request, 'start', end - timedelta(days=DEFAULT_RANGE_DAYS - 1))
+    if start > end:
+        raise ValidationError({'start': 'Must not be after end.'})
+    return start, end
+
+
+# =============================================================================
+# Admin Usage Views
+# =============================================================================
+
+class UsageSummaryView(APIView):
+    """
+    Usage totals and time series.
+    
+    GET /api/v1/analytics/admin/usage/
+    
+    Query params: start, end (YYYY-MM-DD, inclusive; default last 30 days),
+    journal, article (IDs), granularity (day|month).
+    """
+    permission_classes = [IsAuthenticated, IsAdminUser]
+    
+    def get(self, request):
+        start, end = _date_range(request)
+        journal_id = _int_param(request, 'journal')
+        article_id = _int_param(request, 'article')
+        granularity = request.query_params.get('granularity', 'day')
+        if granularity not in services.GRANULARITIES:
+            raise ValidationError({'granularity': f'One of: {", ".join(services.GRANULARITIES)}.'})
+        
+        return Response({
+            'start': start,
+            'end': end,
+            'totals': {
+                **services.usage_totals(start, end, journal_id, article_id),
+                'unique_readers': services.unique_readers(start, end, journal_id, article_id),
+            },
+            'series': services.usage_series(start, end, journal_id, article_id, granularity),
+        })
+
+
+class UsageByJournalView(APIView):
+    """
+    Usage totals per journal.
+    
+    GET /api/v1/analytics/admin/usage/journals/?start=&end=
+    """
+    permission_classes = [IsAuthenticated, IsAdminUser]
+    
+    def get(self, request):
+        start, end = _date_range(request)
+        return Response({
+            'start': start,
+            'end': end,
+            'results': services.usage_by_journal(start, end),
+        })
+
+
+class TopArticlesView(APIView):
+    """
+    Most used articles.
+    
+    GET /api/v1/analytics/admin/usage/top-articles/?start=&end=&journal=&limit=&order=
+    """
+    permission_classes = [IsAuthenticated, IsAdminUser]
+    
+    def get(self, request):
+        start, end = _date_range(request)
+        limit = min(max(_int_param(request, 'limit', 10), 1), MAX_TOP_ARTICLES)
+        order = request.query_params.get('order', 'views')
+        if order not in services.TOP_ARTICLE_ORDERINGS:
+            raise ValidationError({'order': f'One of: {", ".join(services.TOP_ARTICLE_ORDERINGS)}.'})
+        
+        return Response({
+            'start': start,
+            'end': end,
+            'results': services.top_articles(
+                start, end, _int_param(request, 'journal'), limit, order
+            ),
+        })
+
+
+# =============================================================================
+# Admin Report Views
+# =============================================================================
+
+class CounterReportView(APIView):
+    """
+    COUNTER-style usage report, streamed as CSV or TSV.
+    
+    GET /api/v1/analytics/admin/reports/counter/
+    
+    Query params: start, end (YYYY-MM or YYYY-MM-DD; widened to whole
+    months; default last 30 days), journal (ID, repeatable),
+    level (journal|article), output (csv|tsv).
+    """
+    permission_classes = [IsAuthenticated, IsAdminUser]
+    
+    def get(self, request):
+        start, end = _date_range(request)
+        level = request.query_params.get('level', 'journal')
+        if level not in reports.LEVELS:
+            raise ValidationError({'level': f'One of: {", ".join(reports.LEVELS)}.'})
+        output = request.query_params.get('output', 'csv')
+        if output not in reports.FORMATS:
+            raise ValidationError({'output': f'One of: {", ".join(reports.FORMATS)}.'})
+        try:
+            journal_ids = [int(value) for value in request.query_params.getlist('journal')]
+        except ValueError:
+            raise ValidationError({'journal': 'Must be an integer.'})
+        
+        _, content_type = reports.FORMATS[output]
+        response = StreamingHttpResponse(
+            reports.stream_counter_report(start, end, level, journal_ids, output),
+            content_type=f'{content_type}; charset=utf-8',
+        )
+        filename = f'counter_{level}_{start:%Y-%m}_{end:%Y-%m}.{output}'
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
@@ -3,7 +3,7 @@
 from django.contrib import admin
 from .models import (
     Author, Article, ArticleAuthor, ArticleFile,
-    ArticleHTMLContent, Figure, Table
+    ArticleHTMLContent, ArticleIdentifier, Figure, Table
 )
 
 
@@ -60,6 +60,14 @@ class TableInline(admin.TabularInline):
     extra = 0
 
 
+class ArticleIdentifierInline(admin.TabularInline):
+    """Inline for identifiers; add legacy IDs here, the rest are synced."""
+    model = ArticleIdentifier
+    extra = 0
+    fields = ('scheme', 'value', 'source')
+    readonly_fields = ('source',)
+
+
 @admin.register(Article)
 class ArticleAdmin(admin.ModelAdmin):
     """Admin configuration for Article model."""
@@ -71,9 +79,9 @@ class ArticleAdmin(admin.ModelAdmin):
     raw_id_fields = ('issue',)
     date_hierarchy = 'published_date'
     prepopulated_fields = {'slug': ('title',)}
-    readonly_fields = ('view_count', 'download_count', 'created_at', 'updated_at')
+    readonly_fields = ('view_count', 'unique_readers', 'download_count', 'created_at', 'updated_at')
     
-    inlines = [ArticleAuthorInline, ArticleFileInline, FigureInline, TableInline]
+    inlines = [ArticleAuthorInline, ArticleFileInline, FigureInline, TableInline, ArticleIdentifierInline]
     
     fieldsets = (
         ('Issue', {
@@ -95,7 +103,7 @@ class ArticleAdmin(admin.ModelAdmin):
             'fields': ('status', 'is_open_access', 'is_featured')
         }),
         ('Analytics', {
-            'fields': ('view_count', 'download_count'),
+            'fields': ('view_count', 'unique_readers', 'download_count'),
             'classes': ('collapse',)
         }),
         ('SEO', {
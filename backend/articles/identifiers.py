@@ -0,0 +1,37 @@
+"""
+Normalization of article identifiers (DOIs, article ID codes, legacy IDs).
+
+Identifiers arrive in many spellings: ``10.1234/ABC.5``, ``doi:10.1234/abc.5``,
+``https://doi.org/10.1234/abc.5``, URL-encoded from a link, with stray
+whitespace. ``normalize_identifier`` maps them all to one case-folded key
+that ArticleIdentifier rows are stored and looked up under.
+"""
+
+import re
+from urllib.parse import unquote
+
+
+# Resolver prefixes stripped from DOIs given as links or "doi:" URIs
+DOI_PREFIXES = re.compile(
+    r'^(?:https?:/+(?:dx\.)?doi\.org/|doi:\s*)',
+    re.IGNORECASE
+)
+WHITESPACE = re.compile(r'\s+')
+
+# Scheme for each JATS article-id pub-id-type (others are stored as "other")
+XML_ID_SCHEMES = {
+    'doi': 'doi',
+    'publisher-id': 'article_id',
+    'pmid': 'pmid',
+    'pmcid': 'pmcid',
+}
+
+MAX_IDENTIFIER_LENGTH = 255
+
+
+def normalize_identifier(value):
+    """Case-folded lookup key for an identifier, or '' if there's nothing in it."""
+    value = unquote(str(value or '')).strip()
+    value = DOI_PREFIXES.sub('', value)
+    value = WHITESPACE.sub(' ', value).strip()
+    return value.casefold()[:MAX_IDENTIFIER_LENGTH]
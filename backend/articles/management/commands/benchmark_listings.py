@@ -0,0 +1,128 @@
+"""
+Management command to compare the regular and values-based list serializers.
+
+Creates synthetic journals, issues and articles inside a transaction that
+is rolled back afterwards, then times both serializers over the same
+querysets (including the database queries) and prints rows per second.
+The regular serializers run with the per-object fragment cache
+(backend/fragments.py) turned off, so every run serializes each row and
+the baseline is the uncached cost the fast path replaces.
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from articles.models import Article, ArticleAuthor, Author
+from articles.serializers import ArticleListSerializer, ArticleListValuesSerializer
+from backend.fragments import FragmentCacheMixin
+from issues.models import Issue
+from issues.serializers import IssueListSerializer, IssueListValuesSerializer
+from journals.models import Journal, Subject
+from journals.serializers import JournalListSerializer, JournalListValuesSerializer
+from journals.views import subjects_prefetch
+from volumes.models import Volume
+
+
+class Command(BaseCommand):
+    help = 'Benchmark the regular and fast path list serializers on synthetic data'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rows',
+            type=int,
+            default=1000,
+            help='Rows per listing (default: 1000)',
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=5,
+            help='Timed runs per serializer; the best one is reported (default: 5)',
+        )
+
+    def handle(self, *args, **options):
+        rows = max(options['rows'], 1)
+        repeat = max(options['repeat'], 1)
+
+        with transaction.atomic():
+            self.create_data(rows)
+            listings = [
+                ('articles', Article.objects.filter(slug__startswith='bench-').select_related(
+                    'journal', 'issue__volume__journal', 'volume__journal'
+                ).prefetch_related('article_authors__author'), ArticleListSerializer, ArticleListValuesSerializer),
+                ('journals', Journal.objects.filter(slug__startswith='bench-').prefetch_related(
+                    subjects_prefetch()
+                ), JournalListSerializer, JournalListValuesSerializer),
+                ('issues', Issue.objects.filter(volume__journal__slug='bench-0').select_related(
+                    'volume__journal'
+                ), IssueListSerializer, IssueListValuesSerializer),
+            ]
+            self.stdout.write('Regular serializers run with the fragment cache disabled.')
+            for name, queryset, serializer_class, fast_serializer_class in listings:
+                serializer_class = self.uncached(serializer_class)
+                regular = self.best_time(repeat, lambda: serializer_class(queryset.all(), many=True).data)
+                fast_serializer = fast_serializer_class()
+                fast = self.best_time(
+                    repeat, lambda: fast_serializer.serialize(fast_serializer.values_queryset(queryset.all()))
+                )
+                self.stdout.write(
+                    f'{name:<10} regular {rows / regular:>10.0f} rows/s   '
+                    f'fast {rows / fast:>10.0f} rows/s   ({regular / fast:.1f}x)'
+                )
+            transaction.set_rollback(True)
+
+        self.stdout.write(self.style.SUCCESS('Benchmark finished; synthetic data rolled back.'))
+
+    def uncached(self, serializer_class):
+        """``serializer_class`` with its fragment cache (if any) turned off."""
+        if not issubclass(serializer_class, FragmentCacheMixin):
+            return serializer_class
+        return type(serializer_class.__name__, (serializer_class,), {'fragment_cache': False})
+
+    def best_time(self, repeat, run):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            run()
+            timings.append(time.perf_counter() - started)
+        return min(timings)
+
+    def create_data(self, rows):
+        subjects = Subject.objects.bulk_create(
+            Subject(name=f'Bench subject {i}', slug=f'bench-subject-{i}') for i in range(10)
+        )
+        journals = Journal.objects.bulk_create(
+            Journal(title=f'Bench journal {i}', slug=f'bench-{i}', cover_image=f'journals/covers/bench-{i}.png')
+            for i in range(rows)
+        )
+        Journal.subjects.through.objects.bulk_create(
+            Journal.subjects.through(journal_id=journal.pk, subject_id=subjects[(i + k) % 10].pk)
+            for i, journal in enumerate(journals) for k in range(3)
+        )
+
+        volume = Volume.objects.create(journal=journals[0], volume_number=1, year=2025)
+        issues = Issue.objects.bulk_create(
+            Issue(volume=volume, issue_number=i + 1, cover_image=f'issues/covers/bench-{i}.jpg')
+            for i in range(rows)
+        )
+
+        authors = Author.objects.bulk_create(
+            Author(first_name='Bench', last_name=f'Author {i}') for i in range(50)
+        )
+        articles = Article.objects.bulk_create(
+            Article(
+                title=f'Bench article {i}', slug=f'bench-article-{i}', issue=issues[i % 20],
+                status='published', abstract='Lorem ipsum dolor sit amet. ' * 20,
+                keywords=['bench', 'mark'], page_start=str(i), page_end=str(i + 9),
+                pdf_file=f'articles/pdf/bench-{i}.pdf',
+            )
+            for i in range(rows)
+        )
+        ArticleAuthor.objects.bulk_create(
+            ArticleAuthor(
+                article=article, author=authors[(i + k) % 50], author_order=k + 1, is_corresponding=k == 0,
+            )
+            for i, article in enumerate(articles) for k in range(3)
+        )
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.9 on 2026-10-19 06:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0011_article_crossmark_logo_article_crossmark_url_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='author',
+            name='article_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Number of articles by this author (maintained automatically)'),
+        ),
+    ]
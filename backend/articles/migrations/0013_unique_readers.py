@@ -0,0 +1,18 @@
+# Generated by Django 5.2.9 on 2026-10-19 06:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0012_denormalized_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='unique_readers',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Estimated number of distinct readers (updated by the usage rollup)'),
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.9 on 2026-10-19 06:49
+
+from django.db import migrations, models
+
+from articles.sections import build_reference_index, build_section_index
+
+
+def backfill_indexes(apps, schema_editor):
+    ArticleHTMLContent = apps.get_model('articles', 'ArticleHTMLContent')
+    batch = []
+    contents = ArticleHTMLContent.objects.only('body_html', 'references_html').iterator(chunk_size=100)
+    for content in contents:
+        content.section_index = build_section_index(content.body_html)
+        content.reference_index = build_reference_index(content.references_html)
+        batch.append(content)
+        if len(batch) >= 100:
+            ArticleHTMLContent.objects.bulk_update(batch, ['section_index', 'reference_index'])
+            batch = []
+    ArticleHTMLContent.objects.bulk_update(batch, ['section_index', 'reference_index'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0013_unique_readers'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='articlehtmlcontent',
+            name='reference_index',
+            field=models.JSONField(blank=True, default=list, editable=False, help_text='Id and offsets of each reference in references_html'),
+        ),
+        migrations.AddField(
+            model_name='articlehtmlcontent',
+            name='section_index',
+            field=models.JSONField(blank=True, default=list, editable=False, help_text='Outline of body_html: id, title, level, parent and offsets of each section'),
+        ),
+        migrations.RunPython(backfill_indexes, migrations.RunPython.noop),
+    ]
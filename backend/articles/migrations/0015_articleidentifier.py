@@ -0,0 +1,58 @@
+# Generated by Django 5.2.9 on 2026-10-19 07:08
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+from articles.identifiers import normalize_identifier
+
+
+def backfill_identifiers(apps, schema_editor):
+    Article = apps.get_model('articles', 'Article')
+    ArticleIdentifier = apps.get_model('articles', 'ArticleIdentifier')
+    seen = set()
+    batch = []
+    articles = Article.objects.order_by('pk').values_list('pk', 'doi', 'article_id_code').iterator(chunk_size=500)
+    for pk, doi, article_id_code in articles:
+        for scheme, value in (('doi', doi), ('article_id', article_id_code)):
+            normalized = normalize_identifier(value)
+            # The oldest article keeps an identifier shared by several
+            if not normalized or (scheme, normalized) in seen:
+                continue
+            seen.add((scheme, normalized))
+            batch.append(ArticleIdentifier(
+                article_id=pk, scheme=scheme, value=value.strip(),
+                normalized=normalized, source='article'
+            ))
+        if len(batch) >= 500:
+            ArticleIdentifier.objects.bulk_create(batch)
+            batch = []
+    ArticleIdentifier.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0014_html_content_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArticleIdentifier',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('scheme', models.CharField(choices=[('doi', 'DOI'), ('article_id', 'Article ID'), ('pmid', 'PubMed ID'), ('pmcid', 'PubMed Central ID'), ('other', 'Other / legacy ID')], default='other', max_length=20)),
+                ('value', models.CharField(help_text='The identifier as given', max_length=255)),
+                ('normalized', models.CharField(db_index=True, editable=False, help_text='Case-folded lookup key, maintained automatically', max_length=255)),
+                ('source', models.CharField(choices=[('article', 'Article fields'), ('xml', 'JATS XML'), ('manual', 'Added manually')], default='manual', max_length=20)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('article', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='identifiers', to='articles.article')),
+            ],
+            options={
+                'verbose_name': 'article identifier',
+                'verbose_name_plural': 'article identifiers',
+                'ordering': ['scheme', 'normalized'],
+                'constraints': [models.UniqueConstraint(fields=('scheme', 'normalized'), name='unique_article_identifier')],
+            },
+        ),
+        migrations.RunPython(backfill_identifiers, migrations.RunPython.noop),
+    ]
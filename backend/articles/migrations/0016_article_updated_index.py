@@ -0,0 +1,20 @@
+# Generated by Django 5.2.9 on 2026-10-19 07:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0015_articleidentifier'),
+        ('issues', '0002_denormalized_counters'),
+        ('journals', '0021_denormalized_counters'),
+        ('volumes', '0003_denormalized_counters'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(fields=['updated_at', 'id'], name='article_updated_idx'),
+        ),
+    ]
@@ -12,12 +12,21 @@ URL patterns:
 """
 
 from django.db import models
+from django.db.models.functions import Substr
 from django.utils.text import slugify
 from django.utils.functional import cached_property
+import logging
 import uuid
 
+from backend.counterfields import CounterFieldsMixin
 
-class Author(models.Model):
+from .identifiers import MAX_IDENTIFIER_LENGTH, XML_ID_SCHEMES, normalize_identifier
+from .sections import build_reference_index, build_section_index
+
+logger = logging.getLogger(__name__)
+
+
+class Author(CounterFieldsMixin, models.Model):
     """
     Author entity - can be associated with multiple articles.
     
@@ -64,6 +73,14 @@ class Author(models.Model):
         help_text='Short biography'
     )
     
+    # Denormalized counter, kept up to date by journals/counters.py
+    article_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        help_text='Number of articles by this author (maintained automatically)'
+    )
+    COUNTER_FIELDS = ('article_count',)
+    
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
@@ -85,11 +102,6 @@ class Author(models.Model):
         """Name formatted for citations (Last, First Initial)."""
         first_initial = self.first_name[0] if self.first_name else ''
         return f'{self.last_name}, {first_initial}.'
-    
-    @property
-    def article_count(self):
-        """Number of articles by this author."""
-        return self.article_authors.count()
 
 
 class ArticleType(models.TextChoices):
@@ -343,6 +355,11 @@ class Article(models.Model):
         default=0,
         help_text='Number of times PDF has been downloaded'
     )
+    unique_readers = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        help_text='Estimated number of distinct readers (updated by the usage rollup)'
+    )
     
     # Scores
     cite_score = models.CharField(
@@ -409,6 +426,10 @@ class Article(models.Model):
         verbose_name = 'article'
         verbose_name_plural = 'articles'
         ordering = ['-published_date', '-created_at']
+        indexes = [
+            # Keyset order of OAI-PMH harvests (syndication/oai.py)
+            models.Index(fields=['updated_at', 'id'], name='article_updated_idx'),
+        ]
     
     def __str__(self):
         return self.title[:100]
@@ -516,6 +537,62 @@ class Article(models.Model):
     def increment_download_count(self):
         """Increment the download count atomically."""
         Article.objects.filter(pk=self.pk).update(download_count=models.F('download_count') + 1)
+    
+    def sync_identifiers(self, xml_ids=None):
+        """
+        Bring the article's ArticleIdentifier rows in line with its fields.
+        
+        Rows from ``doi`` and ``article_id_code`` follow those fields. When
+        ``xml_ids`` (``(pub-id-type, value)`` pairs from the JATS XML) is
+        given, it replaces the XML-sourced rows. Manually added rows are
+        kept. An identifier already held by another article is skipped.
+        """
+        wanted = {}
+        for scheme, value in [
+            (IdentifierScheme.DOI, self.doi),
+            (IdentifierScheme.ARTICLE_ID, self.article_id_code),
+        ]:
+            if normalize_identifier(value):
+                wanted[(scheme, normalize_identifier(value))] = (value.strip(), IdentifierSource.ARTICLE)
+        replaced_sources = [IdentifierSource.ARTICLE]
+        if xml_ids is not None:
+            replaced_sources.append(IdentifierSource.XML)
+            for id_type, value in xml_ids:
+                scheme = XML_ID_SCHEMES.get(id_type, IdentifierScheme.OTHER)
+                key = (scheme, normalize_identifier(value))
+                if key[1] and key not in wanted:
+                    wanted[key] = (value.strip()[:MAX_IDENTIFIER_LENGTH], IdentifierSource.XML)
+        
+        existing = {
+            (row.scheme, row.normalized): row
+            for row in ArticleIdentifier.objects.filter(
+                models.Q(article=self) | models.Q(
+                    scheme__in=[scheme for scheme, _ in wanted],
+                    normalized__in=[normalized for _, normalized in wanted]
+                )
+            )
+        }
+        stale = [
+            row.pk for key, row in existing.items()
+            if row.article_id == self.pk and row.source in replaced_sources and key not in wanted
+        ]
+        if stale:
+            ArticleIdentifier.objects.filter(pk__in=stale).delete()
+        
+        new_rows = []
+        for (scheme, normalized), (value, source) in wanted.items():
+            row = existing.get((scheme, normalized))
+            if row is None:
+                new_rows.append(ArticleIdentifier(
+                    article=self, scheme=scheme, value=value,
+                    normalized=normalized, source=source
+                ))
+            elif row.article_id != self.pk:
+                logger.warning(
+                    'Identifier %s %r of article %s already belongs to article %s',
+                    scheme, value, self.pk, row.article_id
+                )
+        ArticleIdentifier.objects.bulk_create(new_rows, ignore_conflicts=True)
 
 
 class ArticleAuthor(models.Model):
@@ -559,6 +636,116 @@ class ArticleAuthor(models.Model):
         return f'{self.author.full_name} - {self.article.title[:50]}'
 
 
+class IdentifierScheme(models.TextChoices):
+    """Kinds of identifiers an article can be looked up by."""
+    DOI = 'doi', 'DOI'
+    ARTICLE_ID = 'article_id', 'Article ID'
+    PMID = 'pmid', 'PubMed ID'
+    PMCID = 'pmcid', 'PubMed Central ID'
+    OTHER = 'other', 'Other / legacy ID'
+
+
+class IdentifierSource(models.TextChoices):
+    """Where an ArticleIdentifier came from."""
+    ARTICLE = 'article', 'Article fields'
+    XML = 'xml', 'JATS XML'
+    MANUAL = 'manual', 'Added manually'
+
+
+# Which scheme wins when an identifier is looked up without one
+IDENTIFIER_SCHEME_PRIORITY = [
+    IdentifierScheme.DOI, IdentifierScheme.ARTICLE_ID,
+    IdentifierScheme.PMID, IdentifierScheme.PMCID, IdentifierScheme.OTHER,
+]
+
+
+class ArticleIdentifierQuerySet(models.QuerySet):
+    """Lookups of articles by identifier."""
+    
+    def resolve(self, values, scheme=None):
+        """
+        Map each of ``values`` to its ArticleIdentifier (with the article
+        and its placement loaded), or None. One indexed query for all of them.
+        """
+        keys = {value: normalize_identifier(value) for value in values}
+        rows = self.filter(
+            normalized__in={key for key in keys.values() if key}
+        ).select_related(
+            'article__journal', 'article__issue__volume__journal', 'article__volume__journal'
+        )
+        if scheme:
+            rows = rows.filter(scheme=scheme)
+        
+        best = {}
+        for row in rows:
+            current = best.get(row.normalized)
+            if current is None or (
+                IDENTIFIER_SCHEME_PRIORITY.index(row.scheme) <
+                IDENTIFIER_SCHEME_PRIORITY.index(current.scheme)
+            ):
+                best[row.normalized] = row
+        return {value: best.get(key) for value, key in keys.items()}
+
+
+class ArticleIdentifier(models.Model):
+    """
+    Normalized identifier of an article (see articles/identifiers.py).
+    
+    Kept in sync with Article.doi and article_id_code and the article-ids
+    of the JATS XML; legacy IDs can be added by hand. ``normalized`` is
+    unique per scheme and indexed, so DOI links, old URLs and bulk link
+    checks resolve with one indexed lookup.
+    """
+    
+    article = models.ForeignKey(
+        Article,
+        on_delete=models.CASCADE,
+        related_name='identifiers'
+    )
+    scheme = models.CharField(
+        max_length=20,
+        choices=IdentifierScheme.choices,
+        default=IdentifierScheme.OTHER
+    )
+    value = models.CharField(
+        max_length=255,
+        help_text='The identifier as given'
+    )
+    normalized = models.CharField(
+        max_length=255,
+        db_index=True,
+        editable=False,
+        help_text='Case-folded lookup key, maintained automatically'
+    )
+    source = models.CharField(
+        max_length=20,
+        choices=IdentifierSource.choices,
+        default=IdentifierSource.MANUAL
+    )
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    objects = ArticleIdentifierQuerySet.as_manager()
+    
+    class Meta:
+        verbose_name = 'article identifier'
+        verbose_name_plural = 'article identifiers'
+        ordering = ['scheme', 'normalized']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['scheme', 'normalized'],
+                name='unique_article_identifier'
+            ),
+        ]
+    
+    def __str__(self):
+        return f'{self.get_scheme_display()}: {self.value}'
+    
+    def save(self, *args, **kwargs):
+        self.normalized = normalize_identifier(self.value)
+        super().save(*args, **kwargs)
+
+
 class FileType(models.TextChoices):
     """Types of files that can be attached to articles."""
     XML = 'xml', 'XML Source'
@@ -692,6 +879,20 @@ class ArticleHTMLContent(models.Model):
         help_text='Metadata about tables extracted from XML'
     )
     
+    # Offsets into body_html / references_html (see articles/sections.py)
+    section_index = models.JSONField(
+        default=list,
+        blank=True,
+        editable=False,
+        help_text='Outline of body_html: id, title, level, parent and offsets of each section'
+    )
+    reference_index = models.JSONField(
+        default=list,
+        blank=True,
+        editable=False,
+        help_text='Id and offsets of each reference in references_html'
+    )
+    
     # Parsing status
     parsing_status = models.CharField(
         max_length=20,
@@ -719,6 +920,55 @@ class ArticleHTMLContent(models.Model):
     def __str__(self):
         return f'HTML Content for: {self.article.title[:50]}'
 
+    INDEXES = (
+        ('body_html', 'section_index', build_section_index),
+        ('references_html', 'reference_index', build_reference_index),
+    )
+
+    def save(self, *args, **kwargs):
+        # Rebuild the offset indexes whenever the HTML they point into is saved
+        update_fields = kwargs.get('update_fields')
+        deferred = self.get_deferred_fields()
+        for source, index, build in self.INDEXES:
+            if source in deferred or (update_fields is not None and source not in update_fields):
+                continue
+            setattr(self, index, build(getattr(self, source)))
+            if update_fields is not None:
+                update_fields = kwargs['update_fields'] = {*update_fields, index}
+        super().save(*args, **kwargs)
+
+    def _slice(self, field, start, end):
+        """Characters start:end of a stored text field, cut in the database."""
+        if end <= start:
+            return ''
+        return ArticleHTMLContent.objects.filter(pk=self.pk).annotate(
+            fragment=Substr(field, start + 1, end - start)
+        ).values_list('fragment', flat=True).first() or ''
+
+    def get_section(self, section_id):
+        """Index entry of a body section, or None."""
+        return next((section for section in self.section_index if section['id'] == section_id), None)
+
+    def get_resolved_section_html(self, section, request=None):
+        """HTML of one ``section_index`` entry with figure references resolved."""
+        return self._resolve_refs(
+            self._slice('body_html', section['start'], section['end']), request
+        )
+
+    def get_reference_items(self, entries):
+        """``[{'id', 'html'}]`` for ``reference_index`` entries (in document order), in one query."""
+        if not entries:
+            return []
+        start = entries[0]['start']
+        chunk = self._slice('references_html', start, entries[-1]['end'])
+        return [
+            {
+                'id': entry['id'],
+                'html': chunk[entry['start'] - start:entry['end'] - start].strip(),
+            }
+            for entry in entries
+        ]
+
     def get_resolved_body_html(self, request=None):
         """Resolve figure references in body HTML on the fly."""
         return self._resolve_refs(self.body_html, request)
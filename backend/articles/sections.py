@@ -0,0 +1,128 @@
+"""
+Section and reference indexes for parsed article HTML.
+
+The XML parser renders each JATS <sec> as a ``section-title`` heading
+followed by a <section> element, and each reference as a
+``reference-line`` block. The functions here record where those pieces
+start and end in ArticleHTMLContent.body_html / references_html, so the
+full-text API can send the outline first and then cut single sections or
+pages of references out of the stored HTML on demand.
+
+Offsets are character positions (what Python slicing and the database's
+SUBSTR count), with ``end`` exclusive.
+"""
+
+import html
+import re
+
+
+HEADING_RE = re.compile(r'<h([2-6]) class="section-title" id="([^"]*)">(.*?)</h\1>', re.S)
+SECTION_TAG_RE = re.compile(r'<section\b|</section>')
+REFERENCE_RE = re.compile(r'<div class="reference-line" id="([^"]*)">')
+BODY_OPEN = '<div class="article-body">'
+REFERENCES_OPEN = '<div class="references-list-container">'
+CONTAINER_CLOSE = '</div>'
+
+# Content before the first section heading (e.g. an untitled introduction)
+LEADING_SECTION_ID = 'body-start'
+
+
+def plain_text(fragment):
+    """Text of an HTML fragment with tags removed and whitespace collapsed."""
+    return ' '.join(html.unescape(re.sub(r'<[^>]+>', ' ', fragment)).split())
+
+
+def _content_bounds(body_html):
+    """Offsets of the body content inside the parser's wrapping <div>."""
+    start, end = 0, len(body_html)
+    if body_html.startswith(BODY_OPEN):
+        start = len(BODY_OPEN)
+        closing = body_html.rfind(CONTAINER_CLOSE)
+        if closing >= start:
+            end = closing
+    return start, end
+
+
+def _section_end(body_html, position, limit):
+    """End of the <section> element opened after ``position`` (closing tag included)."""
+    depth = 0
+    for match in SECTION_TAG_RE.finditer(body_html, position, limit):
+        if match.group() == '</section>':
+            depth -= 1
+            if depth <= 0:
+                return match.end()
+        else:
+            depth += 1
+    return limit
+
+
+def build_section_index(body_html):
+    """
+    Outline of ``body_html`` as a flat list, in document order.
+
+    Each entry has ``id``, ``title``, ``level`` (2 for top-level sections),
+    ``parent`` (ID or None), ``start`` and ``end``. Top-level sections are
+    extended to the next top-level heading, so together they cover the
+    whole body; untitled leading content gets its own entry.
+    """
+    if not body_html:
+        return []
+    content_start, content_end = _content_bounds(body_html)
+
+    sections = []
+    used_ids = set()
+    open_sections = []  # (level, id) of the enclosing headings
+    for number, match in enumerate(HEADING_RE.finditer(body_html, content_start, content_end), 1):
+        level = int(match.group(1))
+        section_id = match.group(2) or f'section-{number}'
+        if section_id in used_ids:
+            section_id = f'{section_id}-{number}'
+        used_ids.add(section_id)
+
+        while open_sections and open_sections[-1][0] >= level:
+            open_sections.pop()
+        sections.append({
+            'id': section_id,
+            'title': plain_text(match.group(3)),
+            'level': level,
+            'parent': open_sections[-1][1] if open_sections else None,
+            'start': match.start(),
+            'end': _section_end(body_html, match.end(), content_end),
+        })
+        open_sections.append((level, section_id))
+
+    top_level = [section for section in sections if section['parent'] is None]
+    for section, following in zip(top_level, top_level[1:] + [None]):
+        section['end'] = following['start'] if following else content_end
+
+    first_start = top_level[0]['start'] if top_level else content_end
+    if body_html[content_start:first_start].strip():
+        sections.insert(0, {
+            'id': LEADING_SECTION_ID,
+            'title': '',
+            'level': 2,
+            'parent': None,
+            'start': content_start,
+            'end': first_start,
+        })
+    return sections
+
+
+def build_reference_index(references_html):
+    """``[{'id', 'start', 'end'}]`` of each reference in ``references_html``, in order."""
+    if not references_html:
+        return []
+    matches = list(REFERENCE_RE.finditer(references_html))
+    if not matches:
+        return []
+    container_end = len(references_html)
+    if references_html.startswith(REFERENCES_OPEN):
+        container_end = references_html.rfind(CONTAINER_CLOSE)
+    return [
+        {
+            'id': match.group(1),
+            'start': match.start(),
+            'end': following.start() if following else container_end,
+        }
+        for match, following in zip(matches, matches[1:] + [None])
+    ]
@@ -1,12 +1,73 @@
 """Serializers for articles app."""
 
+from collections import defaultdict
+
 from rest_framework import serializers
+
+from backend.caching import article_tag, journal_tag
+from backend.fastpath import ValuesSerializer
+from backend.fragments import FragmentCacheMixin, FragmentListSerializer
 from .models import (
     Author, Article, ArticleAuthor, ArticleFile,
     ArticleHTMLContent, Figure, Table
 )
 
 
+def select_fields(available, profiles, params):
+    """
+    Names of the fields requested with ?fields=, ?omit= and ?profile=
+    (see SparseFieldsMixin), or None when all of ``available`` are wanted.
+    """
+    def names(param):
+        return {name.strip() for name in params.get(param, '').split(',') if name.strip()}
+    
+    profile = profiles.get(params.get('profile'))
+    fields, omit = names('fields'), names('omit')
+    if profile is None and not fields and not omit:
+        return None
+    
+    selected = set(profile) if profile is not None else set(available)
+    if fields:
+        selected &= fields
+    return selected - omit
+
+
+def article_fragment_tags(article):
+    """Cache tags for a cached article representation (see backend/fragments.py)."""
+    tags = [article_tag(article.pk)]
+    journal = article.get_journal
+    if journal:
+        # Journal, volume, issue and neighbouring-article changes purge this one
+        tags.append(journal_tag(journal.pk))
+    return tags
+
+
+class SparseFieldsMixin:
+    """
+    Lets clients choose the fields of a serializer from the query string.
+    
+    - ?fields=id,title: only these fields
+    - ?omit=abstract,issue: all fields except these
+    - ?profile=<name>: a named field set from ``field_profiles``
+    
+    ``fields``/``omit`` apply on top of a profile. Unselected fields are
+    removed from the serializer before anything is rendered, so their
+    SerializerMethodFields and related lookups never run.
+    """
+    
+    field_profiles = {}
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get('request')
+        if request is None:
+            return
+        selected = select_fields(self.fields, self.field_profiles, request.query_params)
+        if selected is not None:
+            for name in set(self.fields) - selected:
+                self.fields.pop(name)
+
+
 class AuthorSerializer(serializers.ModelSerializer):
     """Serializer for Author model."""
     
@@ -141,8 +202,15 @@ class ArticleHTMLContentSerializer(serializers.ModelSerializer):
         return obj.get_resolved_body_html(self.context.get('request'))
 
 
-class ArticleListSerializer(serializers.ModelSerializer):
-    """Serializer for article listings."""
+class ArticleListSerializer(FragmentCacheMixin, SparseFieldsMixin, serializers.ModelSerializer):
+    """
+    Serializer for article listings.
+    
+    Supports ?fields=, ?omit= and ?profile=compact (see SparseFieldsMixin).
+    The compact profile is meant for article cards: no abstract, keywords,
+    file links or duplicated journal/volume/issue objects. Rendered rows are
+    cached per article (see backend/fragments.py).
+    """
     
     authors = serializers.SerializerMethodField()
     article_type_display = serializers.CharField(source='get_article_type_display', read_only=True)
@@ -166,11 +234,26 @@ class ArticleListSerializer(serializers.ModelSerializer):
             'journal_info', 'journal_slug', 'volume_info', 'issue_info', 'issue',
             'published_date', 'is_open_access', 'is_featured', 'is_special_issue', 'is_preface',
             'pdf_file', 'xml_file', 'epub_file', 'mobi_file', 'prc_file',
-            'authors', 'view_count'
+            'authors', 'view_count', 'unique_readers'
         ]
+        list_serializer_class = FragmentListSerializer
+    
+    live_fields = ('view_count', 'unique_readers')
+    
+    field_profiles = {
+        'compact': [
+            'id', 'title', 'slug', 'doi', 'article_type', 'article_type_display',
+            'journal_slug', 'pages', 'volume_number', 'issue_number', 'year',
+            'published_date', 'is_open_access', 'authors',
+        ],
+    }
+    
+    def fragment_tags(self, instance):
+        return article_fragment_tags(instance)
     
     def get_authors(self, obj):
-        article_authors = obj.article_authors.order_by('author_order')
+        # Already ordered by author_order; uses prefetch_related when present
+        article_authors = obj.article_authors.all()
         return [
             {
                 'id': aa.author.id,
@@ -247,8 +330,163 @@ class ArticleListSerializer(serializers.ModelSerializer):
         return None
 
 
-class ArticleDetailSerializer(serializers.ModelSerializer):
-    """Full serializer for article detail view."""
+class ArticleListValuesSerializer(ValuesSerializer):
+    """
+    ArticleListSerializer output built from ``.values()`` rows (see
+    backend/fastpath.py), including ?fields=/?omit=/?profile=.
+    
+    The article's journal and volume are resolved from the joined columns
+    the same way Article.get_journal / get_volume do, and the authors of
+    the whole page come from one query.
+    """
+    
+    model = Article
+    values = (
+        'id', 'article_id_code', 'title', 'slug', 'doi', 'article_type',
+        'status', 'abstract', 'keywords', 'keywords_display',
+        'page_start', 'page_end', 'article_number', 'published_date',
+        'is_open_access', 'is_featured', 'is_special_issue', 'is_preface',
+        'pdf_file', 'xml_file', 'epub_file', 'mobi_file', 'prc_file',
+        'view_count', 'unique_readers',
+        'journal_id', 'journal__title', 'journal__slug',
+        'volume_id', 'volume__volume_number', 'volume__year', 'volume__is_archived',
+        'volume__journal_id', 'volume__journal__title', 'volume__journal__slug',
+        'issue_id', 'issue__issue_number', 'issue__title',
+        'issue__volume_id', 'issue__volume__volume_number', 'issue__volume__year',
+        'issue__volume__is_archived',
+        'issue__volume__journal_id', 'issue__volume__journal__title', 'issue__volume__journal__slug',
+    )
+    file_fields = ('pdf_file', 'xml_file', 'epub_file', 'mobi_file', 'prc_file')
+    
+    def __init__(self, context=None):
+        super().__init__(context)
+        self.article_types = dict(Article._meta.get_field('article_type').flatchoices)
+        self.selected = None
+        if self.request is not None:
+            self.selected = select_fields(
+                ArticleListSerializer.Meta.fields,
+                ArticleListSerializer.field_profiles,
+                self.request.query_params,
+            )
+    
+    def prepare(self, rows):
+        self.authors = defaultdict(list)
+        if self.selected is not None and 'authors' not in self.selected:
+            return
+        article_authors = ArticleAuthor.objects.filter(
+            article_id__in=[row['id'] for row in rows]
+        ).values_list(
+            'article_id', 'author_id', 'author__first_name', 'author__last_name', 'is_corresponding'
+        )
+        for article_id, author_id, first_name, last_name, is_corresponding in article_authors:
+            self.authors[article_id].append({
+                'id': author_id,
+                'name': f'{first_name} {last_name}',
+                'is_corresponding': is_corresponding,
+            })
+    
+    @staticmethod
+    def _journal(row):
+        """Like Article.get_journal: own journal, then the issue's, then the volume's."""
+        for prefix in ('journal', 'issue__volume__journal', 'volume__journal'):
+            if row[f'{prefix}_id']:
+                return {
+                    'id': row[f'{prefix}_id'],
+                    'title': row[f'{prefix}__title'],
+                    'slug': row[f'{prefix}__slug'],
+                }
+        return None
+    
+    @staticmethod
+    def _volume(row):
+        """Like Article.get_volume: own volume, then the issue's."""
+        for prefix in ('volume', 'issue__volume'):
+            if row[f'{prefix}_id']:
+                return {
+                    'id': row[f'{prefix}_id'],
+                    'volume_number': row[f'{prefix}__volume_number'],
+                    'year': row[f'{prefix}__year'],
+                    'is_archived': row[f'{prefix}__is_archived'],
+                }
+        return None
+    
+    @staticmethod
+    def _pages(row):
+        if row['page_start'] and row['page_end']:
+            return f'{row["page_start"]}-{row["page_end"]}'
+        if row['page_start']:
+            return row['page_start']
+        if row['article_number']:
+            return f'Article {row["article_number"]}'
+        return ''
+    
+    def to_representation(self, row):
+        journal = self._journal(row)
+        volume = self._volume(row)
+        issue = {
+            'id': row['issue_id'],
+            'issue_number': row['issue__issue_number'],
+            'title': row['issue__title'],
+        } if row['issue_id'] else None
+        
+        if volume and volume['year']:
+            year = volume['year']
+        elif row['published_date']:
+            year = row['published_date'].year
+        else:
+            year = None
+        
+        nested_volume = {
+            'id': volume['id'],
+            'volume_number': volume['volume_number'],
+            'year': volume['year'],
+            'journal': journal,
+        } if volume else None
+        if issue:
+            nested_issue = {**issue, 'volume': nested_volume}
+        elif volume:
+            nested_issue = {'id': None, 'volume': nested_volume}
+        else:
+            nested_issue = None
+        
+        data = {
+            'id': row['id'],
+            'article_id_code': row['article_id_code'],
+            'title': row['title'],
+            'slug': row['slug'],
+            'doi': row['doi'],
+            'article_type': row['article_type'],
+            'article_type_display': str(self.article_types.get(row['article_type'], row['article_type'])),
+            'status': row['status'],
+            'abstract': row['abstract'],
+            'keywords': row['keywords'],
+            'keywords_display': row['keywords_display'],
+            'pages': self._pages(row),
+            'volume_number': self.text(volume['volume_number']) if volume else None,
+            'issue_number': self.text(issue['issue_number']) if issue else None,
+            'year': year,
+            'journal_info': journal,
+            'journal_slug': journal['slug'] if journal else None,
+            'volume_info': volume,
+            'issue_info': issue,
+            'issue': nested_issue,
+            'published_date': self.date(row['published_date']),
+            'is_open_access': row['is_open_access'],
+            'is_featured': row['is_featured'],
+            'is_special_issue': row['is_special_issue'],
+            'is_preface': row['is_preface'],
+            **{name: self.file_url(row[name], name) for name in self.file_fields},
+            'authors': self.authors.get(row['id'], []),
+            'view_count': row['view_count'],
+            'unique_readers': row['unique_readers'],
+        }
+        if self.selected is not None:
+            data = {name: value for name, value in data.items() if name in self.selected}
+        return data
+
+
+class ArticleDetailSerializer(FragmentCacheMixin, serializers.ModelSerializer):
+    """Full serializer for article detail view (cached per article, see backend/fragments.py)."""
     
     authors = serializers.SerializerMethodField()
     journal_info = serializers.SerializerMethodField()
@@ -274,7 +512,7 @@ class ArticleDetailSerializer(serializers.ModelSerializer):
             'is_open_access', 'is_featured', 'is_special_issue', 'is_preface',
             'xml_file', 'pdf_file', 'epub_file', 'prc_file', 'mobi_file',
             'ris_file', 'bib_file', 'endnote_file',
-            'view_count', 'download_count',
+            'view_count', 'unique_readers', 'download_count',
             'cite_score', 'cite_score_url', 'scopus_score', 'scopus_score_url',
             'top_highlighted_line', 'crossmark_logo', 'crossmark_url',
             'meta_title', 'meta_description',
@@ -284,7 +522,13 @@ class ArticleDetailSerializer(serializers.ModelSerializer):
             'citation', 'next_article', 'previous_article',
             'created_at', 'updated_at'
         ]
-        read_only_fields = ['id', 'view_count', 'download_count', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'view_count', 'unique_readers', 'download_count', 'created_at', 'updated_at']
+        list_serializer_class = FragmentListSerializer
+    
+    live_fields = ('view_count', 'unique_readers', 'download_count')
+    
+    def fragment_tags(self, instance):
+        return article_fragment_tags(instance)
     
     def get_authors(self, obj):
         article_authors = obj.article_authors.order_by('author_order')
@@ -478,6 +722,62 @@ class ArticleFullTextSerializer(serializers.ModelSerializer):
         return journal.slug if journal else None
 
 
+class ArticleOutlineSerializer(ArticleFullTextSerializer):
+    """
+    Serializer for the lazily loaded full text.
+    
+    Carries the metadata, abstract and outline only; sections and
+    references are fetched separately (see ArticleSectionView and
+    ArticleReferencesView).
+    """
+    
+    html_content = None
+    tables = None
+    abstract_html = serializers.SerializerMethodField()
+    acknowledgments_html = serializers.SerializerMethodField()
+    sections = serializers.SerializerMethodField()
+    reference_count = serializers.SerializerMethodField()
+    
+    class Meta(ArticleFullTextSerializer.Meta):
+        fields = [
+            'id', 'title', 'slug', 'doi',
+            'abstract', 'keywords', 'keywords_display',
+            'journal_slug', 'published_date', 'received_date', 'revised_date', 'accepted_date',
+            'license_text', 'cite_as', 'ris_file', 'bib_file', 'endnote_file',
+            'authors', 'figures',
+            'abstract_html', 'acknowledgments_html', 'sections', 'reference_count'
+        ]
+    
+    def get_abstract_html(self, obj):
+        html_content = getattr(obj, 'html_content', None)
+        if not html_content:
+            return ''
+        return html_content.get_resolved_abstract_html(self.context.get('request'))
+    
+    def get_acknowledgments_html(self, obj):
+        html_content = getattr(obj, 'html_content', None)
+        return html_content.acknowledgments_html if html_content else ''
+    
+    def get_sections(self, obj):
+        html_content = getattr(obj, 'html_content', None)
+        if not html_content:
+            return []
+        return [
+            {
+                'id': section['id'],
+                'title': section['title'],
+                'level': section['level'],
+                'parent': section['parent'],
+                'length': section['end'] - section['start'],
+            }
+            for section in html_content.section_index
+        ]
+    
+    def get_reference_count(self, obj):
+        html_content = getattr(obj, 'html_content', None)
+        return len(html_content.reference_index) if html_content else 0
+
+
 class ArticleCreateUpdateSerializer(serializers.ModelSerializer):
     """Serializer for creating/updating articles."""
     
@@ -0,0 +1,20 @@
+"""
+Signal handlers for the articles app.
+
+Keeps the identifier index (ArticleIdentifier) in step with each article's
+DOI and article ID code.
+"""
+
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from .models import Article
+
+
+@receiver(post_save, sender=Article)
+def article_saved(sender, instance, created, update_fields=None, raw=False, **kwargs):
+    if raw:
+        return
+    if update_fields is not None and not {'doi', 'article_id_code'} & set(update_fields):
+        return
+    instance.sync_identifiers()
@@ -1,3 +1,283 @@
-from django.test import TestCase
+from datetime import date
 
-# Create your tests here.
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from issues.models import Issue
+from journals.models import Journal
+from volumes.models import Volume
+from xml_parser.services import process_article_xml
+
+from .identifiers import normalize_identifier
+from .models import Article, ArticleAuthor, ArticleIdentifier, Author
+from .serializers import ArticleDetailSerializer, ArticleListSerializer, ArticleListValuesSerializer
+
+
+class ArticleListValuesSerializerTests(TestCase):
+    """The values-based fast path must render exactly what ArticleListSerializer renders."""
+
+    @classmethod
+    def setUpTestData(cls):
+        journal = Journal.objects.create(title='Journal of Tests', slug='tests')
+        other = Journal.objects.create(title='Other Journal', slug='other')
+        volume = Volume.objects.create(journal=journal, volume_number=3, year=2024)
+        old_volume = Volume.objects.create(journal=other, volume_number=1, year=2020, is_archived=True)
+        issue = Issue.objects.create(volume=volume, issue_number=2, title='Spring')
+
+        first = Author.objects.create(first_name='Ada', last_name='Lovelace')
+        second = Author.objects.create(first_name='Alan', last_name='Turing')
+
+        articles = [
+            # Placed through the issue only, with files and a page range
+            Article.objects.create(
+                title='Via issue', slug='via-issue', issue=issue, status='published',
+                page_start='10', page_end='19', published_date=date(2024, 3, 1),
+                keywords=['a', 'b'], pdf_file='articles/pdf/via-issue.pdf',
+            ),
+            # Own journal and volume; the journal wins over the volume's
+            Article.objects.create(
+                title='Direct', slug='direct', journal=other, volume=old_volume,
+                status='archive', article_number='e42', is_special_issue=True,
+            ),
+            # Volume only, no year fallback needed
+            Article.objects.create(
+                title='Via volume', slug='via-volume', volume=volume, status='published',
+                page_start='7', article_type='review',
+            ),
+            # Not placed anywhere, year from the published date
+            Article.objects.create(
+                title='Loose', slug='loose', status='published',
+                published_date=date(2021, 6, 30),
+            ),
+        ]
+        ArticleAuthor.objects.create(article=articles[0], author=second, author_order=2)
+        ArticleAuthor.objects.create(article=articles[0], author=first, author_order=1, is_corresponding=True)
+        ArticleAuthor.objects.create(article=articles[2], author=second, author_order=1)
+
+    def request(self, query=''):
+        return Request(APIRequestFactory().get(f'/api/v1/articles/{query}'))
+
+    def assertSameOutput(self, context):
+        queryset = Article.objects.order_by('pk')
+        expected = ArticleListSerializer(queryset, many=True, context=context).data
+        fast = ArticleListValuesSerializer(context)
+        actual = fast.serialize(fast.values_queryset(queryset))
+        self.assertEqual(JSONRenderer().render(actual), JSONRenderer().render(expected))
+
+    def test_same_output(self):
+        self.assertSameOutput({'request': self.request()})
+
+    def test_same_output_without_request(self):
+        self.assertSameOutput({})
+
+    def test_same_output_with_sparse_fields(self):
+        for query in ['?profile=compact', '?fields=id,title,authors', '?omit=abstract,issue', '?profile=compact&omit=authors']:
+            with self.subTest(query=query):
+                self.assertSameOutput({'request': self.request(query)})
+
+    def test_list_view_uses_fast_path(self):
+        response = self.client.get('/api/v1/articles/?ordering=title')
+        self.assertEqual(response.status_code, 200)
+        titles = [article['title'] for article in response.json()['results']]
+        self.assertEqual(titles, ['Loose', 'Via issue', 'Via volume'])
+
+        response = self.client.get('/api/v1/articles/?volume__is_archived=true')
+        self.assertEqual(response.status_code, 200)
+        [article] = response.json()['results']
+        self.assertEqual(article['journal_info']['slug'], 'other')
+        self.assertEqual(article['volume_info']['is_archived'], True)
+
+
+class ArticleFragmentCacheTests(TestCase):
+    """Cached article representations (backend/fragments.py) stay in sync with the data."""
+
+    @classmethod
+    def setUpTestData(cls):
+        journal = Journal.objects.create(title='Journal of Tests', slug='tests')
+        volume = Volume.objects.create(journal=journal, volume_number=1, year=2024)
+        issue = Issue.objects.create(volume=volume, issue_number=1)
+        cls.author = Author.objects.create(first_name='Ada', last_name='Lovelace')
+        for i in range(3):
+            article = Article.objects.create(
+                title=f'Article {i}', slug=f'article-{i}', issue=issue, status='published',
+            )
+            ArticleAuthor.objects.create(article=article, author=cls.author, author_order=1)
+
+    def setUp(self):
+        cache.clear()
+
+    def articles(self):
+        return list(Article.objects.select_related('issue__volume__journal').order_by('pk'))
+
+    def render(self, articles, serializer_class=ArticleListSerializer):
+        return JSONRenderer().render(serializer_class(articles, many=True).data)
+
+    def test_cached_rows_are_not_serialized_again(self):
+        expected = self.render(self.articles())
+        articles = self.articles()
+        # One get_many for the rows and one for their tag versions, no queries
+        with self.assertNumQueries(0):
+            self.assertEqual(self.render(articles), expected)
+
+    def test_related_changes_are_picked_up(self):
+        self.render(self.articles())
+        with self.captureOnCommitCallbacks(execute=True):
+            self.author.last_name = 'Byron'
+            self.author.save()
+        self.assertIn(b'Ada Byron', self.render(self.articles()))
+
+        self.render(self.articles(), ArticleDetailSerializer)
+        with self.captureOnCommitCallbacks(execute=True):
+            Issue.objects.get().save()
+            Volume.objects.update(title='Renamed volume')
+            Journal.objects.get().save()
+        self.assertIn(b'Renamed volume', self.render(self.articles(), ArticleDetailSerializer))
+
+    def test_live_fields_are_not_cached(self):
+        self.render(self.articles())
+        Article.objects.update(view_count=42)
+        data = ArticleListSerializer(self.articles(), many=True).data
+        self.assertEqual([article['view_count'] for article in data], [42, 42, 42])
+
+    def test_cache_can_be_turned_off(self):
+        uncached = type('ArticleListSerializer', (ArticleListSerializer,), {'fragment_cache': False})
+        self.render(self.articles())
+        # Bypasses updated_at, so only a fresh serialization sees it
+        Article.objects.update(title='Retitled')
+        self.assertNotIn(b'Retitled', self.render(self.articles()))
+        self.assertIn(b'Retitled', self.render(self.articles(), uncached))
+
+
+@override_settings(FRONTEND_URL='https://example.org')
+class ArticleIdentifierTests(TestCase):
+    """The identifier index and the resolve endpoints."""
+
+    @classmethod
+    def setUpTestData(cls):
+        journal = Journal.objects.create(title='Journal of Tests', slug='tests')
+        cls.article = Article.objects.create(
+            title='Indexed', slug='indexed', journal=journal, status='published',
+            doi='10.1234/ABC.5', article_id_code='JT-001',
+        )
+        Article.objects.create(title='Draft', slug='draft', journal=journal, doi='10.1234/draft')
+
+    def test_normalization(self):
+        for value in ['10.1234/abc.5', ' doi:10.1234/ABC.5', 'https://doi.org/10.1234/abc.5',
+                      'https:/dx.doi.org/10.1234%2Fabc.5']:
+            self.assertEqual(normalize_identifier(value), '10.1234/abc.5')
+
+    def test_sync_follows_article_and_xml_ids(self):
+        self.article.sync_identifiers(xml_ids=[('pmid', '123'), ('doi', '10.1234/abc.5')])
+        ArticleIdentifier.objects.create(article=self.article, value='old-42')
+        self.article.doi = '10.1234/new'
+        self.article.save()
+        self.assertEqual(
+            set(self.article.identifiers.values_list('scheme', 'normalized', 'source')),
+            {('doi', '10.1234/new', 'article'), ('article_id', 'jt-001', 'article'),
+             ('pmid', '123', 'xml'), ('other', 'old-42', 'manual')}
+        )
+
+    def test_resolve_redirects_in_one_query(self):
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/v1/articles/resolve/', {'id': 'https://doi.org/10.1234/abc.5'})
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(response['Location'], 'https://example.org/tests/article/indexed')
+
+        response = self.client.get('/api/v1/articles/resolve/jt-001/?redirect=false')
+        self.assertEqual(response.json()['article_id'], self.article.pk)
+        self.assertEqual(self.client.get('/api/v1/articles/resolve/10.1234/draft/').status_code, 404)
+
+    def test_bulk_resolve(self):
+        response = self.client.post(
+            '/api/v1/articles/resolve/bulk/',
+            {'ids': ['10.1234/ABC.5', 'JT-001', 'unknown']},
+            content_type='application/json'
+        )
+        results = response.json()['results']
+        self.assertEqual(results['10.1234/ABC.5']['scheme'], 'doi')
+        self.assertEqual(results['JT-001']['scheme'], 'article_id')
+        self.assertIsNone(results['unknown'])
+
+
+FULLTEXT_XML = '''<article article-type="research-article" dtd-version="1.2">
+  <front><article-meta>
+    <title-group><article-title>Sections</article-title></title-group>
+  </article-meta></front>
+  <body>
+    <sec id="s1"><title>Introduction</title><p>Intro text.</p></sec>
+    <sec id="s2"><title>Methods</title><p>Method text.</p>
+      <sec id="s2-1"><title>Sampling &amp; Data</title><p>Sample text.</p></sec>
+    </sec>
+  </body>
+  <back><ref-list>
+    <ref id="r1"><mixed-citation>First cited work.</mixed-citation></ref>
+    <ref id="r2"><mixed-citation>Second cited work.</mixed-citation></ref>
+  </ref-list></back>
+</article>'''
+
+
+class ArticleSectionTests(TestCase):
+    """Section and reference indexes of parsed full text, and the lazy full-text endpoints."""
+
+    url = '/api/v1/articles/by-journal/tests/sections/fulltext/'
+
+    @classmethod
+    def setUpTestData(cls):
+        journal = Journal.objects.create(title='Journal of Tests', slug='tests')
+        cls.article = Article.objects.create(
+            title='Sections', slug='sections', journal=journal, status='published'
+        )
+        process_article_xml(cls.article.pk, FULLTEXT_XML)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_indexes_point_into_the_parsed_html(self):
+        content = self.article.html_content
+        content.refresh_from_db()
+        self.assertEqual(
+            [(section['id'], section['title'], section['level'], section['parent'])
+             for section in content.section_index],
+            [('s1', 'Introduction', 2, None), ('s2', 'Methods', 2, None),
+             ('s2-1', 'Sampling & Data', 3, 's2')]
+        )
+        sections = {section['id']: section for section in content.section_index}
+        methods = content.body_html[sections['s2']['start']:sections['s2']['end']]
+        self.assertIn('Method text.', methods)
+        self.assertIn('Sample text.', methods)
+        self.assertNotIn('Intro text.', methods)
+        sampling = content.body_html[sections['s2-1']['start']:sections['s2-1']['end']]
+        self.assertIn('Sample text.', sampling)
+        self.assertNotIn('Method text.', sampling)
+
+        self.assertEqual([entry['id'] for entry in content.reference_index], ['ref-r1', 'ref-r2'])
+        for entry in content.reference_index:
+            self.assertIn(f'id="{entry["id"]}"', content.references_html[entry['start']:entry['end']])
+
+    def test_section_endpoint(self):
+        response = self.client.get(self.url + 'sections/s2-1/')
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(
+            (data['id'], data['title'], data['level'], data['parent']),
+            ('s2-1', 'Sampling & Data', 3, 's2')
+        )
+        self.assertIn('Sample text.', data['html'])
+        self.assertNotIn('Method text.', data['html'])
+
+        response = self.client.get(self.url + 'sections/unknown/')
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.json()['detail'], 'Section not found.')
+
+    def test_reference_endpoint(self):
+        data = self.client.get(self.url + 'references/', {'ids': 'ref-r2'}).json()
+        self.assertEqual(data['count'], 2)
+        self.assertEqual([item['id'] for item in data['results']], ['ref-r2'])
+        self.assertIn('id="ref-r2"', data['results'][0]['html'])
+        self.assertNotIn('id="ref-r1"', data['results'][0]['html'])
+
+        data = self.client.get(self.url + 'references/', {'page': 2, 'page_size': 1}).json()
+        self.assertEqual([item['id'] for item in data['results']], ['ref-r2'])
@@ -11,6 +11,8 @@ urlpatterns = [
     path('search/', views.ArticleSearchView.as_view(), name='article_search'),
     path('featured/', views.FeaturedArticlesView.as_view(), name='featured_articles'),
     path('recent/', views.RecentArticlesView.as_view(), name='recent_articles'),
+    path('trending/', views.TrendingArticlesView.as_view(), name='trending_articles'),
+    path('most-read/', views.MostReadArticlesView.as_view(), name='most_read_articles'),
     path('special-issues/', views.SpecialIssuesArticlesView.as_view(), name='special_issues_articles'),
     path('<int:pk>/', views.ArticleDetailView.as_view(), name='article_detail'),
     
@@ -18,10 +20,18 @@ urlpatterns = [
     path('by-journal/<slug:journal_slug>/<slug:article_slug>/', views.ArticleBySlugView.as_view(), name='article_by_slug'),
     path('by-journal/<slug:journal_slug>/<slug:article_slug>/abstract/', views.ArticleAbstractView.as_view(), name='article_abstract'),
     path('by-journal/<slug:journal_slug>/<slug:article_slug>/fulltext/', views.ArticleFullTextView.as_view(), name='article_fulltext'),
+    path('by-journal/<slug:journal_slug>/<slug:article_slug>/fulltext/outline/', views.ArticleOutlineView.as_view(), name='article_outline'),
+    path('by-journal/<slug:journal_slug>/<slug:article_slug>/fulltext/sections/<str:section_id>/', views.ArticleSectionView.as_view(), name='article_section'),
+    path('by-journal/<slug:journal_slug>/<slug:article_slug>/fulltext/references/', views.ArticleReferencesView.as_view(), name='article_references'),
     path('by-journal/<slug:journal_slug>/<slug:article_slug>/pdf/', views.ArticlePDFView.as_view(), name='article_pdf'),
     path('by-journal/<slug:journal_slug>/<slug:article_slug>/xml/', views.ArticleXMLDownloadView.as_view(), name='article_xml'),
     path('by-journal/<slug:journal_slug>/<slug:article_slug>/html-download/', views.ArticleHTMLDownloadView.as_view(), name='article_html_download'),
     
+    # Identifier resolution (DOI, article ID code, legacy IDs)
+    path('resolve/', views.ArticleIdentifierResolveView.as_view(), name='article_resolve'),
+    path('resolve/bulk/', views.ArticleIdentifierBulkResolveView.as_view(), name='article_resolve_bulk'),
+    path('resolve/<path:identifier>/', views.ArticleIdentifierResolveView.as_view(), name='article_resolve_identifier'),
+    
     # Articles by issue
     path('by-issue/<int:issue_id>/', views.ArticlesByIssueView.as_view(), name='articles_by_issue'),
     
@@ -8,26 +8,34 @@ from django.views.decorators.cache import cache_page
 from django.views.decorators.cache import cache_control
 from rest_framework import generics, filters, status
 from rest_framework.views import APIView
+from rest_framework.exceptions import NotFound, ValidationError
 from rest_framework.permissions import IsAuthenticated, IsAdminUser, AllowAny
 from rest_framework.response import Response
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
 from django_filters.rest_framework import DjangoFilterBackend
 from django.shortcuts import get_object_or_404
-from django.http import FileResponse, HttpResponse
+from django.conf import settings
+from django.http import FileResponse, HttpResponse, HttpResponseRedirect
 from django.db.models import Q
 
 from .models import (
     Author, Article, ArticleAuthor, ArticleFile,
-    ArticleHTMLContent, Figure, Table
+    ArticleHTMLContent, ArticleIdentifier, Figure, Table, IdentifierScheme
 )
 
 logger = logging.getLogger(__name__)
 from journals.models import Journal
+from journals.resolvers import article_or_404
 from issues.models import Issue
+from backend.streaming import StreamingListMixin
+from backend.fastpath import FastListMixin
+from analytics.models import LeaderboardKind, UsageEventType
+from analytics.recorder import record_usage
+from analytics.trending import TOP_K, MOST_READ_WINDOWS, leaderboard
 from .serializers import (
     AuthorSerializer, AuthorListSerializer,
-    ArticleListSerializer, ArticleDetailSerializer,
-    ArticleAbstractSerializer, ArticleFullTextSerializer,
+    ArticleListSerializer, ArticleListValuesSerializer, ArticleDetailSerializer,
+    ArticleAbstractSerializer, ArticleFullTextSerializer, ArticleOutlineSerializer,
     ArticleCreateUpdateSerializer, ArticleAuthorBulkSerializer,
     ArticleFileSerializer, FigureSerializer,
 )
@@ -38,7 +46,7 @@ from xml_parser.services import process_article_xml
 # Public Article Views
 # =============================================================================
 
-class ArticleListView(generics.ListAPIView):
+class ArticleListView(FastListMixin, generics.ListAPIView):
     """
     List all published articles.
     
@@ -53,6 +61,7 @@ class ArticleListView(generics.ListAPIView):
     """
     permission_classes = [AllowAny]
     serializer_class = ArticleListSerializer
+    fast_serializer_class = ArticleListValuesSerializer
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['issue', 'volume', 'status', 'article_type', 'is_open_access', 'is_special_issue', 'volume__is_archived']
     search_fields = ['title', 'abstract', 'keywords', 'keywords_display']
@@ -98,7 +107,7 @@ class ArticleListView(generics.ListAPIView):
         return queryset.prefetch_related('article_authors__author')
 
 
-class ArticleSearchView(generics.ListAPIView):
+class ArticleSearchView(FastListMixin, generics.ListAPIView):
     """
     Search articles.
     
@@ -106,6 +115,7 @@ class ArticleSearchView(generics.ListAPIView):
     """
     permission_classes = [AllowAny]
     serializer_class = ArticleListSerializer
+    fast_serializer_class = ArticleListValuesSerializer
     
     def get_queryset(self):
         query = self.request.query_params.get('q', '')
@@ -123,7 +133,7 @@ class ArticleSearchView(generics.ListAPIView):
         ).distinct().prefetch_related('article_authors__author')
 
 
-class SpecialIssuesArticlesView(generics.ListAPIView):
+class SpecialIssuesArticlesView(FastListMixin, generics.ListAPIView):
     """
     List articles marked as special issue.
     
@@ -131,6 +141,7 @@ class SpecialIssuesArticlesView(generics.ListAPIView):
     """
     permission_classes = [AllowAny]
     serializer_class = ArticleListSerializer
+    fast_serializer_class = ArticleListValuesSerializer
     
     def get_queryset(self):
         journal_slug = self.request.query_params.get('journal_slug')
@@ -149,7 +160,7 @@ class SpecialIssuesArticlesView(generics.ListAPIView):
         return queryset.prefetch_related('article_authors__author')
 
 
-class FeaturedArticlesView(generics.ListAPIView):
+class FeaturedArticlesView(StreamingListMixin, generics.ListAPIView):
     """
     List featured articles.
     
@@ -204,6 +215,71 @@ class RecentArticlesView(generics.ListAPIView):
         ).prefetch_related('article_authors__author')[:10]
 
 
+class LeaderboardArticlesView(generics.ListAPIView):
+    """
+    Base view listing the articles of a precomputed ranking, best first.
+    
+    Query params:
+    - journal: Journal slug (default: site-wide)
+    - limit: Number of articles (default 10, at most analytics.trending.TOP_K)
+    """
+    permission_classes = [AllowAny]
+    serializer_class = ArticleListSerializer
+    pagination_class = None
+    filter_backends = []
+    
+    def get_leaderboard_kind(self):
+        raise NotImplementedError
+    
+    def get_queryset(self):
+        journal_id = None
+        journal_slug = self.request.query_params.get('journal')
+        if journal_slug:
+            journal_id = Journal.objects.filter(slug=journal_slug).values_list('pk', flat=True).first()
+            if journal_id is None:
+                return []
+        try:
+            limit = min(max(int(self.request.query_params.get('limit', 10)), 1), TOP_K)
+        except ValueError:
+            limit = 10
+        
+        ids = [article_id for article_id, _ in leaderboard(self.get_leaderboard_kind(), journal_id)]
+        # Entries may point at articles that have since been unpublished or archived
+        articles = Article.objects.filter(status__in=['published', 'archive']).filter(
+            Q(volume__is_archived=False) | Q(volume__isnull=True),
+            Q(issue__volume__is_archived=False) | Q(issue__isnull=True)
+        ).select_related(
+            'journal', 'issue__volume__journal', 'volume__journal'
+        ).prefetch_related('article_authors__author').in_bulk(ids)
+        return [articles[pk] for pk in ids if pk in articles][:limit]
+
+
+class TrendingArticlesView(LeaderboardArticlesView):
+    """
+    List trending articles (views and downloads with a 3-day half-life).
+    
+    GET /api/v1/articles/trending/?journal=&limit=
+    """
+    
+    def get_leaderboard_kind(self):
+        return LeaderboardKind.TRENDING
+
+
+class MostReadArticlesView(LeaderboardArticlesView):
+    """
+    List the most read articles of the last 7 or 30 days.
+    
+    GET /api/v1/articles/most-read/?days=7|30&journal=&limit=
+    """
+    
+    def get_leaderboard_kind(self):
+        days = self.request.query_params.get('days', '7')
+        for kind, window in MOST_READ_WINDOWS.items():
+            if days == str(window):
+                return kind
+        raise ValidationError({'days': f'One of: {", ".join(str(window) for window in MOST_READ_WINDOWS.values())}.'})
+
+
 class ArticleDetailView(generics.RetrieveAPIView):
     """
     Get article details by ID.
@@ -219,6 +295,7 @@ class ArticleDetailView(generics.RetrieveAPIView):
     def retrieve(self, request, *args, **kwargs):
         instance = self.get_object()
         instance.increment_view_count()
+        record_usage(request, instance, UsageEventType.VIEW)
         serializer = self.get_serializer(instance)
         return Response(serializer.data)
 
@@ -236,7 +313,7 @@ class ArticleBySlugView(generics.RetrieveAPIView):
         journal_slug = self.kwargs['journal_slug']
         article_slug = self.kwargs['article_slug']
         
-        article = get_object_or_404(
+        article = article_or_404(
             Article.objects.select_related(
                 'html_content', 
                 'journal', 
@@ -251,14 +328,12 @@ class ArticleBySlugView(generics.RetrieveAPIView):
                 'tables',
                 'journal__subjects'
             ),
-            Q(journal__slug=journal_slug) | 
-            Q(issue__volume__journal__slug=journal_slug) |
-            Q(volume__journal__slug=journal_slug),
-            slug=article_slug,
-            status__in=['published', 'archive']
+            journal_slug,
+            article_slug
         )
         
         article.increment_view_count()
+        record_usage(self.request, article, UsageEventType.VIEW)
         return article
 
 
@@ -275,13 +350,10 @@ class ArticleAbstractView(generics.RetrieveAPIView):
         journal_slug = self.kwargs['journal_slug']
         article_slug = self.kwargs['article_slug']
         
-        return get_object_or_404(
+        return article_or_404(
             Article.objects.select_related('html_content').prefetch_related('article_authors__author'),
-            Q(journal__slug=journal_slug) | 
-            Q(issue__volume__journal__slug=journal_slug) |
-            Q(volume__journal__slug=journal_slug),
-            slug=article_slug,
-            status__in=['published', 'archive']
+            journal_slug,
+            article_slug
         )
 
 
@@ -298,7 +370,7 @@ class ArticleFullTextView(generics.RetrieveAPIView):
         journal_slug = self.kwargs['journal_slug']
         article_slug = self.kwargs['article_slug']
         
-        return get_object_or_404(
+        return article_or_404(
             Article.objects.select_related(
                 'html_content',
                 'journal',
@@ -311,14 +383,127 @@ class ArticleFullTextView(generics.RetrieveAPIView):
                 'figures', 
                 'tables'
             ),
-            Q(journal__slug=journal_slug) | 
-            Q(issue__volume__journal__slug=journal_slug) |
-            Q(volume__journal__slug=journal_slug),
-            slug=article_slug,
-            status__in=['published', 'archive']
+            journal_slug,
+            article_slug
         )
 
 
+class LazyFullTextMixin:
+    """
+    Loads a published article by journal and article slug for the lazy
+    full-text endpoints, without the large HTML fields.
+    """
+    
+    def get_article(self):
+        return article_or_404(
+            Article.objects.select_related(
+                'html_content',
+                'journal',
+                'volume__journal',
+                'issue__volume__journal'
+            ).defer(
+                'html_content__original_xml',
+                'html_content__body_html',
+                'html_content__references_html'
+            ).prefetch_related(
+                'article_authors__author',
+                'figures'
+            ),
+            self.kwargs['journal_slug'],
+            self.kwargs['article_slug']
+        )
+    
+    def get_html_content(self):
+        html_content = getattr(self.get_article(), 'html_content', None)
+        if html_content is None:
+            raise NotFound('This article has no full text.')
+        return html_content
+
+
+class ArticleOutlineView(LazyFullTextMixin, generics.RetrieveAPIView):
+    """
+    Get article metadata, abstract and section outline (no body).
+    
+    GET /api/v1/articles/by-journal/{journal_slug}/{article_slug}/fulltext/outline/
+    """
+    permission_classes = [AllowAny]
+    serializer_class = ArticleOutlineSerializer
+    
+    def get_object(self):
+        return self.get_article()
+
+
+class ArticleSectionView(LazyFullTextMixin, APIView):
+    """
+    Get the HTML of one full-text section.
+    
+    GET /api/v1/articles/by-journal/{journal_slug}/{article_slug}/fulltext/sections/{section_id}/
+    
+    Section IDs come from the outline; nested sections can be fetched on
+    their own, top-level ones include their subsections.
+    """
+    permission_classes = [AllowAny]
+    
+    def get(self, request, journal_slug, article_slug, section_id):
+        html_content = self.get_html_content()
+        section = html_content.get_section(section_id)
+        if section is None:
+            raise NotFound('Section not found.')
+        
+        return Response({
+            'id': section['id'],
+            'title': section['title'],
+            'level': section['level'],
+            'parent': section['parent'],
+            'html': html_content.get_resolved_section_html(section, request),
+        })
+
+
+class ArticleReferencesView(LazyFullTextMixin, APIView):
+    """
+    Get references of the full text, one page at a time.
+    
+    GET /api/v1/articles/by-journal/{journal_slug}/{article_slug}/fulltext/references/
+    
+    Query params:
+    - page: Page number (default 1)
+    - page_size: References per page (default 50, max 200)
+    - ids: Comma-separated reference IDs (instead of a page, e.g. for citation popovers)
+    """
+    permission_classes = [AllowAny]
+    default_page_size = 50
+    max_page_size = 200
+    
+    def get(self, request, journal_slug, article_slug):
+        html_content = self.get_html_content()
+        index = html_content.reference_index
+        
+        ids = request.query_params.get('ids')
+        if ids:
+            wanted = set(ids.split(',')[:self.max_page_size])
+            return Response({
+                'count': len(index),
+                'results': html_content.get_reference_items(
+                    [entry for entry in index if entry['id'] in wanted]
+                ),
+            })
+        
+        try:
+            page = max(int(request.query_params.get('page', 1)), 1)
+            page_size = min(max(int(request.query_params.get('page_size', self.default_page_size)), 1), self.max_page_size)
+        except ValueError:
+            raise ValidationError({'page': 'page and page_size must be integers.'})
+        
+        offset = (page - 1) * page_size
+        return Response({
+            'count': len(index),
+            'page': page,
+            'page_size': page_size,
+            'has_next': offset + page_size < len(index),
+            'results': html_content.get_reference_items(index[offset:offset + page_size]),
+        })
+
+
 class ArticlePDFView(APIView):
     """
     Download article PDF.
@@ -328,18 +513,16 @@ class ArticlePDFView(APIView):
     permission_classes = [AllowAny]
     
     def get(self, request, journal_slug, article_slug):
-        article = get_object_or_404(
-            Article,
-            Q(journal__slug=journal_slug) | 
-            Q(issue__volume__journal__slug=journal_slug) |
-            Q(volume__journal__slug=journal_slug),
-            slug=article_slug,
-            status__in=['published', 'archive']
+        article = article_or_404(
+            Article.objects,
+            journal_slug,
+            article_slug
         )
         
         # Try new direct pdf_file first
         if article.pdf_file:
             article.increment_download_count()
+            record_usage(request, article, UsageEventType.DOWNLOAD)
             response = FileResponse(
                 article.pdf_file.open('rb'),
                 content_type='application/pdf'
@@ -359,6 +542,7 @@ class ArticlePDFView(APIView):
             )
         
         article.increment_download_count()
+        record_usage(request, article, UsageEventType.DOWNLOAD)
         
         response = FileResponse(
             pdf_file.file.open('rb'),
@@ -377,13 +561,10 @@ class ArticleXMLDownloadView(APIView):
     permission_classes = [AllowAny]
     
     def get(self, request, journal_slug, article_slug):
-        article = get_object_or_404(
-            Article,
-            Q(journal__slug=journal_slug) | 
-            Q(issue__volume__journal__slug=journal_slug) |
-            Q(volume__journal__slug=journal_slug),
-            slug=article_slug,
-            status__in=['published', 'archive']
+        article = article_or_404(
+            Article.objects,
+            journal_slug,
+            article_slug
         )
         
         if not article.xml_file:
@@ -393,6 +574,7 @@ class ArticleXMLDownloadView(APIView):
             )
         
         article.increment_download_count()
+        record_usage(request, article, UsageEventType.DOWNLOAD)
         
         response = FileResponse(
             article.xml_file.open('rb'),
@@ -411,13 +593,10 @@ class ArticleHTMLDownloadView(APIView):
     permission_classes = [AllowAny]
     
     def get(self, request, journal_slug, article_slug):
-        article = get_object_or_404(
+        article = article_or_404(
             Article.objects.prefetch_related('article_authors__author', 'figures'),
-            Q(journal__slug=journal_slug) | 
-            Q(issue__volume__journal__slug=journal_slug) |
-            Q(volume__journal__slug=journal_slug),
-            slug=article_slug,
-            status__in=['published', 'archive']
+            journal_slug,
+            article_slug
         )
         
         # Generate standalone HTML
@@ -501,7 +680,7 @@ class ArticleHTMLDownloadView(APIView):
         return html
 
 
-class ArticlesByIssueView(generics.ListAPIView):
+class ArticlesByIssueView(StreamingListMixin, generics.ListAPIView):
     """
     List all articles in an issue.
     
@@ -516,7 +695,90 @@ class ArticlesByIssueView(generics.ListAPIView):
         return Article.objects.filter(
             issue_id=issue_id,
             status__in=['published', 'archive']
-        ).order_by('page_start', 'created_at')
+        ).select_related(
+            'journal', 'issue__volume__journal', 'volume__journal'
+        ).prefetch_related('article_authors__author').order_by('page_start', 'created_at')
+
+
+# =============================================================================
+# Identifier Resolution
+# =============================================================================
+
+MAX_BULK_IDENTIFIERS = 1000
+
+
+def _public_identifiers(scheme=None):
+    if scheme and scheme not in IdentifierScheme.values:
+        raise ValidationError({'scheme': f'Expected one of {", ".join(IdentifierScheme.values)}.'})
+    return ArticleIdentifier.objects.filter(article__status__in=['published', 'archive'])
+
+
+def _identifier_target(identifier):
+    """Where an ArticleIdentifier points: the article and its public URL."""
+    article = identifier.article
+    journal = article.get_journal
+    return {
+        'scheme': identifier.scheme,
+        'article_id': article.pk,
+        'slug': article.slug,
+        'journal_slug': journal.slug if journal else None,
+        'url': f'{settings.FRONTEND_URL}/{journal.slug}/article/{article.slug}' if journal else None,
+    }
+
+
+class ArticleIdentifierResolveView(APIView):
+    """
+    Resolve a DOI, article ID code or legacy ID to its article.
+    
+    GET /api/v1/articles/resolve/?id={identifier}[&scheme=doi]
+    GET /api/v1/articles/resolve/{identifier}/
+    
+    DOIs may be given as https://doi.org/... links or doi: URIs. Redirects
+    (302) to the article page; with ?redirect=false the target is returned
+    as JSON instead.
+    """
+    permission_classes = [AllowAny]
+    
+    def get(self, request, identifier=None):
+        value = identifier or request.query_params.get('id', '')
+        if not value.strip():
+            raise ValidationError({'id': 'An identifier is required.'})
+        scheme = request.query_params.get('scheme')
+        found = _public_identifiers(scheme).resolve([value], scheme=scheme)[value]
+        if found is None:
+            raise NotFound('No article matches this identifier.')
+        
+        target = _identifier_target(found)
+        if request.query_params.get('redirect') == 'false' or target['url'] is None:
+            return Response(target)
+        return HttpResponseRedirect(target['url'])
+
+
+class ArticleIdentifierBulkResolveView(APIView):
+    """
+    Resolve up to MAX_BULK_IDENTIFIERS identifiers at once (link checkers).
+    
+    POST /api/v1/articles/resolve/bulk/
+    
+    Body: {"ids": [...], "scheme": "doi"} (scheme optional). Returns
+    {"results": {identifier: target or null}}.
+    """
+    permission_classes = [AllowAny]
+    
+    def post(self, request):
+        ids = request.data.get('ids') if isinstance(request.data, dict) else None
+        if not isinstance(ids, list) or not all(isinstance(value, str) for value in ids):
+            raise ValidationError({'ids': 'Expected a list of identifiers.'})
+        if len(ids) > MAX_BULK_IDENTIFIERS:
+            raise ValidationError({'ids': f'At most {MAX_BULK_IDENTIFIERS} identifiers per request.'})
+        scheme = request.data.get('scheme')
+        found = _public_identifiers(scheme).resolve(ids, scheme=scheme)
+        return Response({
+            'results': {
+                value: _identifier_target(identifier) if identifier else None
+                for value, identifier in found.items()
+            }
+        })
 
 
 # =============================================================================
@@ -550,7 +812,7 @@ class AuthorDetailView(generics.RetrieveAPIView):
     queryset = Author.objects.all()
 
 
-class ArticlesByAuthorView(generics.ListAPIView):
+class ArticlesByAuthorView(FastListMixin, generics.ListAPIView):
     """
     List articles by a specific author.
     
@@ -558,6 +820,7 @@ class ArticlesByAuthorView(generics.ListAPIView):
     """
     permission_classes = [AllowAny]
     serializer_class = ArticleListSerializer
+    fast_serializer_class = ArticleListValuesSerializer
     
     def get_queryset(self):
         author_id = self.kwargs['pk']
@@ -571,7 +834,7 @@ class ArticlesByAuthorView(generics.ListAPIView):
 # Admin Views
 # =============================================================================
 
-class ArticleAdminListView(generics.ListAPIView):
+class ArticleAdminListView(FastListMixin, generics.ListAPIView):
     """
     List all articles (admin view).
     
@@ -579,6 +842,7 @@ class ArticleAdminListView(generics.ListAPIView):
     """
     permission_classes = [IsAuthenticated, IsAdminUser]
     serializer_class = ArticleListSerializer
+    fast_serializer_class = ArticleListValuesSerializer
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['issue', 'volume', 'status', 'article_type', 'is_special_issue', 'is_preface']
     search_fields = ['title', 'doi', 'article_id_code']
@@ -0,0 +1,143 @@
+"""
+Batch API: several GET requests in one round trip.
+
+A frontend page typically needs the journal, its current issue, volumes,
+announcements, CTA cards, ... each fetched separately, paying the HTTP,
+middleware and JWT overhead every time. ``BatchView`` takes a list of API
+paths, resolves each through the URL resolver and calls its view directly
+in this process, then returns every response in one payload.
+
+    POST /api/v1/batch/
+    {"paths": ["/api/v1/journals/by-slug/tests/", "/api/v1/site/pages/?journal=global"]}
+
+    {"responses": [
+        {"path": "/api/v1/journals/by-slug/tests/", "status": 200, "body": {...}},
+        {"path": "/api/v1/site/pages/?journal=global", "status": 200, "body": [...]}
+    ]}
+
+The caller is authenticated once for the whole batch and every item runs
+with that user through its view's own authentication, permission and
+throttle checks, so an item answers exactly as the same GET request would
+(e.g. 401/403 for admin endpoints). Items run in order; a failing item
+doesn't affect the others. Only JSON bodies are returned: other responses
+(feeds, OAI-PMH, files) get their status and a null body, and are closed
+without being read. At most ``MAX_BATCH_PATHS`` paths per batch,
+all under ``/api/v1/``.
+"""
+
+import io
+import json
+import logging
+from urllib.parse import urlsplit
+
+from django.core.exceptions import PermissionDenied
+from django.core.handlers.wsgi import WSGIRequest
+from django.http import Http404, StreamingHttpResponse
+from django.urls import Resolver404, resolve
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+
+API_PREFIX = '/api/v1/'
+MAX_BATCH_PATHS = 20
+MAX_PATH_LENGTH = 2000
+
+logger = logging.getLogger(__name__)
+
+
+class BatchView(APIView):
+    """
+    Run several API GET requests in one.
+
+    POST /api/v1/batch/
+
+    Body: {"paths": [...]} - up to MAX_BATCH_PATHS paths under /api/v1/,
+    with query strings.
+    """
+    permission_classes = [AllowAny]
+
+    def post(self, request):
+        paths = self.get_paths(request.data)
+        return Response({
+            'responses': [
+                {'path': path, **self.run(request, path)} for path in paths
+            ]
+        })
+
+    def get_paths(self, data):
+        paths = data.get('paths') if isinstance(data, dict) else None
+        if not isinstance(paths, list) or not paths:
+            raise ValidationError({'paths': 'Expected a non-empty list of API paths.'})
+        if len(paths) > MAX_BATCH_PATHS:
+            raise ValidationError({'paths': f'At most {MAX_BATCH_PATHS} paths per batch.'})
+        for path in paths:
+            if not isinstance(path, str) or len(path) > MAX_PATH_LENGTH:
+                raise ValidationError({'paths': f'Each path must be a string of at most {MAX_PATH_LENGTH} characters.'})
+        return paths
+
+    def run(self, request, path):
+        """Resolve and call the view for ``path``; returns its status and body."""
+        parts = urlsplit(path)
+        if parts.scheme or parts.netloc or not parts.path.startswith(API_PREFIX):
+            return self.error(status.HTTP_400_BAD_REQUEST, f'Only {API_PREFIX} paths can be batched.')
+        try:
+            match = resolve(parts.path)
+        except Resolver404:
+            return self.error(status.HTTP_404_NOT_FOUND, 'Not found.')
+        if getattr(match.func, 'view_class', None) is type(self):
+            return self.error(status.HTTP_400_BAD_REQUEST, 'Batches cannot be nested.')
+
+        subrequest = self.build_subrequest(request, parts)
+        subrequest.resolver_match = match
+        try:
+            response = match.func(subrequest, *match.args, **match.kwargs)
+        except Http404:
+            # Raised by plain Django views; DRF views answer 404 themselves
+            return self.error(status.HTTP_404_NOT_FOUND, 'Not found.')
+        except PermissionDenied:
+            return self.error(status.HTTP_403_FORBIDDEN, 'You do not have permission to perform this action.')
+        except Exception:
+            logger.exception('Batched request for %s failed', path)
+            return self.error(status.HTTP_500_INTERNAL_SERVER_ERROR, 'Server error.')
+        try:
+            return {'status': response.status_code, 'body': self.response_body(response)}
+        finally:
+            response.close()
+
+    def build_subrequest(self, request, parts):
+        """A GET request for ``parts`` carrying the batch caller's identity."""
+        environ = dict(request._request.META)
+        for key in ('CONTENT_TYPE', 'CONTENT_LENGTH', 'HTTP_CONTENT_TYPE', 'HTTP_CONTENT_LENGTH'):
+            environ.pop(key, None)
+        environ.update({
+            'REQUEST_METHOD': 'GET',
+            'PATH_INFO': parts.path,
+            'QUERY_STRING': parts.query,
+            'HTTP_ACCEPT': 'application/json',
+            'wsgi.input': io.BytesIO(),
+        })
+        subrequest = WSGIRequest(environ)
+        # Reuse the batch's authentication instead of repeating it per item;
+        # permissions and throttles still run in every view
+        if request.user and request.user.is_authenticated:
+            subrequest._force_auth_user = request.user
+            subrequest._force_auth_token = request.auth
+        return subrequest
+
+    def response_body(self, response):
+        """The decoded JSON body of ``response``, or None for any other content."""
+        if isinstance(response, Response):
+            return response.data
+        if 'json' not in response.get('Content-Type', ''):
+            return None
+        if isinstance(response, StreamingHttpResponse):
+            content = b''.join(response.streaming_content)
+        else:
+            content = response.content
+        return json.loads(content) if content else None
+
+    def error(self, status_code, detail):
+        return {'status': status_code, 'body': {'detail': detail}}
@@ -0,0 +1,246 @@
+"""
+Two-tier cache backend: a small in-process LRU in front of the shared cache.
+
+The tag versions, cached responses, fragments and query results read on
+every request for the homepage or a popular journal still cost a round
+trip to the shared cache (plus unpickling) each time. ``TwoTierCache``
+keeps recently read keys whose names start with one of
+``LOCAL_KEY_PREFIXES`` in worker memory for a few seconds
+(``LOCAL_TIMEOUT``), bounded to ``LOCAL_MAX_ENTRIES`` entries with
+least-recently-used eviction. Every other key, and every write, goes
+straight to the shared cache.
+
+Writes reach the other workers through version stamps kept in the shared
+cache: a write to a locally cacheable key increments a stamp and records
+the written keys in a short-lived log entry for the new stamp value. Each
+worker reads the stamp at most once every ``SYNC_INTERVAL`` seconds and
+drops the keys logged since its last read, or its whole local tier if the
+log can't be followed (too far behind, expired, cache cleared). A write is
+thus visible everywhere within ``SYNC_INTERVAL`` and immediately in the
+worker that made it. A successful ``add()`` counts as a write too: another
+worker may still hold the value the key had before it was deleted.
+
+Immutable values (numbers, strings, ...) are held as-is; anything else is
+kept pickled, like LocMemCache does, so callers can't change each other's
+copies.
+
+    CACHES = {
+        'default': {
+            'BACKEND': 'backend.cache_backends.TwoTierCache',
+            'OPTIONS': {'SHARED': 'shared', 'LOCAL_KEY_PREFIXES': ['tag:', 'tagged:']},
+        },
+        'shared': {'BACKEND': 'django.core.cache.backends.redis.RedisCache', ...},
+    }
+"""
+
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+
+STAMP_KEY = 'two-tier:stamp'
+LOG_KEY_PREFIX = 'two-tier:log:'
+# How long write logs are kept; a worker further behind flushes everything
+LOG_TIMEOUT = 5 * 60
+# Most log entries a worker reads in one sync before flushing instead
+MAX_LOG_ENTRIES = 100
+
+IMMUTABLE_TYPES = (type(None), bool, int, float, complex, str, bytes)
+
+
+def _is_immutable(value):
+    if isinstance(value, tuple):
+        return all(_is_immutable(item) for item in value)
+    return isinstance(value, IMMUTABLE_TYPES)
+
+
+class TwoTierCache(BaseCache):
+    """In-process LRU tier in front of another configured cache (see module docstring)."""
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        options = params.get('OPTIONS', {})
+        self._shared_alias = options.get('SHARED', 'shared')
+        self.local_prefixes = tuple(options.get('LOCAL_KEY_PREFIXES', ()))
+        self.local_timeout = options.get('LOCAL_TIMEOUT', 5)
+        self.local_max_entries = options.get('LOCAL_MAX_ENTRIES', 1000)
+        self.sync_interval = options.get('SYNC_INTERVAL', 1)
+
+        self._local = OrderedDict()
+        self._lock = threading.Lock()
+        self._stamp = None
+        self._synced_at = 0.0
+        # Bumped whenever local entries are dropped, so a value fetched
+        # before a drop isn't stored afterwards
+        self._generation = 0
+
+    @property
+    def shared(self):
+        return caches[self._shared_alias]
+
+    # Local tier
+
+    def _is_local(self, key):
+        return key.startswith(self.local_prefixes)
+
+    def _local_key(self, key, version):
+        return self.shared.make_and_validate_key(key, version=version)
+
+    def _drop(self, local_keys=None):
+        with self._lock:
+            if local_keys is None:
+                self._local.clear()
+            else:
+                for local_key in local_keys:
+                    self._local.pop(local_key, None)
+            self._generation += 1
+
+    def _sync(self):
+        """Drop local entries written by other workers since the last sync."""
+        now = time.monotonic()
+        if now - self._synced_at < self.sync_interval:
+            return
+        self._synced_at = now
+        stamp = self.shared.get(STAMP_KEY)
+        previous, self._stamp = self._stamp, stamp
+        if stamp == previous:
+            return
+        if previous is None or stamp is None or not 0 < stamp - previous <= MAX_LOG_ENTRIES:
+            self._drop()
+            return
+        log_keys = [f'{LOG_KEY_PREFIX}{n}' for n in range(previous + 1, stamp + 1)]
+        logs = self.shared.get_many(log_keys)
+        if len(logs) < len(log_keys):
+            self._drop()
+        else:
+            self._drop([local_key for written in logs.values() for local_key in written])
+
+    def _local_get(self, local_key):
+        with self._lock:
+            entry = self._local.get(local_key)
+            if entry is None:
+                return None
+            expires, value, pickled = entry
+            if expires < time.monotonic():
+                del self._local[local_key]
+                return None
+            self._local.move_to_end(local_key)
+        return (pickle.loads(value) if pickled else value,)
+
+    def _local_set(self, local_key, value, generation):
+        pickled = not _is_immutable(value)
+        if pickled:
+            value = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._local[local_key] = (time.monotonic() + self.local_timeout, value, pickled)
+            self._local.move_to_end(local_key)
+            while len(self._local) > self.local_max_entries:
+                self._local.popitem(last=False)
+
+    def _written(self, keys, version):
+        """Publish writes to ``keys`` to the other workers and drop them here."""
+        local_keys = [self._local_key(key, version) for key in keys if self._is_local(key)]
+        if not local_keys:
+            return
+        self._drop(local_keys)
+        try:
+            stamp = self.shared.incr(STAMP_KEY)
+        except ValueError:
+            self.shared.add(STAMP_KEY, 0, None)
+            stamp = self.shared.incr(STAMP_KEY)
+        self.shared.set(f'{LOG_KEY_PREFIX}{stamp}', local_keys, LOG_TIMEOUT)
+
+    # Cache API
+
+    def get(self, key, default=None, version=None):
+        if not self._is_local(key):
+            return self.shared.get(key, default, version=version)
+        self._sync()
+        local_key = self._local_key(key, version)
+        found = self._local_get(local_key)
+        if found is not None:
+            return found[0]
+        generation = self._generation
+        missing = object()
+        value = self.shared.get(key, missing, version=version)
+        if value is missing:
+            return default
+        self._local_set(local_key, value, generation)
+        return value
+
+    def get_many(self, keys, version=None):
+        keys = list(keys)
+        if any(self._is_local(key) for key in keys):
+            self._sync()
+        found = {}
+        remote = []
+        for key in keys:
+            hit = self._local_get(self._local_key(key, version)) if self._is_local(key) else None
+            if hit is not None:
+                found[key] = hit[0]
+            else:
+                remote.append(key)
+        if remote:
+            generation = self._generation
+            fetched = self.shared.get_many(remote, version=version)
+            for key, value in fetched.items():
+                if self._is_local(key):
+                    self._local_set(self._local_key(key, version), value, generation)
+            found.update(fetched)
+        return found
+
+    def has_key(self, key, version=None):
+        missing = object()
+        return self.get(key, missing, version=version) is not missing
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        added = self.shared.add(key, value, timeout, version=version)
+        if added:
+            self._written([key], version)
+        return added
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        self.shared.set(key, value, timeout, version=version)
+        self._written([key], version)
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        failed = self.shared.set_many(data, timeout, version=version)
+        self._written(list(data), version)
+        return failed
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        return self.shared.touch(key, timeout, version=version)
+
+    def delete(self, key, version=None):
+        deleted = self.shared.delete(key, version=version)
+        self._written([key], version)
+        return deleted
+
+    def delete_many(self, keys, version=None):
+        keys = list(keys)
+        self.shared.delete_many(keys, version=version)
+        self._written(keys, version)
+
+    def incr(self, key, delta=1, version=None):
+        value = self.shared.incr(key, delta, version=version)
+        self._written([key], version)
+        return value
+
+    def decr(self, key, delta=1, version=None):
+        value = self.shared.decr(key, delta, version=version)
+        self._written([key], version)
+        return value
+
+    def clear(self):
+        # Clears the stamp too, which makes every worker flush on its next sync
+        self.shared.clear()
+        self._drop()
+
+    def close(self, **kwargs):
+        self.shared.close(**kwargs)
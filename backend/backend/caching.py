@@ -0,0 +1,309 @@
+"""
+Tag-based caching on top of the shared Django cache.
+
+Every cached entry records the tags it depends on (``journal:12``,
+``article:345``, ``homepage``, ...) together with the version each tag had
+when the entry was built. Invalidating a tag just stores a new version for
+it, so every entry carrying that tag - on every worker - stops validating on
+its next read, without having to know the entries' keys. Reading an entry
+costs one extra ``get_many`` for its tag versions.
+
+Tags are purged from model signals (journals/signals.py) once the writing
+transaction commits.
+
+``fetch`` (used by ``cache_response``) adds stampede protection on top:
+entries outlive their freshness window by a stale period, and when one goes
+stale - or is purged - a single request takes a lock in the shared cache and
+rebuilds it while everyone else keeps getting the previous value. Hot
+entries are also refreshed a little early at random (probabilistic early
+expiration), so they don't all expire in the same instant. The lock relies
+on ``cache.add`` being atomic, which holds for Redis, Memcached and the
+local-memory cache; the file-based cache only approximates it.
+"""
+
+import functools
+import hashlib
+import math
+import random
+import time
+from urllib.parse import urlencode
+
+from django.core.cache import cache
+from rest_framework.response import Response
+
+
+TAG_KEY_PREFIX = 'tag:'
+ENTRY_KEY_PREFIX = 'tagged:'
+LOCK_KEY_PREFIX = 'lock:'
+
+# How long a rebuild may hold the lock before another request may try
+LOCK_TIMEOUT = 30
+# How long a request with nothing to serve waits for another one's rebuild
+LOCK_WAIT = 3.0
+LOCK_POLL_INTERVAL = 0.05
+
+# Tags for collections of objects rather than a single object
+HOMEPAGE_TAG = 'homepage'
+JOURNALS_TAG = 'journals'
+
+
+def journal_tag(journal_id):
+    return f'journal:{journal_id}'
+
+
+def article_tag(article_id):
+    return f'article:{article_id}'
+
+
+def _tag_key(tag):
+    return f'{TAG_KEY_PREFIX}{tag}'
+
+
+def _new_version():
+    # Timestamps rather than counters: a tag evicted from the cache can never
+    # come back with a version that stale entries still carry
+    return time.time_ns()
+
+
+def tag_versions(tags):
+    """Current version of each tag, creating versions for unknown tags."""
+    tags = list(dict.fromkeys(tags))
+    if not tags:
+        return {}
+    keys = {_tag_key(tag): tag for tag in tags}
+    found = cache.get_many(keys)
+    missing = [key for key in keys if key not in found]
+    if missing:
+        for key in missing:
+            cache.add(key, _new_version(), None)
+        found.update(cache.get_many(missing))
+    return {keys[key]: version for key, version in found.items()}
+
+
+def invalidate_tags(*tags):
+    """Invalidate every cached entry carrying any of ``tags``."""
+    tags = {tag for tag in tags if tag}
+    if tags:
+        version = _new_version()
+        cache.set_many({_tag_key(tag): version for tag in tags}, None)
+
+
+def _tags_valid(entry):
+    tags = entry['tags']
+    if not tags:
+        return True
+    current = cache.get_many([_tag_key(tag) for tag in tags])
+    return all(current.get(_tag_key(tag)) == version for tag, version in tags.items())
+
+
+def get_entry(key):
+    """Return the cached value for ``key``, or None if missing or invalidated."""
+    entry = cache.get(ENTRY_KEY_PREFIX + key)
+    if entry is None or not _tags_valid(entry):
+        return None
+    return entry['value']
+
+
+def set_entry(key, value, tags=(), timeout=None, versions=None):
+    """
+    Cache ``value`` under ``key``, tagged with ``tags``.
+
+    Pass ``versions`` (from ``tag_versions``) taken *before* the value was
+    built; otherwise an invalidation that lands while the value is being
+    built would be missed.
+    """
+    if versions is None:
+        versions = tag_versions(tags)
+    else:
+        extra = [tag for tag in tags if tag not in versions]
+        if extra:
+            versions = {**versions, **tag_versions(extra)}
+    cache.set(ENTRY_KEY_PREFIX + key, {'tags': versions, 'value': value}, timeout)
+
+
+def get_entries(keys):
+    """
+    ``get_entry`` for many keys: one ``get_many`` for the entries and one for
+    the versions of all their tags. Returns the valid values by key; missing
+    and invalidated keys are left out.
+    """
+    keys = list(dict.fromkeys(keys))
+    if not keys:
+        return {}
+    found = cache.get_many([ENTRY_KEY_PREFIX + key for key in keys])
+    entries = {
+        key: found[ENTRY_KEY_PREFIX + key] for key in keys if ENTRY_KEY_PREFIX + key in found
+    }
+    tag_keys = {_tag_key(tag) for entry in entries.values() for tag in entry['tags']}
+    current = cache.get_many(list(tag_keys)) if tag_keys else {}
+    return {
+        key: entry['value']
+        for key, entry in entries.items()
+        if all(current.get(_tag_key(tag)) == version for tag, version in entry['tags'].items())
+    }
+
+
+def set_entries(values, tags, timeout=None, versions=None):
+    """
+    ``set_entry`` for many keys in one ``set_many``. ``tags`` maps each key of
+    ``values`` to the tags of its entry; ``versions`` works as in ``set_entry``.
+    """
+    if not values:
+        return
+    versions = dict(versions or {})
+    missing = [
+        tag for key in values for tag in tags.get(key, ()) if tag not in versions
+    ]
+    if missing:
+        versions.update(tag_versions(missing))
+    cache.set_many({
+        ENTRY_KEY_PREFIX + key: {
+            'tags': {tag: versions[tag] for tag in tags.get(key, ())},
+            'value': value,
+        }
+        for key, value in values.items()
+    }, timeout)
+
+
+def get_or_set(key, builder, tags=(), timeout=None):
+    """
+    Return the cached value for ``key``, calling ``builder()`` on a miss.
+
+    A ``None`` result from the builder is returned but not cached.
+    """
+    value = get_entry(key)
+    if value is not None:
+        return value
+    versions = tag_versions(tags)
+    value = builder()
+    if value is not None:
+        set_entry(key, value, tags, timeout, versions=versions)
+    return value
+
+
+def _is_fresh(entry, beta):
+    """
+    Whether ``entry`` can be served without a refresh.
+
+    Probabilistic early expiration ("XFetch"): the closer an entry is to its
+    expiry, and the longer it took to build, the more likely a request is to
+    treat it as expired already, so refreshes of a hot key are spread out
+    instead of all landing at the expiry time.
+    """
+    expires = entry.get('expires')
+    if expires is None:
+        return True
+    delta = entry.get('delta', 0)
+    return time.time() - delta * beta * math.log(1.0 - random.random()) < expires
+
+
+def fetch(key, builder, tags=(), timeout=300, stale_timeout=None,
+          value_tags=None, beta=1.0):
+    """
+    Return the cached value for ``key`` with stale-while-revalidate semantics.
+
+    The value is fresh for ``timeout`` seconds and may then be served stale
+    for up to ``stale_timeout`` more (default: another ``timeout``) while a
+    single request holding the lock calls ``builder()`` to refresh it. Entries
+    whose tags were purged are treated as stale too. ``value_tags(value)``
+    can add tags derived from the built value. A ``None`` result from the
+    builder is returned but not cached.
+    """
+    if stale_timeout is None:
+        stale_timeout = timeout
+
+    entry = cache.get(ENTRY_KEY_PREFIX + key)
+    if entry is not None and _tags_valid(entry) and _is_fresh(entry, beta):
+        return entry['value']
+
+    lock_key = LOCK_KEY_PREFIX + key
+    have_lock = cache.add(lock_key, 1, LOCK_TIMEOUT)
+    if not have_lock:
+        if entry is not None:
+            # Someone else is refreshing; the previous value will do meanwhile
+            return entry['value']
+        # Cold miss: give the rebuild in progress a moment before doing it too
+        deadline = time.monotonic() + LOCK_WAIT
+        while time.monotonic() < deadline:
+            time.sleep(LOCK_POLL_INTERVAL)
+            entry = cache.get(ENTRY_KEY_PREFIX + key)
+            if entry is not None:
+                return entry['value']
+
+    try:
+        versions = tag_versions(tags)
+        started = time.time()
+        value = builder()
+        if value is not None:
+            delta = time.time() - started
+            entry_tags = list(tags)
+            if value_tags is not None:
+                entry_tags.extend(value_tags(value))
+            if entry_tags != list(tags):
+                versions = {**versions, **tag_versions(
+                    [tag for tag in entry_tags if tag not in versions]
+                )}
+            cache.set(ENTRY_KEY_PREFIX + key, {
+                'tags': versions,
+                'value': value,
+                'expires': time.time() + timeout,
+                'delta': delta,
+            }, timeout + stale_timeout)
+        return value
+    finally:
+        if have_lock:
+            cache.delete(lock_key)
+
+
+def _response_cache_key(view, request):
+    query = urlencode(sorted(request.query_params.lists()), doseq=True)
+    digest = hashlib.md5(f'{request.path}?{query}'.encode()).hexdigest()
+    return f'response:{type(view).__name__}:{request.get_host()}:{digest}'
+
+
+def cache_response(timeout, tags=(), item_tags=None, stale_timeout=None):
+    """
+    Cache the response data of a DRF view method (``list``, ``get``, ...).
+
+    Replacement for ``cache_page`` that can be purged: the entry carries the
+    static ``tags`` plus, when ``item_tags`` is given, the tags it returns for
+    each serialized item in the response (``results`` when paginated). The
+    key includes the host because serializers build absolute media URLs.
+    Expired or purged entries are refreshed by one request at a time while
+    the others get the stale copy (see ``fetch``).
+
+        @cache_response(60 * 5, tags=[JOURNALS_TAG],
+                        item_tags=lambda item: [journal_tag(item['id'])])
+        def list(self, request, *args, **kwargs):
+            return super().list(request, *args, **kwargs)
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(view, request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return method(view, request, *args, **kwargs)
+
+            built = {}
+
+            def build():
+                response = method(view, request, *args, **kwargs)
+                built['response'] = response
+                return response.data if response.status_code == 200 else None
+
+            def data_tags(data):
+                items = data.get('results', []) if isinstance(data, dict) else data
+                return [tag for item in items for tag in item_tags(item)]
+
+            data = fetch(
+                _response_cache_key(view, request),
+                build,
+                tags=tags,
+                timeout=timeout,
+                stale_timeout=stale_timeout,
+                value_tags=data_tags if item_tags is not None else None,
+            )
+            if 'response' in built:
+                return built['response']
+            return Response(data)
+        return wrapper
+    return decorator
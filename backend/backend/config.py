@@ -79,6 +79,74 @@ else:
     }
 
 
+# =============================================================================
+# Cache Configuration
+# =============================================================================
+
+# The cache must be shared between worker processes so that tag-based
+# invalidation (backend/caching.py) reaches every worker. The file-based
+# backend works out of the box; in production point this at Redis, e.g.
+#   CACHE_BACKEND=django.core.cache.backends.redis.RedisCache
+#   CACHE_LOCATION=redis://127.0.0.1:6379/1
+CACHE_BACKEND = get_env('CACHE_BACKEND', 'django.core.cache.backends.filebased.FileBasedCache')
+CACHE_LOCATION = get_env('CACHE_LOCATION', 'cache')
+CACHE_KEY_PREFIX = get_env('CACHE_KEY_PREFIX', 'sp')
+
+CACHE_CONFIG = {
+    'BACKEND': CACHE_BACKEND,
+    'LOCATION': CACHE_LOCATION,
+    'KEY_PREFIX': CACHE_KEY_PREFIX,
+}
+if CACHE_BACKEND.endswith('FileBasedCache'):
+    # Relative directories are resolved against the backend directory
+    CACHE_CONFIG['LOCATION'] = str(BASE_DIR / CACHE_LOCATION)
+if CACHE_BACKEND.endswith(('FileBasedCache', 'LocMemCache')):
+    # Culling options only apply to the built-in local backends
+    CACHE_CONFIG['OPTIONS'] = {
+        'MAX_ENTRIES': get_env('CACHE_MAX_ENTRIES', '5000', int),
+    }
+
+# The usage recorder's per-client "seen today" markers (analytics/recorder.py)
+# go to a cache of their own, so their volume never evicts responses, tags
+# or fragments from the main one. File-based: a subdirectory of the main
+# cache directory, which that cache's culling and clearing leave alone.
+USAGE_CACHE_CONFIG = {
+    **CACHE_CONFIG,
+    'KEY_PREFIX': f'{CACHE_KEY_PREFIX}-usage',
+}
+if CACHE_BACKEND.endswith('FileBasedCache'):
+    USAGE_CACHE_CONFIG['LOCATION'] = str(BASE_DIR / get_env('USAGE_CACHE_LOCATION', f'{CACHE_LOCATION}/usage'))
+else:
+    USAGE_CACHE_CONFIG['LOCATION'] = get_env('USAGE_CACHE_LOCATION', CACHE_LOCATION)
+if CACHE_BACKEND.endswith(('FileBasedCache', 'LocMemCache')):
+    USAGE_CACHE_CONFIG['OPTIONS'] = {
+        'MAX_ENTRIES': get_env('USAGE_CACHE_MAX_ENTRIES', '50000', int),
+    }
+
+# Hot keys can also be kept in each worker's memory for a few seconds, in
+# front of the shared cache (backend/cache_backends.py). Writes reach the
+# other workers within CACHE_LOCAL_SYNC_INTERVAL seconds.
+CACHE_LOCAL_TIER = get_env('CACHE_LOCAL_TIER', 'True', bool)
+CACHE_LOCAL_OPTIONS = {
+    'LOCAL_KEY_PREFIXES': get_env(
+        'CACHE_LOCAL_KEY_PREFIXES', 'tag:,tagged:,querycache:', list
+    ),
+    'LOCAL_TIMEOUT': get_env('CACHE_LOCAL_TIMEOUT', '5', float),
+    'LOCAL_MAX_ENTRIES': get_env('CACHE_LOCAL_MAX_ENTRIES', '1000', int),
+    'SYNC_INTERVAL': get_env('CACHE_LOCAL_SYNC_INTERVAL', '1', float),
+}
+
+
+# =============================================================================
+# Reverse Proxies
+# =============================================================================
+
+# Number of reverse proxies in front of the app that append the client
+# address to X-Forwarded-For. Hops to the left of theirs are sent by the
+# client and can't be trusted; 0 uses REMOTE_ADDR only.
+TRUSTED_PROXY_COUNT = get_env('TRUSTED_PROXY_COUNT', '1', int)
+
+
 # =============================================================================
 # JWT Configuration
 # =============================================================================
@@ -98,6 +166,14 @@ CORS_ALLOWED_ORIGINS = get_env(
 )
 
 
+# =============================================================================
+# Frontend
+# =============================================================================
+
+# Public site the API redirects readers to (identifier links, feeds, sitemaps)
+FRONTEND_URL = get_env('FRONTEND_URL', 'http://localhost:3000').rstrip('/')
+
+
 # =============================================================================
 # Media Configuration
 # =============================================================================
@@ -105,3 +181,6 @@ CORS_ALLOWED_ORIGINS = get_env(
 MEDIA_URL = get_env('MEDIA_URL', '/media/')
 MEDIA_ROOT = BASE_DIR / get_env('MEDIA_ROOT', 'media')
 
+# Public URL of MEDIA_ROOT/sitemaps/ (syndication/sitemaps.py)
+SITEMAP_URL = get_env('SITEMAP_URL', f'{FRONTEND_URL}{MEDIA_URL}sitemaps/').rstrip('/') + '/'
+
@@ -0,0 +1,42 @@
+"""
+Keeping denormalized counters out of ordinary saves.
+
+The counters of journals/counters.py are written only by recount UPDATEs.
+An instance loaded before such an UPDATE still holds the old counts, and a
+plain ``save()`` writes every concrete field back, undoing the recount.
+Models with counters list them in ``COUNTER_FIELDS``; saves of existing
+rows then write every other loaded field and never the counters.
+
+A plain ``save()`` only narrows its fields once it has checked that the
+row is still there. A row deleted since the instance was loaded is then
+inserted again, as Django does for any model, rather than failing the way
+an ``update_fields`` save of a missing row does.
+
+    class Journal(CounterFieldsMixin, models.Model):
+        COUNTER_FIELDS = ('total_volumes', 'total_articles')
+"""
+
+
+class CounterFieldsMixin:
+    """Leave ``COUNTER_FIELDS`` out of ``save()`` on existing rows."""
+
+    COUNTER_FIELDS = ()
+
+    def save(self, *args, **kwargs):
+        if self.pk is not None and not self._state.adding and not kwargs.get('force_insert') and not args:
+            update_fields = kwargs.get('update_fields')
+            if update_fields is None and self._row_exists(kwargs.get('using')):
+                deferred = self.get_deferred_fields()
+                update_fields = [
+                    field.name for field in self._meta.concrete_fields
+                    if not field.primary_key and field.attname not in deferred
+                ]
+            if update_fields is not None:
+                kwargs['update_fields'] = [
+                    name for name in update_fields if name not in self.COUNTER_FIELDS
+                ]
+        super().save(*args, **kwargs)
+
+    def _row_exists(self, using):
+        manager = type(self)._base_manager.db_manager(using or self._state.db)
+        return manager.filter(pk=self.pk).exists()
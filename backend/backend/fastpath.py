@@ -0,0 +1,92 @@
+"""
+Fast path for hot list endpoints.
+
+A ``ModelSerializer`` with many method fields spends most of a large
+listing building model instances and walking fields one attribute at a
+time. A ``ValuesSerializer`` produces the same output from ``.values()``
+rows instead: the columns it needs (including related ones, via
+``__`` lookups) come back as plain dicts, related lists are loaded once
+per page and grouped by ID, and each row is turned into its output dict
+by one plain function. No model instances are created.
+
+Every fast serializer mirrors a regular one and must keep producing the
+same output; each app's tests.py compares the two.
+
+    class IssueListView(FastListMixin, generics.ListAPIView):
+        serializer_class = IssueListSerializer
+        fast_serializer_class = IssueListValuesSerializer
+
+The regular ``serializer_class`` is still used for everything else (the
+browsable API's forms, schema generation, ...).
+"""
+
+from rest_framework.response import Response
+
+
+class ValuesSerializer:
+    """
+    Base class for ``.values()``-based list serializers.
+
+    Subclasses set ``model`` and ``values`` (the columns to fetch) and
+    implement ``to_representation(row)``. ``prepare(rows)`` may load related
+    data for the whole page before the rows are converted.
+    """
+
+    model = None
+    values = ()
+
+    def __init__(self, context=None):
+        self.context = context or {}
+        self.request = self.context.get('request')
+
+    def values_queryset(self, queryset):
+        """``queryset`` as dict rows with the needed columns (prefetches dropped)."""
+        return queryset.prefetch_related(None).values(*self.values)
+
+    def prepare(self, rows):
+        """Load related data for a page of rows."""
+
+    def to_representation(self, row):
+        raise NotImplementedError
+
+    def serialize(self, rows):
+        rows = list(rows)
+        self.prepare(rows)
+        return [self.to_representation(row) for row in rows]
+
+    def file_url(self, name, field_name, model=None):
+        """What DRF's FileField (or an absolute-URL method field) renders for a stored file."""
+        if not name:
+            return None
+        field = (model or self.model)._meta.get_field(field_name)
+        url = field.storage.url(name)
+        if self.request is not None:
+            return self.request.build_absolute_uri(url)
+        return url
+
+    @staticmethod
+    def date(value):
+        return value.isoformat() if value is not None else None
+
+    @staticmethod
+    def text(value):
+        """What a read-only DRF CharField renders (None stays None)."""
+        return str(value) if value is not None else None
+
+
+class FastListMixin:
+    """``list()`` for ListAPIViews that serializes with ``fast_serializer_class``."""
+
+    fast_serializer_class = None
+
+    def get_fast_serializer(self):
+        return self.fast_serializer_class(context=self.get_serializer_context())
+
+    def list(self, request, *args, **kwargs):
+        serializer = self.get_fast_serializer()
+        rows = serializer.values_queryset(self.filter_queryset(self.get_queryset()))
+
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(serializer.serialize(page))
+        return Response(serializer.serialize(rows))
@@ -0,0 +1,116 @@
+"""
+Per-object cache of serialized representations.
+
+Popular articles and journals change rarely but are serialized over and
+over by list and detail endpoints. ``FragmentCacheMixin`` caches what a
+``ModelSerializer`` renders for each object under a key made of the model,
+the primary key, the object's ``updated_at`` and a serializer profile (the
+serializer class, its selected fields and the request origin, since media
+URLs are absolute). A list page reads all its rows with one ``get_many``
+(plus one for their tag versions, see ``caching.get_entries``) and only the
+misses are serialized and written back with one ``set_many``.
+
+``updated_at`` only moves when the object itself is saved, so each entry
+also carries cache tags (``fragment_tags``) for the related data it embeds;
+the signals in journals/signals.py purge them. Counters written with
+``QuerySet.update()`` (view counts, ...) don't touch either, so
+``live_fields`` are always re-read from the instance and written over the
+cached copy.
+
+    class JournalListSerializer(FragmentCacheMixin, serializers.ModelSerializer):
+        live_fields = ('total_volumes', 'total_articles')
+
+        class Meta:
+            model = Journal
+            list_serializer_class = FragmentListSerializer
+            fields = [...]
+
+        def fragment_tags(self, instance):
+            return [journal_tag(instance.pk), JOURNALS_TAG]
+"""
+
+import hashlib
+
+from django.db import models
+from django.utils.functional import cached_property
+from rest_framework import serializers
+
+from backend import caching
+
+
+FRAGMENT_KEY_PREFIX = 'fragment:'
+FRAGMENT_TIMEOUT = 60 * 60 * 24
+
+
+class FragmentCacheMixin:
+    """Cache a ModelSerializer's representation of each object."""
+
+    fragment_timeout = FRAGMENT_TIMEOUT
+    fragment_version_field = 'updated_at'
+    live_fields = ()
+    # False serializes every object afresh (e.g. to measure the uncached cost)
+    fragment_cache = True
+
+    def fragment_tags(self, instance):
+        """Cache tags of the related data embedded in ``instance``'s representation."""
+        return []
+
+    @cached_property
+    def fragment_profile(self):
+        request = self.context.get('request')
+        origin = request.build_absolute_uri('/') if request is not None else ''
+        serializer = f'{type(self).__module__}.{type(self).__qualname__}'
+        signature = '|'.join([serializer, ','.join(self.fields), origin])
+        return hashlib.md5(signature.encode()).hexdigest()
+
+    def fragment_key(self, instance):
+        version = getattr(instance, self.fragment_version_field)
+        stamp = version.timestamp() if version is not None else ''
+        return (
+            f'{FRAGMENT_KEY_PREFIX}{instance._meta.label_lower}:'
+            f'{instance.pk}:{stamp}:{self.fragment_profile}'
+        )
+
+    def to_representation(self, instance):
+        return self.cached_representations([instance])[0]
+
+    def cached_representations(self, instances):
+        """Representations of ``instances``, serializing only the cache misses."""
+        build = super().to_representation
+        if not self.fragment_cache:
+            return [build(instance) for instance in instances]
+        keys = [self.fragment_key(instance) if instance.pk else None for instance in instances]
+        cached = caching.get_entries(key for key in keys if key)
+
+        missing = {
+            key: instance for key, instance in zip(keys, instances) if key and key not in cached
+        }
+        if missing:
+            tags = {key: self.fragment_tags(instance) for key, instance in missing.items()}
+            # Versions taken before building, so a purge meanwhile isn't missed
+            versions = caching.tag_versions(tag for entry_tags in tags.values() for tag in entry_tags)
+            built = {key: build(instance) for key, instance in missing.items()}
+            caching.set_entries(built, tags, self.fragment_timeout, versions=versions)
+            cached.update(built)
+
+        return [
+            self.add_live_fields(dict(cached[key]), instance) if key
+            else build(instance)
+            for key, instance in zip(keys, instances)
+        ]
+
+    def add_live_fields(self, representation, instance):
+        for name in self.live_fields:
+            field = self.fields.get(name)
+            if field is not None:
+                attribute = field.get_attribute(instance)
+                representation[name] = None if attribute is None else field.to_representation(attribute)
+        return representation
+
+
+class FragmentListSerializer(serializers.ListSerializer):
+    """``many=True`` serializer that reads all of a page's fragments at once."""
+
+    def to_representation(self, data):
+        iterable = data.all() if isinstance(data, models.manager.BaseManager) else data
+        return self.child.cached_representations(list(iterable))
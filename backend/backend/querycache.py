@@ -0,0 +1,178 @@
+"""
+Cached querysets for small, rarely changing models.
+
+Site settings, CTA buttons and cards, FAQs, subjects, navigation pages and
+the like are a handful of rows that public endpoints read on every request.
+Models opt in by using a ``CachedManager``; their querysets then keep the
+results of each query in the shared cache under a hash of its normalized
+SQL and parameters, and hit the database again only after the model's
+content changed.
+
+Each model has a version in the cache. Cached results record the version
+they were read under and the version is fetched together with them (one
+``get_many``). Any save or delete of the model - through ``save()``,
+``delete()``, ``QuerySet.update()``, ``bulk_create()``, ... - stores a new
+version once the writing transaction commits, which invalidates every
+cached query of the model on every worker.
+
+Only queries that read the model's own table are cached: anything joining
+or sub-selecting other tables (``select_related`` of another model,
+``with_journal_counts()``, ``filter(journals__...)``) depends on data whose
+writes don't touch the version, so it runs uncached. So does everything
+inside ``transaction.atomic()``, where the transaction may see its own
+uncommitted writes. ``count()``, ``exists()`` and ``iterator()`` always
+query the database.
+
+    class FAQ(models.Model):
+        ...
+        objects = CachedManager()
+
+    class SubjectQuerySet(CachedQuerySet):
+        ...
+
+    class Subject(models.Model):
+        ...
+        objects = CachedManager.from_queryset(SubjectQuerySet)()
+"""
+
+import hashlib
+import time
+
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
+from django.db import connections, models, transaction
+from django.db.models.query import (
+    FlatValuesListIterable, ModelIterable, ValuesIterable, ValuesListIterable,
+)
+from django.db.models.signals import post_delete, post_save
+from django.db.models.sql import Query
+
+
+VERSION_KEY_PREFIX = 'querycache:version:'
+RESULT_KEY_PREFIX = 'querycache:result:'
+
+# Results for rarely repeated queries (e.g. searches) shouldn't linger forever
+QUERY_CACHE_TIMEOUT = 60 * 60
+
+# namedtuple rows of values_list(named=True) are built on the fly and don't pickle
+CACHEABLE_ITERABLES = (ModelIterable, ValuesIterable, ValuesListIterable, FlatValuesListIterable)
+
+
+def _version_key(model):
+    return f'{VERSION_KEY_PREFIX}{model._meta.label_lower}'
+
+
+def invalidate_model(model):
+    """Drop every cached query result of ``model``."""
+    cache.set(_version_key(model), time.time_ns(), None)
+
+
+def _invalidate_on_commit(model, using=None):
+    transaction.on_commit(lambda: invalidate_model(model), using=using)
+
+
+def _has_subquery(expression):
+    if isinstance(expression, Query) or getattr(expression, 'subquery', False):
+        return True
+    return any(
+        _has_subquery(source) for source in expression.get_source_expressions()
+        if source is not None
+    )
+
+
+class CachedQuerySet(models.QuerySet):
+    """QuerySet whose results are cached until the model is next written."""
+
+    def _result_cache_key(self):
+        """Cache key for this query's results, or None if it can't be cached."""
+        query = self.query
+        if (
+            self._iterable_class not in CACHEABLE_ITERABLES
+            or query.select_for_update
+            or query.combinator
+            or connections[self.db].in_atomic_block
+        ):
+            return None
+        tables = {join.table_name for join in query.alias_map.values()}
+        if tables - {self.model._meta.db_table}:
+            return None
+        if _has_subquery(query.where) or any(
+            _has_subquery(annotation) for annotation in query.annotations.values()
+        ):
+            return None
+
+        try:
+            sql, params = query.get_compiler(using=self.db).as_sql()
+        except EmptyResultSet:
+            return None
+        normalized = ' '.join(sql.split())
+        signature = repr((self.db, self._iterable_class.__name__, normalized, params))
+        digest = hashlib.md5(signature.encode()).hexdigest()
+        return f'{RESULT_KEY_PREFIX}{self.model._meta.label_lower}:{digest}'
+
+    def _fetch_all(self):
+        if self._result_cache is None:
+            key = self._result_cache_key()
+            if key is not None:
+                self._result_cache = self._cached_results(key)
+        super()._fetch_all()
+
+    def _cached_results(self, key):
+        version_key = _version_key(self.model)
+        found = cache.get_many([version_key, key])
+        version = found.get(version_key)
+        if version is None:
+            cache.add(version_key, time.time_ns(), None)
+            version = cache.get(version_key)
+
+        entry = found.get(key)
+        if entry is not None and entry['version'] == version:
+            return entry['rows']
+
+        # Stored with the version read *before* the query, so a write that
+        # lands meanwhile leaves the entry already invalid
+        rows = list(self._iterable_class(self))
+        cache.set(key, {'version': version, 'rows': rows}, QUERY_CACHE_TIMEOUT)
+        return rows
+
+    # Writes that bypass save()/delete() and so send no signals
+
+    def update(self, **kwargs):
+        result = super().update(**kwargs)
+        _invalidate_on_commit(self.model, using=self.db)
+        return result
+
+    update.alters_data = True
+
+    def bulk_create(self, *args, **kwargs):
+        result = super().bulk_create(*args, **kwargs)
+        _invalidate_on_commit(self.model, using=self.db)
+        return result
+
+    def bulk_update(self, *args, **kwargs):
+        result = super().bulk_update(*args, **kwargs)
+        _invalidate_on_commit(self.model, using=self.db)
+        return result
+
+    def delete(self):
+        result = super().delete()
+        _invalidate_on_commit(self.model, using=self.db)
+        return result
+
+    delete.alters_data = True
+    delete.queryset_only = True
+
+
+def _model_written(sender, using=None, **kwargs):
+    _invalidate_on_commit(sender, using=using)
+
+
+class CachedManager(models.Manager.from_queryset(CachedQuerySet)):
+    """Manager for models whose query results are cached (see module docstring)."""
+
+    def contribute_to_class(self, cls, name):
+        super().contribute_to_class(cls, name)
+        if not cls._meta.abstract:
+            uid = f'querycache:{cls._meta.label_lower}'
+            post_save.connect(_model_written, sender=cls, weak=False, dispatch_uid=uid)
+            post_delete.connect(_model_written, sender=cls, weak=False, dispatch_uid=uid)
@@ -7,9 +7,10 @@ This is a complete CMS for hosting multiple academic journals.
 from pathlib import Path
 from datetime import timedelta
 from .config import (
-    DEBUG, SECRET_KEY, ALLOWED_HOSTS, DATABASE_CONFIG,
+    DEBUG, SECRET_KEY, ALLOWED_HOSTS, DATABASE_CONFIG, CACHE_CONFIG,
+    CACHE_LOCAL_TIER, CACHE_LOCAL_OPTIONS, USAGE_CACHE_CONFIG, TRUSTED_PROXY_COUNT,
     JWT_ACCESS_TOKEN_LIFETIME, JWT_REFRESH_TOKEN_LIFETIME,
-    CORS_ALLOWED_ORIGINS, MEDIA_URL, MEDIA_ROOT,
+    CORS_ALLOWED_ORIGINS, FRONTEND_URL, MEDIA_URL, MEDIA_ROOT, SITEMAP_URL,
 )
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -45,6 +46,8 @@ INSTALLED_APPS = [
     'articles',
     'media_files',
     'xml_parser',
+    'analytics',
+    'syndication',
 ]
 
 MIDDLEWARE = [
@@ -151,7 +154,7 @@ STORAGES = {
 # Media Files (Uploaded Content)
 # =============================================================================
 
-# MEDIA_URL and MEDIA_ROOT are imported from config.py
+# MEDIA_URL, MEDIA_ROOT and SITEMAP_URL are imported from config.py
 
 
 # =============================================================================
@@ -165,12 +168,25 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # Caching Configuration
 # =============================================================================
 
+# Backend and location come from config.py (CACHE_BACKEND / CACHE_LOCATION)
 CACHES = {
-    'default': {
-        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
-        'LOCATION': 'unique-snowflake',
-    }
+    'default': CACHE_CONFIG,
 }
+if CACHE_LOCAL_TIER:
+    # Per-worker LRU in front of the shared cache (backend/cache_backends.py)
+    CACHES = {
+        'default': {
+            'BACKEND': 'backend.cache_backends.TwoTierCache',
+            'OPTIONS': {'SHARED': 'shared', **CACHE_LOCAL_OPTIONS},
+        },
+        'shared': CACHE_CONFIG,
+    }
+# Unique-request markers of the usage recorder (analytics/recorder.py)
+CACHES['usage'] = USAGE_CACHE_CONFIG
+
+# The test suite clears the cache, so it runs against throwaway cache
+# directories instead (backend/testing.py; conftest.py under pytest)
+TEST_RUNNER = 'backend.testing.TestRunner'
 
 # =============================================================================
 # Django REST Framework
@@ -240,6 +256,13 @@ CORS_ALLOWED_ORIGINS = CORS_ALLOWED_ORIGINS
 CORS_ALLOW_CREDENTIALS = True
 
 
+# =============================================================================
+# Frontend
+# =============================================================================
+
+FRONTEND_URL = FRONTEND_URL
+
+
 # =============================================================================
 # API Documentation (Spectacular)
 # =============================================================================
@@ -0,0 +1,81 @@
+"""
+Streaming JSON responses for unpaginated list views.
+
+``StreamingListMixin`` replaces ``ListModelMixin.list`` for views that set
+``pagination_class = None``: instead of serializing the whole queryset
+into one list and encoding it in a single ``JSONRenderer`` call, the rows
+are read with ``QuerySet.iterator(chunk_size=...)`` (prefetches run per
+chunk), serialized a chunk at a time and written out as parts of one JSON
+array through a ``StreamingHttpResponse``. Peak memory stays at one chunk
+and the first bytes go out as soon as the first chunk is ready.
+
+The first chunk is queried and serialized before the response is
+returned, so errors there (a bad query, a failing serializer) still get a
+regular error response. Once the status has been sent a later failure
+can't change it; the array is then left unterminated, which no JSON
+parser accepts as a complete result.
+
+The output is the same JSON array the regular response would contain.
+Responses for other renderers (e.g. the browsable API) and paginated
+requests fall back to the regular ``list``.
+
+    class ArticlesByIssueView(StreamingListMixin, generics.ListAPIView):
+        pagination_class = None
+        stream_chunk_size = 100
+"""
+
+from itertools import chain, islice
+
+from django.db.models import QuerySet
+from django.http import StreamingHttpResponse
+from rest_framework.renderers import JSONRenderer
+
+
+class StreamingListMixin:
+    """Stream the list response of a ``ListAPIView`` as a JSON array."""
+
+    stream_chunk_size = 200
+
+    def list(self, request, *args, **kwargs):
+        renderer = getattr(request, 'accepted_renderer', None)
+        if self.paginator is not None or not isinstance(renderer, JSONRenderer):
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        parts = self.stream_json(queryset, renderer)
+        first = next(parts)
+        return StreamingHttpResponse(chain([first], parts), content_type=renderer.media_type)
+
+    def stream_json(self, queryset, renderer):
+        """
+        Yield the serialized queryset as a JSON array, one chunk at a time.
+
+        The first part is the opening bracket with the first chunk (or the
+        whole empty array).
+        """
+        if isinstance(queryset, QuerySet):
+            rows = queryset.iterator(chunk_size=self.stream_chunk_size)
+        else:
+            rows = iter(queryset)
+
+        chunks = self.encoded_chunks(rows, renderer)
+        first = next(chunks, None)
+        if first is None:
+            yield b'[]'
+            return
+        yield b'[' + first
+        for encoded in chunks:
+            yield b',' + encoded
+        yield b']'
+
+    def encoded_chunks(self, rows, renderer):
+        """Serialize ``rows`` a chunk at a time; yields each chunk's items without the brackets."""
+        while True:
+            chunk = list(islice(rows, self.stream_chunk_size))
+            if not chunk:
+                return
+            serializer = self.get_serializer(chunk, many=True)
+            # Rendered as "[...]"; strip the brackets so the chunks can be joined
+            encoded = renderer.render(serializer.data)[1:-1]
+            if encoded:
+                yield encoded
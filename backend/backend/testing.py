@@ -0,0 +1,60 @@
+"""
+Test suite setup shared by ``manage.py test`` and pytest (conftest.py).
+
+Tests clear and fill the cache freely, so they must never run against the
+configured one - by default the on-disk cache of the development server.
+``isolated_caches`` points every cache alias at its own directory under a
+temporary one for the duration of the run, keeping the configured backend
+layout (e.g. the two-tier cache in front of the shared one) intact.
+
+Views record usage into an in-process buffer (analytics/recorder.py) that
+is written at exit - after the test database is gone, i.e. into the
+configured one. ``discard_usage`` empties it at the end of the run instead.
+"""
+
+import contextlib
+import os
+import tempfile
+
+from django.conf import settings
+from django.test import override_settings
+from django.test.runner import DiscoverRunner
+
+
+FILE_BASED_CACHE = 'django.core.cache.backends.filebased.FileBasedCache'
+TWO_TIER_CACHE = 'backend.cache_backends.TwoTierCache'
+
+
+@contextlib.contextmanager
+def isolated_caches():
+    """Run with every configured cache replaced by a file-based one in a temporary directory."""
+    with tempfile.TemporaryDirectory(prefix='test-cache-') as root:
+        test_caches = {
+            alias: config if config['BACKEND'] == TWO_TIER_CACHE else {
+                **config, 'BACKEND': FILE_BASED_CACHE, 'LOCATION': os.path.join(root, alias),
+            }
+            for alias, config in settings.CACHES.items()
+        }
+        with override_settings(CACHES=test_caches):
+            yield
+
+
+def discard_usage():
+    """Drop the usage events the tests left in the recorder's buffer."""
+    from analytics import recorder
+
+    recorder.discard()
+
+
+class TestRunner(DiscoverRunner):
+    """``DiscoverRunner`` that runs the suite against ``isolated_caches``."""
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self._isolated_caches = contextlib.ExitStack()
+        self._isolated_caches.enter_context(isolated_caches())
+
+    def teardown_test_environment(self, **kwargs):
+        discard_usage()
+        self._isolated_caches.close()
+        super().teardown_test_environment(**kwargs)
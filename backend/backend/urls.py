@@ -16,6 +16,8 @@ from drf_spectacular.views import (
     SpectacularSwaggerView,
 )
 
+from backend.batch import BatchView
+
 urlpatterns = [
     # Django Admin (built-in)
     path('admin/', admin.site.urls),
@@ -36,6 +38,15 @@ urlpatterns = [
         
         # XML Parser
         path('xml/', include('xml_parser.urls')),
+        
+        # Usage analytics
+        path('analytics/', include('analytics.urls')),
+        
+        # Harvesting (OAI-PMH) and feeds
+        path('', include('syndication.urls')),
+        
+        # Several GET requests in one (backend/batch.py)
+        path('batch/', BatchView.as_view(), name='batch'),
     ])),
     
     # API Documentation
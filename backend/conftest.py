@@ -0,0 +1,11 @@
+import pytest
+
+from backend.testing import discard_usage, isolated_caches
+
+
+@pytest.fixture(scope='session', autouse=True)
+def _isolated_caches(django_test_environment):
+    """Keep pytest runs off the configured cache, as ``manage.py test`` does."""
+    with isolated_caches():
+        yield
+    discard_usage()
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.9 on 2026-10-19 06:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('issues', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='issue',
+            name='total_articles',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Number of published/archived articles (maintained automatically)'),
+        ),
+    ]
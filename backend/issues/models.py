@@ -7,8 +7,10 @@ URL pattern: /{journal_slug}/issue/{issue_number}
 
 from django.db import models
 
+from backend.counterfields import CounterFieldsMixin
 
-class Issue(models.Model):
+
+class Issue(CounterFieldsMixin, models.Model):
     """
     An issue represents a specific publication within a volume.
     
@@ -69,6 +71,14 @@ class Issue(models.Model):
         help_text='Is this the current/latest issue? (for homepage display)'
     )
     
+    # Denormalized counter, kept up to date by journals/counters.py
+    total_articles = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        help_text='Number of published/archived articles (maintained automatically)'
+    )
+    COUNTER_FIELDS = ('total_articles',)
+    
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
@@ -109,8 +119,3 @@ class Issue(models.Model):
     def full_citation(self):
         """Full citation format: Volume X, Issue Y (Year)."""
         return f'Volume {self.volume.volume_number}, Issue {self.issue_number} ({self.volume.year})'
-    
-    @property
-    def total_articles(self):
-        """Count of published/archived articles in this issue."""
-        return self.articles.filter(status__in=['published', 'archive']).count()
@@ -1,6 +1,8 @@
 """Serializers for issues app."""
 
 from rest_framework import serializers
+
+from backend.fastpath import ValuesSerializer
 from .models import Issue
 
 
@@ -25,6 +27,47 @@ class IssueListSerializer(serializers.ModelSerializer):
         ]
 
 
+class IssueListValuesSerializer(ValuesSerializer):
+    """IssueListSerializer output built from ``.values()`` rows (see backend/fastpath.py)."""
+    
+    model = Issue
+    values = (
+        'id', 'volume_id', 'volume__volume_number', 'volume__year',
+        'volume__journal__title', 'volume__journal__slug',
+        'issue_number', 'title', 'publication_date',
+        'cover_image', 'is_special_issue', 'special_issue_title',
+        'is_active', 'is_current', 'total_articles',
+    )
+    
+    def to_representation(self, row):
+        issue_number = row['issue_number']
+        if row['is_special_issue'] and row['special_issue_title']:
+            display_name = f'Issue {issue_number}: {row["special_issue_title"]}'
+        else:
+            display_name = f'Issue {issue_number}'
+        return {
+            'id': row['id'],
+            'volume': row['volume_id'],
+            'volume_number': row['volume__volume_number'],
+            'year': row['volume__year'],
+            'journal_title': row['volume__journal__title'],
+            'journal_slug': row['volume__journal__slug'],
+            'issue_number': issue_number,
+            'title': row['title'],
+            'publication_date': self.date(row['publication_date']),
+            'cover_image': self.file_url(row['cover_image'], 'cover_image'),
+            'is_special_issue': row['is_special_issue'],
+            'special_issue_title': row['special_issue_title'],
+            'is_active': row['is_active'],
+            'is_current': row['is_current'],
+            'total_articles': row['total_articles'],
+            'display_name': display_name,
+            'full_citation': (
+                f'Volume {row["volume__volume_number"]}, Issue {issue_number} ({row["volume__year"]})'
+            ),
+        }
+
+
 class IssueDetailSerializer(serializers.ModelSerializer):
     """Full serializer for issue detail view."""
     
@@ -1,3 +1,43 @@
+from datetime import date
+
 from django.test import TestCase
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from journals.models import Journal
+from volumes.models import Volume
+
+from .models import Issue
+from .serializers import IssueListSerializer, IssueListValuesSerializer
+
+
+class IssueListValuesSerializerTests(TestCase):
+    """The values-based fast path must render exactly what IssueListSerializer renders."""
+
+    @classmethod
+    def setUpTestData(cls):
+        journal = Journal.objects.create(title='Journal of Tests', slug='tests')
+        volume = Volume.objects.create(journal=journal, volume_number=4, year=2025)
+        Issue.objects.create(
+            volume=volume, issue_number=1, publication_date=date(2025, 1, 15),
+            cover_image='issues/covers/one.jpg', is_current=True,
+        )
+        Issue.objects.create(
+            volume=volume, issue_number=2, is_special_issue=True,
+            special_issue_title='Machine Learning',
+        )
+        Issue.objects.create(volume=volume, issue_number=3, is_special_issue=True)
+
+    def assertSameOutput(self, context):
+        queryset = Issue.objects.select_related('volume__journal').order_by('pk')
+        expected = IssueListSerializer(queryset, many=True, context=context).data
+        fast = IssueListValuesSerializer(context)
+        actual = fast.serialize(fast.values_queryset(queryset))
+        self.assertEqual(JSONRenderer().render(actual), JSONRenderer().render(expected))
+
+    def test_same_output(self):
+        self.assertSameOutput({'request': Request(APIRequestFactory().get('/api/v1/issues/'))})
 
-# Create your tests here.
+    def test_same_output_without_request(self):
+        self.assertSameOutput({})
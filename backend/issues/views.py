@@ -5,11 +5,13 @@ from rest_framework.permissions import IsAuthenticated, IsAdminUser, AllowAny
 from django_filters.rest_framework import DjangoFilterBackend
 from django.shortcuts import get_object_or_404
 
+from backend.fastpath import FastListMixin
 from .models import Issue
 from journals.models import Journal
+from journals.resolvers import resolve_issue
 from volumes.models import Volume
 from .serializers import (
-    IssueListSerializer, IssueDetailSerializer,
+    IssueListSerializer, IssueListValuesSerializer, IssueDetailSerializer,
     IssueCreateUpdateSerializer,
 )
 
@@ -18,7 +20,7 @@ from .serializers import (
 # Public Views
 # =============================================================================
 
-class IssueListView(generics.ListAPIView):
+class IssueListView(FastListMixin, generics.ListAPIView):
     """
     List all active issues.
     
@@ -30,6 +32,7 @@ class IssueListView(generics.ListAPIView):
     """
     permission_classes = [AllowAny]
     serializer_class = IssueListSerializer
+    fast_serializer_class = IssueListValuesSerializer
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
     filterset_fields = ['volume']
     ordering = ['-publication_date', '-issue_number']
@@ -58,7 +61,7 @@ class IssueDetailView(generics.RetrieveAPIView):
         return Issue.objects.filter(is_active=True).select_related('volume__journal')
 
 
-class IssuesByVolumeView(generics.ListAPIView):
+class IssuesByVolumeView(FastListMixin, generics.ListAPIView):
     """
     List all issues in a specific volume.
     
@@ -66,6 +69,7 @@ class IssuesByVolumeView(generics.ListAPIView):
     """
     permission_classes = [AllowAny]
     serializer_class = IssueListSerializer
+    fast_serializer_class = IssueListValuesSerializer
     
     def get_queryset(self):
         volume_id = self.kwargs['volume_id']
@@ -124,14 +128,18 @@ class IssueByNumberView(generics.RetrieveAPIView):
     def get_object(self):
         journal_slug = self.kwargs['journal_slug']
         issue_number = self.kwargs['issue_number']
-        journal = get_object_or_404(Journal, slug=journal_slug, is_active=True)
         
-        # Get the most recent issue with this number
-        issue = Issue.objects.filter(
-            volume__journal=journal,
-            issue_number=issue_number,
-            is_active=True
-        ).order_by('-volume__year', '-volume__volume_number').first()
+        # The most recent issue with this number (cached, see journals/resolvers.py)
+        issue = None
+        issue_id = resolve_issue(journal_slug, issue_number)
+        if issue_id is not None:
+            issue = Issue.objects.filter(
+                pk=issue_id,
+                volume__journal__slug=journal_slug,
+                volume__journal__is_active=True,
+                issue_number=issue_number,
+                is_active=True
+            ).first()
         
         if not issue:
             from rest_framework.exceptions import NotFound
@@ -144,7 +152,7 @@ class IssueByNumberView(generics.RetrieveAPIView):
 # Admin Views
 # =============================================================================
 
-class IssueAdminListView(generics.ListAPIView):
+class IssueAdminListView(FastListMixin, generics.ListAPIView):
     """
     List all issues (admin view).
     
@@ -152,6 +160,7 @@ class IssueAdminListView(generics.ListAPIView):
     """
     permission_classes = [IsAuthenticated, IsAdminUser]
     serializer_class = IssueListSerializer
+    fast_serializer_class = IssueListValuesSerializer
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
     filterset_fields = ['volume', 'is_active', 'is_current']
     ordering = ['-volume__year', '-volume__volume_number', '-issue_number']
@@ -0,0 +1,85 @@
+"""
+Journal page bundle.
+
+Assembles everything the public journal page needs (journal detail,
+volumes with their issues, and the most recent articles) into a single
+payload that is cached per journal.
+
+Entries are tagged with the journal's cache tag (backend/caching.py), so
+invalidating a journal drops every host-specific variant of the payload at
+once. Invalidation is driven by model signals (see journals/signals.py).
+"""
+
+from django.db.models import Q
+
+from backend import caching
+
+from .models import Journal
+from .serializers import JournalDetailSerializer
+
+
+BUNDLE_TIMEOUT = 60 * 60  # 1 hour - signals invalidate on change
+RECENT_ARTICLES_LIMIT = 10
+
+
+def _bundle_key(journal_id, host):
+    return f'journal_bundle:{journal_id}:{host}'
+
+
+def build_journal_bundle(journal, request):
+    """Build the bundle payload for a journal (uncached)."""
+    from volumes.models import Volume
+    from volumes.serializers import VolumeListSerializer
+    from articles.models import Article
+    from articles.serializers import ArticleListSerializer
+
+    context = {'request': request}
+
+    volumes = Volume.objects.filter(
+        journal=journal,
+        is_active=True
+    ).select_related('journal').order_by('-year', '-volume_number')
+
+    recent_articles = Article.objects.filter(
+        Q(journal=journal) |
+        Q(issue__volume__journal=journal) |
+        Q(volume__journal=journal),
+        status__in=['published', 'archive']
+    ).filter(
+        Q(volume__is_archived=False) | Q(volume__isnull=True),
+        Q(issue__volume__is_archived=False) | Q(issue__isnull=True)
+    ).select_related(
+        'journal', 'issue__volume__journal', 'volume__journal'
+    ).prefetch_related(
+        'article_authors__author'
+    ).distinct().order_by('-published_date', '-created_at')[:RECENT_ARTICLES_LIMIT]
+
+    return {
+        'journal': JournalDetailSerializer(journal, context=context).data,
+        'volumes': VolumeListSerializer(volumes, many=True, context=context).data,
+        'recent_articles': ArticleListSerializer(recent_articles, many=True, context=context).data,
+    }
+
+
+def get_journal_bundle(journal_id, request):
+    """
+    Return the cached bundle for a journal, building it on a miss.
+
+    Returns None if the journal does not exist or is inactive.
+    """
+    def build():
+        journal = Journal.objects.filter(
+            pk=journal_id, is_active=True
+        ).prefetch_related(
+            'subjects', 'editorial_board_members', 'indexing_entries'
+        ).first()
+        if journal is None:
+            return None
+        return build_journal_bundle(journal, request)
+
+    return caching.get_or_set(
+        _bundle_key(journal_id, request.get_host()),
+        build,
+        tags=[caching.journal_tag(journal_id)],
+        timeout=BUNDLE_TIMEOUT,
+    )
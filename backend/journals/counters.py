@@ -0,0 +1,116 @@
+"""
+Denormalized aggregate counters.
+
+Journal, Volume, Issue and Author store counts (``total_volumes``,
+``total_articles``, ``total_issues``, ``article_count``) so that listings
+never run a COUNT per row. Every counter is recomputed from the source rows
+with a single correlated-subquery UPDATE rather than incremented, so a
+recount is idempotent and self-healing: signals (journals/signals.py) call
+these functions for the rows an edit touched, and the ``recount_aggregates``
+management command calls them for every row.
+"""
+
+from django.db.models import F, Func, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+
+from articles.models import Article, ArticleAuthor, Author
+from issues.models import Issue
+from volumes.models import Volume
+
+from .models import Journal
+
+
+PUBLIC_STATUSES = ['published', 'archive']
+
+
+def _count(queryset):
+    """Correlated ``SELECT COUNT(*)`` over ``queryset`` as an update expression."""
+    counted = queryset.order_by().annotate(
+        _count=Func(F('pk'), function='COUNT')
+    ).values('_count')
+    return Coalesce(Subquery(counted), 0)
+
+
+def _targets(model, ids):
+    queryset = model.objects.all()
+    if ids is not None:
+        ids = {pk for pk in ids if pk}
+        if not ids:
+            return None
+        queryset = queryset.filter(pk__in=ids)
+    return queryset
+
+
+def recount_journals(ids=None):
+    """Recount journals (all of them when ``ids`` is None). Returns rows updated."""
+    queryset = _targets(Journal, ids)
+    if queryset is None:
+        return 0
+    return queryset.update(
+        total_volumes=_count(
+            Volume.objects.filter(journal=OuterRef('pk'), is_active=True)
+        ),
+        total_articles=_count(
+            Article.objects.filter(journal=OuterRef('pk'), status='published')
+        ),
+    )
+
+
+def recount_volumes(ids=None):
+    """Recount volumes (all of them when ``ids`` is None). Returns rows updated."""
+    queryset = _targets(Volume, ids)
+    if queryset is None:
+        return 0
+    return queryset.update(
+        total_issues=_count(
+            Issue.objects.filter(volume=OuterRef('pk'), is_active=True)
+        ),
+        total_articles=_count(
+            Article.objects.filter(
+                Q(issue__volume=OuterRef('pk')) | Q(volume=OuterRef('pk')),
+                status__in=PUBLIC_STATUSES
+            )
+        ),
+    )
+
+
+def recount_issues(ids=None):
+    """Recount issues (all of them when ``ids`` is None). Returns rows updated."""
+    queryset = _targets(Issue, ids)
+    if queryset is None:
+        return 0
+    return queryset.update(
+        total_articles=_count(
+            Article.objects.filter(issue=OuterRef('pk'), status__in=PUBLIC_STATUSES)
+        ),
+    )
+
+
+def recount_authors(ids=None):
+    """Recount authors (all of them when ``ids`` is None). Returns rows updated."""
+    queryset = _targets(Author, ids)
+    if queryset is None:
+        return 0
+    return queryset.update(
+        article_count=_count(ArticleAuthor.objects.filter(author=OuterRef('pk'))),
+    )
+
+
+def recount_for_articles(articles):
+    """Recount every container the given articles are (or were) placed in."""
+    journal_ids, volume_ids, issue_ids = set(), set(), set()
+    for journal_id, volume_id, issue_id in articles:
+        journal_ids.add(journal_id)
+        volume_ids.add(volume_id)
+        issue_ids.add(issue_id)
+
+    issue_ids.discard(None)
+    if issue_ids:
+        # Articles placed via an issue also count towards the issue's volume
+        volume_ids.update(
+            Issue.objects.filter(pk__in=issue_ids).values_list('volume_id', flat=True)
+        )
+
+    recount_journals(journal_ids)
+    recount_volumes(volume_ids)
+    recount_issues(issue_ids)
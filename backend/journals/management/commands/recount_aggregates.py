@@ -0,0 +1,40 @@
+"""
+Management command to reconcile the denormalized counters.
+
+Signals keep the counters current for normal edits, but bulk ``update()``
+calls, raw SQL and data imports bypass them. This recomputes every counter
+from the source rows with one UPDATE per model.
+"""
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from journals import counters
+
+
+class Command(BaseCommand):
+    help = 'Recompute stored article/issue/volume counters for journals, volumes, issues and authors'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--only',
+            choices=['journals', 'volumes', 'issues', 'authors'],
+            action='append',
+            help='Only recount these models (may be repeated; default: all)',
+        )
+
+    def handle(self, *args, **options):
+        recounters = {
+            'journals': counters.recount_journals,
+            'volumes': counters.recount_volumes,
+            'issues': counters.recount_issues,
+            'authors': counters.recount_authors,
+        }
+        selected = options['only'] or list(recounters)
+
+        with transaction.atomic():
+            for name in selected:
+                updated = recounters[name]()
+                self.stdout.write(f'Recounted {updated} {name}.')
+
+        self.stdout.write(self.style.SUCCESS('Counters are up to date.'))
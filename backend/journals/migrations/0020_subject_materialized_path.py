@@ -0,0 +1,52 @@
+# Generated by Django 5.2.9 on 2026-10-19 06:31
+
+from django.db import migrations, models
+
+
+PATH_SEGMENT_WIDTH = 6
+
+
+def backfill_subject_paths(apps, schema_editor):
+    Subject = apps.get_model('journals', 'Subject')
+    parents = dict(Subject.objects.values_list('pk', 'parent_id'))
+    computed = {}
+
+    def resolve(pk, seen=()):
+        if pk in computed:
+            return computed[pk]
+        parent_id = parents.get(pk)
+        segment = f'{pk:0{PATH_SEGMENT_WIDTH}d}/'
+        if parent_id is None or parent_id not in parents or parent_id in seen:
+            result = (segment, 0)
+        else:
+            parent_path, parent_depth = resolve(parent_id, seen + (pk,))
+            result = (parent_path + segment, parent_depth + 1)
+        computed[pk] = result
+        return result
+
+    subjects = []
+    for pk in parents:
+        path, depth = resolve(pk)
+        subjects.append(Subject(pk=pk, path=path, depth=depth))
+    Subject.objects.bulk_update(subjects, ['path', 'depth'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('journals', '0019_indexingplatform_journalindexinglink'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='subject',
+            name='depth',
+            field=models.PositiveSmallIntegerField(default=0, editable=False, help_text='Depth in the subject tree (0 for top-level subjects)'),
+        ),
+        migrations.AddField(
+            model_name='subject',
+            name='path',
+            field=models.CharField(blank=True, db_index=True, editable=False, help_text='Materialized path of ancestor IDs, maintained automatically', max_length=255),
+        ),
+        migrations.RunPython(backfill_subject_paths, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,64 @@
+# Generated by Django 5.2.9 on 2026-10-19 06:34
+
+from django.db import migrations, models
+from django.db.models import F, Func, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+
+
+def _count(queryset):
+    counted = queryset.order_by().annotate(
+        _count=Func(F('pk'), function='COUNT')
+    ).values('_count')
+    return Coalesce(Subquery(counted), 0)
+
+
+def backfill_counters(apps, schema_editor):
+    Journal = apps.get_model('journals', 'Journal')
+    Volume = apps.get_model('volumes', 'Volume')
+    Issue = apps.get_model('issues', 'Issue')
+    Article = apps.get_model('articles', 'Article')
+    ArticleAuthor = apps.get_model('articles', 'ArticleAuthor')
+    Author = apps.get_model('articles', 'Author')
+    public = ['published', 'archive']
+
+    Journal.objects.update(
+        total_volumes=_count(Volume.objects.filter(journal=OuterRef('pk'), is_active=True)),
+        total_articles=_count(Article.objects.filter(journal=OuterRef('pk'), status='published')),
+    )
+    Volume.objects.update(
+        total_issues=_count(Issue.objects.filter(volume=OuterRef('pk'), is_active=True)),
+        total_articles=_count(Article.objects.filter(
+            Q(issue__volume=OuterRef('pk')) | Q(volume=OuterRef('pk')),
+            status__in=public
+        )),
+    )
+    Issue.objects.update(
+        total_articles=_count(Article.objects.filter(issue=OuterRef('pk'), status__in=public)),
+    )
+    Author.objects.update(
+        article_count=_count(ArticleAuthor.objects.filter(author=OuterRef('pk'))),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('journals', '0020_subject_materialized_path'),
+        ('volumes', '0003_denormalized_counters'),
+        ('issues', '0002_denormalized_counters'),
+        ('articles', '0012_denormalized_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='journal',
+            name='total_articles',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Number of published articles attached directly to this journal (maintained automatically)'),
+        ),
+        migrations.AddField(
+            model_name='journal',
+            name='total_volumes',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Number of active volumes (maintained automatically)'),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
@@ -6,15 +6,55 @@ URL pattern: /{journal_slug}/...
 """
 
 from django.db import models
+from django.db.models import F, Func, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Concat, Substr
 from django.utils.text import slugify
 
+from backend.counterfields import CounterFieldsMixin
+from backend.querycache import CachedManager, CachedQuerySet
+
+
+class SubjectQuerySet(CachedQuerySet):
+    """QuerySet helpers for the subject tree."""
+    
+    def with_journal_counts(self):
+        """
+        Annotate each subject with its number of active journals, counting
+        journals filed under any subject in its subtree once - the same
+        journals the subject's journal listing shows.
+        
+        A correlated subquery rather than a join, so the count stays right
+        when the queryset is later filtered on ``journals`` (as
+        ``prefetch_related('subjects')`` does).
+        """
+        links = self.model.journals.through.objects.filter(
+            subject__path__startswith=OuterRef('path'),
+            journal__is_active=True
+        ).order_by().annotate(
+            count=Func(F('journal_id'), function='COUNT', template='%(function)s(DISTINCT %(expressions)s)')
+        ).values('count')
+        return self.annotate(active_journal_count=Coalesce(Subquery(links), 0))
+    
+    def descendants_of(self, subject, include_self=True):
+        """Subjects in the subtree rooted at ``subject`` (a prefix match on path)."""
+        queryset = self.filter(path__startswith=subject.path)
+        if not include_self:
+            queryset = queryset.exclude(pk=subject.pk)
+        return queryset
+
 
 class Subject(models.Model):
     """
     Academic subject/category for organizing journals.
     Supports hierarchical structure with parent-child relationships.
+    
+    Each subject also stores a materialized path of its ancestors' IDs
+    (e.g. "000001/000004/") so a whole subtree can be selected with a single
+    indexed prefix lookup instead of walking parent links.
     """
     
+    PATH_SEGMENT_WIDTH = 6
+    
     name = models.CharField(
         max_length=200,
         help_text='Subject name (e.g., "Molecular Biology")'
@@ -36,6 +76,18 @@ class Subject(models.Model):
         related_name='children',
         help_text='Parent subject for hierarchical organization'
     )
+    path = models.CharField(
+        max_length=255,
+        blank=True,
+        db_index=True,
+        editable=False,
+        help_text='Materialized path of ancestor IDs, maintained automatically'
+    )
+    depth = models.PositiveSmallIntegerField(
+        default=0,
+        editable=False,
+        help_text='Depth in the subject tree (0 for top-level subjects)'
+    )
     
     is_active = models.BooleanField(default=True)
     display_order = models.PositiveIntegerField(
@@ -46,6 +98,8 @@ class Subject(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = CachedManager.from_queryset(SubjectQuerySet)()
+    
     class Meta:
         verbose_name = 'subject'
         verbose_name_plural = 'subjects'
@@ -60,9 +114,89 @@ class Subject(models.Model):
         if not self.slug:
             self.slug = slugify(self.name)
         super().save(*args, **kwargs)
-
-
-class Journal(models.Model):
+        self._update_path()
+    
+    @classmethod
+    def path_segment(cls, pk):
+        return f'{pk:0{cls.PATH_SEGMENT_WIDTH}d}/'
+    
+    def _update_path(self):
+        """Recompute this subject's path and re-prefix its descendants if it moved."""
+        parent_path = ''
+        parent_depth = -1
+        if self.parent_id:
+            parent_path, parent_depth = Subject.objects.filter(
+                pk=self.parent_id
+            ).values_list('path', 'depth').get()
+        
+        new_path = parent_path + self.path_segment(self.pk)
+        new_depth = parent_depth + 1
+        if new_path == self.path and new_depth == self.depth:
+            return
+        
+        old_path, old_depth = self.path, self.depth
+        if old_path:
+            # Moves the node itself and every descendant in one UPDATE
+            Subject.objects.filter(path__startswith=old_path).update(
+                path=Concat(Value(new_path), Substr('path', len(old_path) + 1)),
+                depth=F('depth') + (new_depth - old_depth),
+            )
+        else:
+            Subject.objects.filter(pk=self.pk).update(path=new_path, depth=new_depth)
+        self.path, self.depth = new_path, new_depth
+    
+    def is_descendant_of(self, other):
+        return bool(other.path) and self.path.startswith(other.path)
+    
+    @classmethod
+    def rebuild_paths(cls):
+        """Recompute every path from parent links (used after deletes and in migrations)."""
+        rows = list(cls.objects.values_list('pk', 'parent_id', 'path', 'depth'))
+        parents = {pk: parent_id for pk, parent_id, _, _ in rows}
+        computed = {}
+        
+        def resolve(pk, seen=()):
+            if pk in computed:
+                return computed[pk]
+            parent_id = parents.get(pk)
+            if parent_id is None or parent_id not in parents or parent_id in seen:
+                result = (cls.path_segment(pk), 0)
+            else:
+                parent_path, parent_depth = resolve(parent_id, seen + (pk,))
+                result = (parent_path + cls.path_segment(pk), parent_depth + 1)
+            computed[pk] = result
+            return result
+        
+        changed = []
+        for pk, _, path, depth in rows:
+            new_path, new_depth = resolve(pk)
+            if (new_path, new_depth) != (path, depth):
+                changed.append(cls(pk=pk, path=new_path, depth=new_depth))
+        cls.objects.bulk_update(changed, ['path', 'depth'], batch_size=500)
+        return len(changed)
+    
+    @staticmethod
+    def build_tree(subjects):
+        """
+        Link an already-fetched list of subjects into a tree.
+        
+        Sets ``tree_children`` on every node (keeping the input order) and
+        returns the roots - nodes whose parent isn't part of the list.
+        """
+        by_id = {subject.pk: subject for subject in subjects}
+        roots = []
+        for subject in subjects:
+            subject.tree_children = []
+        for subject in subjects:
+            parent = by_id.get(subject.parent_id)
+            if parent is None:
+                roots.append(subject)
+            else:
+                parent.tree_children.append(subject)
+        return roots
+
+
+class Journal(CounterFieldsMixin, models.Model):
     """
     Academic journal - the primary content container.
     
@@ -274,6 +408,19 @@ class Journal(models.Model):
         help_text='SEO keywords (comma-separated)'
     )
     
+    # Denormalized counters, kept up to date by journals/counters.py
+    total_volumes = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        help_text='Number of active volumes (maintained automatically)'
+    )
+    total_articles = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        help_text='Number of published articles attached directly to this journal (maintained automatically)'
+    )
+    COUNTER_FIELDS = ('total_volumes', 'total_articles')
+    
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -302,16 +449,6 @@ class Journal(models.Model):
             is_active=True,
             is_current=True
         ).first()
-    
-    @property
-    def total_volumes(self):
-        """Count of volumes in this journal."""
-        return self.volumes.filter(is_active=True).count()
-    
-    @property
-    def total_articles(self):
-        """Count of published articles in this journal."""
-        return self.articles_direct.filter(status='published').count()
 
 
 class CorporateAffiliation(models.Model):
@@ -344,6 +481,8 @@ class CorporateAffiliation(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = CachedManager()
+    
     class Meta:
         verbose_name = 'corporate affiliation'
         verbose_name_plural = 'corporate affiliations'
@@ -517,6 +656,8 @@ class CTACard(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = CachedManager()
+    
     class Meta:
         verbose_name = 'CTA card'
         verbose_name_plural = 'CTA cards'
@@ -589,6 +730,8 @@ class CTAButton(models.Model):
     notification_email = models.EmailField(help_text="Form submissions will be sent to this email")
     is_active = models.BooleanField(default=True)
     
+    objects = CachedManager()
+    
     class Meta:
         verbose_name = "CTA Button"
         verbose_name_plural = "CTA Buttons"
@@ -656,6 +799,8 @@ class FAQ(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = CachedManager()
+    
     class Meta:
         verbose_name = "FAQ"
         verbose_name_plural = "FAQs"
@@ -676,6 +821,8 @@ class IndexingPlatform(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = CachedManager()
+    
     class Meta:
         verbose_name = "indexing platform"
         verbose_name_plural = "indexing platforms"
@@ -0,0 +1,143 @@
+"""
+Cached resolution of public URL paths to primary keys.
+
+Article pages are addressed by (journal slug, article slug), volumes and
+issues by (journal slug, number). Resolving those takes a query over the
+journal/volume/issue hierarchy on every request. The resolvers here
+remember the primary key each path resolves to in the tagged cache
+(backend/caching.py), so views only fetch the object by primary key.
+With the two-tier cache backend the hottest paths are held in worker
+memory as well.
+
+Entries carry the tag of the journal they were resolved in. Every change
+that can move a path - a journal, volume, issue or article slug, number,
+placement, status or activation - purges it (journals/signals.py). Paths
+that don't resolve are not cached, so new content is found immediately.
+Views fetch through the ``*_or_404`` helpers, which check the path again
+on the fetched row.
+
+An article belongs to the journal ``Article.get_journal`` returns (its own
+journal, else its issue's volume's journal, else its volume's journal).
+Lookups find it by its indexed slug and compare that owner, rather than
+OR-joining the three placements.
+"""
+
+from django.db.models.functions import Coalesce
+from django.http import Http404
+from django.shortcuts import get_object_or_404
+
+from articles.models import Article
+from backend import caching
+from issues.models import Issue
+from volumes.models import Volume
+
+from .models import Journal
+
+
+RESOLVER_TIMEOUT = 60 * 60 * 24
+PUBLIC_ARTICLE_STATUSES = ['published', 'archive']
+ARTICLE_OWNER_PATHS = ['journal', 'issue__volume__journal', 'volume__journal']
+
+
+def _resolve(kind, journal_slug, path, lookup, active_journal=False):
+    """
+    Primary key for ``path`` within the journal ``journal_slug``, cached.
+
+    ``lookup(journal_id)`` finds it in the database (or returns None).
+    """
+    key = f'resolve:{kind}:{journal_slug}:{path}'
+    pk = caching.get_entry(key)
+    if pk is not None:
+        return pk
+
+    journals = Journal.objects.filter(slug=journal_slug)
+    if active_journal:
+        journals = journals.filter(is_active=True)
+    journal_id = journals.values_list('pk', flat=True).first()
+    if journal_id is None:
+        return None
+
+    tags = [caching.journal_tag(journal_id)]
+    # Versions taken before the lookup, so a purge meanwhile isn't missed
+    versions = caching.tag_versions(tags)
+    pk = lookup(journal_id)
+    if pk is not None:
+        caching.set_entry(key, pk, tags, RESOLVER_TIMEOUT, versions=versions)
+    return pk
+
+
+def resolve_article(journal_slug, article_slug):
+    """Primary key of the public article ``article_slug`` in ``journal_slug``, or None."""
+    def lookup(journal_id):
+        return Article.objects.filter(
+            slug=article_slug,
+            status__in=PUBLIC_ARTICLE_STATUSES
+        ).annotate(
+            owner_id=Coalesce('journal_id', 'issue__volume__journal_id', 'volume__journal_id')
+        ).filter(owner_id=journal_id).order_by('pk').values_list('pk', flat=True).first()
+
+    return _resolve('article', journal_slug, article_slug, lookup)
+
+
+def resolve_volume(journal_slug, volume_number):
+    """Primary key of active volume ``volume_number`` of the active journal, or None."""
+    def lookup(journal_id):
+        return Volume.objects.filter(
+            journal_id=journal_id,
+            volume_number=volume_number,
+            is_active=True
+        ).values_list('pk', flat=True).first()
+
+    return _resolve('volume', journal_slug, volume_number, lookup, active_journal=True)
+
+
+def resolve_issue(journal_slug, issue_number):
+    """
+    Primary key of the most recent active issue numbered ``issue_number``
+    in the active journal, or None.
+    """
+    def lookup(journal_id):
+        return Issue.objects.filter(
+            volume__journal_id=journal_id,
+            issue_number=issue_number,
+            is_active=True
+        ).order_by('-volume__year', '-volume__volume_number').values_list('pk', flat=True).first()
+
+    return _resolve('issue', journal_slug, issue_number, lookup, active_journal=True)
+
+
+def article_or_404(queryset, journal_slug, article_slug):
+    """
+    The public article at ``journal_slug``/``article_slug`` from ``queryset``.
+
+    The path is checked again on the fetched row, so an entry that is about
+    to be purged can only produce a 404, never a different article.
+    """
+    pk = resolve_article(journal_slug, article_slug)
+    if pk is None:
+        raise Http404('No article matches the given query.')
+    article = get_object_or_404(
+        queryset.select_related(*ARTICLE_OWNER_PATHS),
+        pk=pk,
+        slug=article_slug,
+        status__in=PUBLIC_ARTICLE_STATUSES
+    )
+    journal = article.get_journal
+    if journal is None or journal.slug != journal_slug:
+        raise Http404('No article matches the given query.')
+    return article
+
+
+def volume_or_404(queryset, journal_slug, volume_number):
+    """The active volume ``volume_number`` of the active journal ``journal_slug``."""
+    pk = resolve_volume(journal_slug, volume_number)
+    if pk is None:
+        raise Http404('No volume matches the given query.')
+    return get_object_or_404(
+        queryset,
+        pk=pk,
+        journal__slug=journal_slug,
+        journal__is_active=True,
+        volume_number=volume_number,
+        is_active=True
+    )
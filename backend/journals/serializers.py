@@ -1,7 +1,13 @@
 """Serializers for journals app."""
 
 import logging
+from collections import defaultdict
+
 from rest_framework import serializers
+
+from backend.caching import journal_tag, JOURNALS_TAG
+from backend.fastpath import ValuesSerializer
+from backend.fragments import FragmentCacheMixin, FragmentListSerializer
 from .models import (
     Subject, Journal, Announcement, CorporateAffiliation, 
     EditorialBoardMember, CTACard, JournalIndexing, 
@@ -156,6 +162,14 @@ class CTACardCreateUpdateSerializer(serializers.ModelSerializer):
         read_only_fields = ['id']
 
 
+def _subject_journal_count(subject):
+    """Active journal count, using the with_journal_counts() annotation when present."""
+    count = getattr(subject, 'active_journal_count', None)
+    if count is None:
+        count = subject.journals.filter(is_active=True).count()
+    return count
+
+
 class SubjectSerializer(serializers.ModelSerializer):
     """Serializer for Subject model."""
     
@@ -182,13 +196,22 @@ class SubjectSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at', 'updated_at']
     
     def get_journal_count(self, obj):
-        return obj.journals.filter(is_active=True).count()
+        return _subject_journal_count(obj)
     
     def get_children(self, obj):
-        children = obj.children.filter(is_active=True)
-        if children.exists():
-            return SubjectListSerializer(children, many=True).data
-        return []
+        # Views that load the whole tree up front attach tree_children
+        children = getattr(obj, 'tree_children', None)
+        if children is None:
+            children = obj.children.filter(is_active=True).with_journal_counts()
+        return SubjectListSerializer(children, many=True).data
+    
+    def validate_parent(self, value):
+        if value and self.instance and self.instance.pk:
+            if value.pk == self.instance.pk or value.is_descendant_of(self.instance):
+                raise serializers.ValidationError(
+                    'A subject cannot be moved under itself or one of its descendants.'
+                )
+        return value
 
 
 class SubjectListSerializer(serializers.ModelSerializer):
@@ -201,11 +224,11 @@ class SubjectListSerializer(serializers.ModelSerializer):
         fields = ['id', 'name', 'slug', 'journal_count']
     
     def get_journal_count(self, obj):
-        return obj.journals.filter(is_active=True).count()
+        return _subject_journal_count(obj)
 
 
-class JournalListSerializer(serializers.ModelSerializer):
-    """Serializer for journal listings (lightweight)."""
+class JournalListSerializer(FragmentCacheMixin, serializers.ModelSerializer):
+    """Serializer for journal listings (lightweight, cached per journal, see backend/fragments.py)."""
     
     subjects = SubjectListSerializer(many=True, read_only=True)
     total_volumes = serializers.IntegerField(read_only=True)
@@ -226,6 +249,14 @@ class JournalListSerializer(serializers.ModelSerializer):
             'total_volumes', 'total_articles',
             'submission_url', 'login_url'
         ]
+        list_serializer_class = FragmentListSerializer
+
+    live_fields = ('total_volumes', 'total_articles')
+
+    def fragment_tags(self, instance):
+        # Subject edits and journal (de)activations, which change the
+        # embedded subject counts, purge JOURNALS_TAG
+        return [journal_tag(instance.pk), JOURNALS_TAG]
 
     def _get_absolute_url(self, field):
         if field:
@@ -248,6 +279,67 @@ class JournalListSerializer(serializers.ModelSerializer):
         return self._get_absolute_url(obj.logo)
 
 
+class JournalListValuesSerializer(ValuesSerializer):
+    """JournalListSerializer output built from ``.values()`` rows (see backend/fastpath.py)."""
+    
+    model = Journal
+    values = (
+        'id', 'title', 'slug', 'short_title', 'short_description',
+        'issn_print', 'issn_online',
+        'cover_image', 'banner_image', 'logo', 'primary_color',
+        'editor_in_chief', 'editor_in_chief_image',
+        'is_featured', 'is_active',
+        'total_volumes', 'total_articles',
+        'submission_url', 'login_url',
+    )
+    
+    def prepare(self, rows):
+        """Subjects of every journal on the page, in two queries."""
+        links = Journal.subjects.through.objects.filter(
+            journal_id__in=[row['id'] for row in rows]
+        ).values_list('journal_id', 'subject_id')
+        subject_ids = defaultdict(set)
+        for journal_id, subject_id in links:
+            subject_ids[journal_id].add(subject_id)
+        
+        # Listed in Subject's default ordering, like the prefetched relation
+        subjects = {
+            subject_id: {'id': subject_id, 'name': name, 'slug': slug, 'journal_count': journal_count}
+            for subject_id, name, slug, journal_count in Subject.objects.filter(
+                pk__in={pk for ids in subject_ids.values() for pk in ids}
+            ).with_journal_counts().values_list('id', 'name', 'slug', 'active_journal_count')
+        }
+        position = {subject_id: index for index, subject_id in enumerate(subjects)}
+        self.subjects = {
+            journal_id: [subjects[pk] for pk in sorted(ids, key=position.__getitem__)]
+            for journal_id, ids in subject_ids.items()
+        }
+    
+    def to_representation(self, row):
+        return {
+            'id': row['id'],
+            'title': row['title'],
+            'slug': row['slug'],
+            'short_title': row['short_title'],
+            'short_description': row['short_description'],
+            'issn_print': row['issn_print'],
+            'issn_online': row['issn_online'],
+            'cover_image': self.file_url(row['cover_image'], 'cover_image'),
+            'banner_image': self.file_url(row['banner_image'], 'banner_image'),
+            'logo': self.file_url(row['logo'], 'logo'),
+            'primary_color': row['primary_color'],
+            'editor_in_chief': row['editor_in_chief'],
+            'editor_in_chief_image': self.file_url(row['editor_in_chief_image'], 'editor_in_chief_image'),
+            'is_featured': row['is_featured'],
+            'is_active': row['is_active'],
+            'subjects': self.subjects.get(row['id'], []),
+            'total_volumes': row['total_volumes'],
+            'total_articles': row['total_articles'],
+            'submission_url': row['submission_url'],
+            'login_url': row['login_url'],
+        }
+
+
 class JournalDetailSerializer(serializers.ModelSerializer):
     """Full serializer for journal detail view."""
     
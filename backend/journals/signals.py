@@ -0,0 +1,295 @@
+"""
+Signal handlers for the journals app.
+
+Purges the cache tags (backend/caching.py) of every journal, article and
+listing a change affects, which keeps the journal page bundle and the cached
+journal listings in sync. Invalidation is deferred until the surrounding
+transaction commits so a concurrent reader can't re-cache stale rows.
+
+Also keeps Subject materialized paths consistent when a subject is deleted
+and its children are detached by the database (on_delete=SET_NULL), and
+recounts the denormalized counters (journals/counters.py) of every container
+an edit touches. Recounts run inside the writer's transaction so the counters
+commit or roll back together with the change that caused them.
+"""
+
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete, pre_delete, pre_save, m2m_changed
+from django.dispatch import receiver
+
+from articles.models import (
+    Article, ArticleAuthor, ArticleFile, ArticleHTMLContent, Author, Figure, Table,
+)
+from issues.models import Issue
+from volumes.models import Volume
+
+from backend import caching
+
+from . import counters
+from .models import Subject, Journal, EditorialBoardMember, JournalIndexing, FAQ
+
+
+def _purge_on_commit(*tags):
+    tags = [tag for tag in tags if tag]
+    if tags:
+        transaction.on_commit(lambda: caching.invalidate_tags(*tags))
+
+
+def _invalidate_on_commit(*journal_ids):
+    _purge_on_commit(*[
+        caching.journal_tag(journal_id) for journal_id in journal_ids if journal_id
+    ])
+
+
+def _journal_ids_for_volume(volume_id):
+    if not volume_id:
+        return []
+    return list(Volume.objects.filter(pk=volume_id).values_list('journal_id', flat=True))
+
+
+def _journal_ids_for_issue(issue_id):
+    if not issue_id:
+        return []
+    return list(Issue.objects.filter(pk=issue_id).values_list('volume__journal_id', flat=True))
+
+
+def _journal_ids_for_article(article):
+    """Every journal an article is attached to (directly, via volume or via issue)."""
+    return [
+        article.journal_id,
+        *_journal_ids_for_volume(article.volume_id),
+        *_journal_ids_for_issue(article.issue_id),
+    ]
+
+
+# =============================================================================
+# Journal and journal-owned content
+# =============================================================================
+
+@receiver(pre_save, sender=Journal)
+def journal_capture(sender, instance, **kwargs):
+    _capture_previous(instance, 'is_active', 'is_featured')
+
+
+@receiver([post_save, post_delete], sender=Journal)
+def journal_changed(sender, instance, **kwargs):
+    # Any field can move a journal in or out of a filtered/searched listing
+    _invalidate_on_commit(instance.pk)
+    _purge_on_commit(caching.JOURNALS_TAG)
+    
+    previous = getattr(instance, '_previous_state', None)
+    if previous is None or previous != (instance.is_active, instance.is_featured):
+        # Created, deleted, or featured/activated: homepage membership changed
+        if instance.is_featured or (previous and previous[1]):
+            _purge_on_commit(caching.HOMEPAGE_TAG)
+
+
+@receiver([post_save, post_delete], sender=EditorialBoardMember)
+@receiver([post_save, post_delete], sender=JournalIndexing)
+@receiver([post_save, post_delete], sender=FAQ)
+def journal_content_changed(sender, instance, **kwargs):
+    _invalidate_on_commit(instance.journal_id)
+
+
+@receiver(m2m_changed, sender=Journal.subjects.through)
+def journal_subjects_changed(sender, instance, action, pk_set, **kwargs):
+    if not action.startswith('post_'):
+        return
+    if isinstance(instance, Journal):
+        _invalidate_on_commit(instance.pk)
+    else:
+        # Changed from the Subject side: instance is a Subject
+        journal_ids = pk_set or instance.journals.values_list('id', flat=True)
+        _invalidate_on_commit(*journal_ids)
+    _purge_on_commit(caching.JOURNALS_TAG)
+
+
+@receiver(post_save, sender=Subject)
+def subject_saved(sender, instance, **kwargs):
+    # Journal listings embed subjects and filter on the subject tree
+    _purge_on_commit(caching.JOURNALS_TAG)
+    # So do cached article details, through their journal
+    _invalidate_on_commit(*instance.journals.values_list('id', flat=True))
+
+
+@receiver(pre_delete, sender=Subject)
+def subject_deleting(sender, instance, **kwargs):
+    # The journal links are gone by post_delete, and m2m_changed isn't sent
+    _invalidate_on_commit(*instance.journals.values_list('id', flat=True))
+
+
+@receiver(post_delete, sender=Subject)
+def subject_deleted(sender, instance, **kwargs):
+    # Children were re-parented to NULL by SET_NULL without save() running
+    transaction.on_commit(Subject.rebuild_paths)
+    _purge_on_commit(caching.JOURNALS_TAG)
+
+
+# =============================================================================
+# Volumes, issues and articles
+# =============================================================================
+
+@receiver([post_save, post_delete], sender=Volume)
+def volume_changed(sender, instance, **kwargs):
+    # Moving a volume to another journal must invalidate the old one too
+    # (the previous state is captured by volume_capture)
+    previous = getattr(instance, '_previous_state', None) or (None, None)
+    _invalidate_on_commit(instance.journal_id, previous[0])
+
+
+@receiver([post_save, post_delete], sender=Issue)
+def issue_changed(sender, instance, **kwargs):
+    journal_ids = set(_journal_ids_for_volume(instance.volume_id))
+    # (volume_id, is_active) before the save, captured by issue_capture
+    previous = getattr(instance, '_previous_state', None) or (None, None)
+    if previous[0] != instance.volume_id:
+        journal_ids.update(_journal_ids_for_volume(previous[0]))
+    _invalidate_on_commit(*journal_ids)
+
+
+@receiver(pre_save, sender=Article)
+def article_moving(sender, instance, **kwargs):
+    # Moving an article between journals must invalidate the old one too
+    instance._previous_state = None
+    instance._was_featured = False
+    if instance.pk:
+        previous = Article.objects.filter(pk=instance.pk).only(
+            'journal_id', 'volume_id', 'issue_id', 'status', 'is_featured'
+        ).first()
+        if previous:
+            instance._previous_state = _article_state(previous)
+            instance._was_featured = previous.is_featured
+            _invalidate_on_commit(*_journal_ids_for_article(previous))
+
+
+@receiver([post_save, post_delete], sender=Article)
+def article_changed(sender, instance, **kwargs):
+    _invalidate_on_commit(*_journal_ids_for_article(instance))
+    _purge_on_commit(caching.article_tag(instance.pk))
+    if instance.is_featured or getattr(instance, '_was_featured', False):
+        _purge_on_commit(caching.HOMEPAGE_TAG)
+
+
+@receiver([post_save, post_delete], sender=ArticleAuthor)
+def article_author_changed(sender, instance, **kwargs):
+    article = Article.objects.filter(pk=instance.article_id).only(
+        'journal_id', 'volume_id', 'issue_id'
+    ).first()
+    if article:
+        _invalidate_on_commit(*_journal_ids_for_article(article))
+        _purge_on_commit(caching.article_tag(article.pk))
+
+
+@receiver([post_save, post_delete], sender=ArticleHTMLContent)
+@receiver([post_save, post_delete], sender=ArticleFile)
+@receiver([post_save, post_delete], sender=Figure)
+@receiver([post_save, post_delete], sender=Table)
+def article_content_changed(sender, instance, **kwargs):
+    # Embedded in the cached article detail (backend/fragments.py)
+    _purge_on_commit(caching.article_tag(instance.article_id))
+
+
+@receiver(post_save, sender=Author)
+def author_changed(sender, instance, created, **kwargs):
+    if created:
+        return
+    # Author names are embedded in every article listing they appear in
+    rows = Article.objects.filter(article_authors__author=instance).values_list(
+        'pk', 'journal_id', 'volume__journal_id', 'issue__volume__journal_id'
+    )
+    for article_id, *journal_ids in rows:
+        _invalidate_on_commit(*journal_ids)
+        _purge_on_commit(caching.article_tag(article_id))
+
+
+# =============================================================================
+# Denormalized counters
+# =============================================================================
+
+def _article_state(article):
+    return (article.journal_id, article.volume_id, article.issue_id, article.status)
+
+
+def _capture_previous(instance, *fields):
+    """Remember the stored values of ``fields`` so post_save can tell what changed."""
+    instance._previous_state = None
+    if instance.pk:
+        instance._previous_state = type(instance).objects.filter(
+            pk=instance.pk
+        ).values_list(*fields).first()
+
+
+def _changed(instance, created, current):
+    previous = getattr(instance, '_previous_state', None)
+    return created or previous is None or previous != current
+
+
+@receiver(post_save, sender=Article)
+def article_saved_recount(sender, instance, created, **kwargs):
+    current = _article_state(instance)
+    if not _changed(instance, created, current):
+        return
+    placements = [current[:3]]
+    if instance._previous_state:
+        placements.append(instance._previous_state[:3])
+    with transaction.atomic():
+        counters.recount_for_articles(placements)
+
+
+@receiver(post_delete, sender=Article)
+def article_deleted_recount(sender, instance, **kwargs):
+    with transaction.atomic():
+        counters.recount_for_articles([_article_state(instance)[:3]])
+
+
+@receiver(pre_save, sender=Volume)
+def volume_capture(sender, instance, **kwargs):
+    _capture_previous(instance, 'journal_id', 'is_active')
+
+
+@receiver(post_save, sender=Volume)
+def volume_saved_recount(sender, instance, created, **kwargs):
+    if _changed(instance, created, (instance.journal_id, instance.is_active)):
+        previous = instance._previous_state or (None, None)
+        counters.recount_journals({instance.journal_id, previous[0]})
+
+
+@receiver(post_delete, sender=Volume)
+def volume_deleted_recount(sender, instance, **kwargs):
+    counters.recount_journals({instance.journal_id})
+
+
+@receiver(pre_save, sender=Issue)
+def issue_capture(sender, instance, **kwargs):
+    _capture_previous(instance, 'volume_id', 'is_active')
+
+
+@receiver(post_save, sender=Issue)
+def issue_saved_recount(sender, instance, created, **kwargs):
+    if _changed(instance, created, (instance.volume_id, instance.is_active)):
+        previous = instance._previous_state or (None, None)
+        counters.recount_volumes({instance.volume_id, previous[0]})
+
+
+@receiver(post_delete, sender=Issue)
+def issue_deleted_recount(sender, instance, **kwargs):
+    # Articles in the issue were detached (SET_NULL), so the volume's
+    # article count changes as well as its issue count
+    counters.recount_volumes({instance.volume_id})
+
+
+@receiver(pre_save, sender=ArticleAuthor)
+def article_author_capture(sender, instance, **kwargs):
+    _capture_previous(instance, 'author_id')
+
+
+@receiver(post_save, sender=ArticleAuthor)
+def article_author_saved_recount(sender, instance, created, **kwargs):
+    if _changed(instance, created, (instance.author_id,)):
+        previous = instance._previous_state or (None,)
+        counters.recount_authors({instance.author_id, previous[0]})
+
+
+@receiver(post_delete, sender=ArticleAuthor)
+def article_author_deleted_recount(sender, instance, **kwargs):
+    counters.recount_authors({instance.author_id})
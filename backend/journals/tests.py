@@ -1,3 +1,704 @@
-from django.test import TestCase
+import json
+import time
+from datetime import date
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache, caches
+from django.http import StreamingHttpResponse
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.tokens import AccessToken
+
+from articles.models import Article, ArticleAuthor, Author
+from backend import cache_backends, caching
+from issues.models import Issue
+from volumes.models import Volume
+
+from .models import FAQ, Announcement, CTAButton, CTACard, IndexingPlatform, Journal, Subject
+from .resolvers import resolve_article, resolve_issue, resolve_volume
+from .serializers import IndexingPlatformDetailSerializer, JournalListSerializer, JournalListValuesSerializer
+from .views import IndexingPlatformListView, subjects_prefetch
+
+
+class JournalListValuesSerializerTests(TestCase):
+    """The values-based fast path must render exactly what JournalListSerializer renders."""
+
+    @classmethod
+    def setUpTestData(cls):
+        science = Subject.objects.create(name='Science', slug='science', display_order=1)
+        art = Subject.objects.create(name='Art', slug='art', display_order=2)
+        history = Subject.objects.create(name='History', slug='history', display_order=2)
+
+        first = Journal.objects.create(
+            title='First', slug='first', issn_online='1234-5678',
+            cover_image='journals/covers/first.png', logo='journals/logos/first.png',
+        )
+        second = Journal.objects.create(title='Second', slug='second', is_featured=True)
+        inactive = Journal.objects.create(title='Inactive', slug='inactive', is_active=False)
+        Journal.objects.create(title='No subjects', slug='no-subjects')
+
+        first.subjects.add(history, science, art)
+        second.subjects.add(science)
+        inactive.subjects.add(science, art)
+
+    def assertSameOutput(self, context):
+        queryset = Journal.objects.prefetch_related(subjects_prefetch()).order_by('pk')
+        expected = JournalListSerializer(queryset, many=True, context=context).data
+        fast = JournalListValuesSerializer(context)
+        actual = fast.serialize(fast.values_queryset(queryset))
+        self.assertEqual(JSONRenderer().render(actual), JSONRenderer().render(expected))
+
+    def test_same_output(self):
+        self.assertSameOutput({'request': Request(APIRequestFactory().get('/api/v1/journals/'))})
+
+    def test_same_output_without_request(self):
+        self.assertSameOutput({})
+
+    def test_subject_counts_only_active_journals(self):
+        fast = JournalListValuesSerializer()
+        data = fast.serialize(fast.values_queryset(Journal.objects.filter(slug='first')))
+        counts = {subject['slug']: subject['journal_count'] for subject in data[0]['subjects']}
+        self.assertEqual(counts, {'science': 2, 'art': 1, 'history': 1})
+
+
+class SubjectTreeTests(TestCase):
+    """Materialized subject paths, subtree lookups and the tree endpoint."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.science = Subject.objects.create(name='Science', slug='science', display_order=1)
+        cls.art = Subject.objects.create(name='Art', slug='art', display_order=2)
+        cls.physics = Subject.objects.create(name='Physics', slug='physics', parent=cls.science)
+        cls.optics = Subject.objects.create(name='Optics', slug='optics', parent=cls.physics)
+
+        Journal.objects.create(title='Lenses', slug='lenses').subjects.add(cls.optics)
+        Journal.objects.create(title='Waves', slug='waves').subjects.add(cls.physics, cls.optics)
+        Journal.objects.create(title='Nature', slug='nature').subjects.add(cls.science)
+        Journal.objects.create(title='Closed', slug='closed', is_active=False).subjects.add(cls.optics)
+
+    def setUp(self):
+        cache.clear()
+
+    def counts(self):
+        return dict(Subject.objects.with_journal_counts().values_list('slug', 'active_journal_count'))
+
+    def journal_slugs(self, subject):
+        response = self.client.get(f'/api/v1/journals/subjects/{subject}/journals/')
+        return sorted(journal['slug'] for journal in response.json()['results'])
+
+    def test_descendants(self):
+        self.assertEqual(
+            set(Subject.objects.descendants_of(self.science).values_list('slug', flat=True)),
+            {'science', 'physics', 'optics'}
+        )
+        self.assertEqual(
+            set(Subject.objects.descendants_of(self.physics, include_self=False).values_list('slug', flat=True)),
+            {'optics'}
+        )
+        self.assertTrue(self.optics.is_descendant_of(self.science))
+        self.assertFalse(self.art.is_descendant_of(self.science))
+        self.assertEqual(self.journal_slugs('science'), ['lenses', 'nature', 'waves'])
+        self.assertEqual(self.journal_slugs('physics'), ['lenses', 'waves'])
+
+    def test_counts_roll_up_the_tree(self):
+        self.assertEqual(self.counts(), {'science': 3, 'physics': 2, 'optics': 2, 'art': 0})
+
+    def test_moving_a_subtree(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.physics.parent = self.art
+            self.physics.save()
+        optics = Subject.objects.get(pk=self.optics.pk)
+        expected_path = self.art.path + Subject.path_segment(self.physics.pk) + Subject.path_segment(optics.pk)
+        self.assertEqual(optics.path, expected_path)
+        self.assertEqual(optics.depth, 2)
+        self.assertTrue(optics.is_descendant_of(self.art))
+        self.assertFalse(optics.is_descendant_of(self.science))
+
+        self.assertEqual(self.counts(), {'science': 1, 'physics': 2, 'optics': 2, 'art': 2})
+        self.assertEqual(self.journal_slugs('science'), ['nature'])
+        self.assertEqual(self.journal_slugs('art'), ['lenses', 'waves'])
+
+    def test_tree_endpoint(self):
+        with self.assertNumQueries(1):
+            tree = self.client.get('/api/v1/journals/subjects/tree/').json()
+        self.assertEqual(tree, [
+            {
+                'id': self.science.pk, 'name': 'Science', 'slug': 'science', 'depth': 0, 'journal_count': 3,
+                'children': [{
+                    'id': self.physics.pk, 'name': 'Physics', 'slug': 'physics', 'depth': 1, 'journal_count': 2,
+                    'children': [{
+                        'id': self.optics.pk, 'name': 'Optics', 'slug': 'optics', 'depth': 2, 'journal_count': 2,
+                        'children': [],
+                    }],
+                }],
+            },
+            {'id': self.art.pk, 'name': 'Art', 'slug': 'art', 'depth': 0, 'journal_count': 0, 'children': []},
+        ])
+
+
+class CounterTests(TestCase):
+    """Stored counters (journals/counters.py) survive saves of stale instances."""
+
+    def test_stale_saves_keep_counters(self):
+        journal = Journal.objects.create(title='Counted', slug='counted')
+        stale_journal = Journal.objects.get(pk=journal.pk)
+        volume = Volume.objects.create(journal=journal, volume_number=1, year=2024)
+        stale_volume = Volume.objects.get(pk=volume.pk)
+        issue = Issue.objects.create(volume=volume, issue_number=1)
+        stale_issue = Issue.objects.get(pk=issue.pk)
+        author = Author.objects.create(first_name='Ada', last_name='Lovelace')
+        stale_author = Author.objects.get(pk=author.pk)
+        article = Article.objects.create(title='Counted', slug='counted', issue=issue, status='published')
+        ArticleAuthor.objects.create(article=article, author=author, author_order=1)
+
+        stale_journal.title = 'Renamed'
+        stale_journal.save()
+        stale_volume.title = 'Renamed'
+        stale_volume.save()
+        stale_issue.title = 'Renamed'
+        stale_issue.save()
+        stale_author.affiliation = 'Analytical Engine'
+        stale_author.save()
+
+        journal.refresh_from_db()
+        volume.refresh_from_db()
+        issue.refresh_from_db()
+        author.refresh_from_db()
+        self.assertEqual((journal.title, journal.total_volumes), ('Renamed', 1))
+        self.assertEqual((volume.title, volume.total_issues, volume.total_articles), ('Renamed', 1, 1))
+        self.assertEqual((issue.title, issue.total_articles), ('Renamed', 1))
+        self.assertEqual((author.affiliation, author.article_count), ('Analytical Engine', 1))
+
+    def test_update_fields_skip_counters(self):
+        journal = Journal.objects.create(title='Counted', slug='counted')
+        Volume.objects.create(journal=journal, volume_number=1, year=2024)
+
+        journal.total_volumes = 5
+        journal.title = 'Renamed'
+        journal.save(update_fields=['title', 'total_volumes'])
+
+        journal.refresh_from_db()
+        self.assertEqual((journal.title, journal.total_volumes), ('Renamed', 1))
+
+
+    def test_saving_a_deleted_row_inserts_it_again(self):
+        journal = Journal.objects.create(title='Counted', slug='counted')
+        stale_journal = Journal.objects.get(pk=journal.pk)
+        journal.delete()
+
+        stale_journal.title = 'Restored'
+        stale_journal.save()
+
+        self.assertEqual(Journal.objects.get(pk=stale_journal.pk).title, 'Restored')
+
+
+class TaggedCacheTests(TestCase):
+    """Tag invalidation and cached responses (backend/caching.py)."""
+
+    def setUp(self):
+        cache.clear()
+
+    def test_purged_tags_invalidate_entries(self):
+        caching.set_entry('first', 1, [caching.journal_tag(1), caching.HOMEPAGE_TAG])
+        caching.set_entry('second', 2, [caching.journal_tag(2)])
+        caching.invalidate_tags(caching.journal_tag(1))
+        self.assertIsNone(caching.get_entry('first'))
+        self.assertEqual(caching.get_entry('second'), 2)
+        self.assertEqual(caching.get_entries(['first', 'second']), {'second': 2})
+
+    def test_purge_while_building_is_not_missed(self):
+        tag = caching.journal_tag(1)
+        versions = caching.tag_versions([tag])
+        caching.invalidate_tags(tag)
+        caching.set_entry('built', 'old', [tag], versions=versions)
+        self.assertIsNone(caching.get_entry('built'))
+
+    def test_cached_responses_are_purged_by_tag(self):
+        journal = Journal.objects.create(title='First', slug='first')
+        self.assertEqual(self.client.get('/api/v1/journals/').json()['results'][0]['title'], 'First')
+        with self.assertNumQueries(0):
+            self.client.get('/api/v1/journals/')
+
+        # Writes that bypass the signals aren't seen until a tag is purged
+        Journal.objects.filter(pk=journal.pk).update(title='Renamed')
+        self.assertEqual(self.client.get('/api/v1/journals/').json()['results'][0]['title'], 'First')
+        caching.invalidate_tags(caching.journal_tag(journal.pk))
+        self.assertEqual(self.client.get('/api/v1/journals/').json()['results'][0]['title'], 'Renamed')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Journal.objects.create(title='Second', slug='second')
+        self.assertEqual(self.client.get('/api/v1/journals/').json()['count'], 2)
+
+
+class FetchTests(SimpleTestCase):
+    """Stampede protection in caching.fetch: single-flight rebuilds, stale serving and early expiry."""
+
+    def setUp(self):
+        cache.clear()
+        self.now = 1_000_000.0
+        clock = self.enterContext(mock.patch.object(caching, 'time'))
+        clock.time.side_effect = lambda: self.now
+        clock.monotonic.side_effect = lambda: self.now
+        clock.time_ns.side_effect = time.time_ns
+        self.sleep = clock.sleep
+        self.sleep.side_effect = self.tick
+        # No early expiry unless a test asks for it
+        self.random = self.enterContext(mock.patch.object(caching.random, 'random', return_value=0.0))
+        self.builds = []
+
+    def tick(self, seconds):
+        self.now += seconds
+
+    def builder(self, value):
+        def build():
+            self.builds.append(value)
+            self.now += 2  # building takes two seconds
+            return value
+        return build
+
+    def fetch(self, value, **kwargs):
+        return caching.fetch('key', self.builder(value), tags=['tag'], timeout=60, **kwargs)
+
+    def hold_lock(self):
+        self.assertTrue(cache.add(caching.LOCK_KEY_PREFIX + 'key', 1))
+
+    def test_fresh_entries_are_served_from_cache(self):
+        self.assertEqual(self.fetch('first'), 'first')
+        self.now += 30
+        self.assertEqual(self.fetch('second'), 'first')
+        self.assertEqual(self.builds, ['first'])
+        self.assertIsNone(cache.get(caching.LOCK_KEY_PREFIX + 'key'))
+
+    def test_stale_entry_is_served_while_another_request_rebuilds(self):
+        self.fetch('first')
+        self.now += 90
+        self.hold_lock()
+        self.assertEqual(self.fetch('second'), 'first')
+        self.assertEqual(self.builds, ['first'])
+
+        cache.delete(caching.LOCK_KEY_PREFIX + 'key')
+        self.assertEqual(self.fetch('second'), 'second')
+        self.assertEqual(self.fetch('third'), 'second')
+
+    def test_purged_entry_is_stale(self):
+        self.fetch('first')
+        caching.invalidate_tags('tag')
+        self.hold_lock()
+        self.assertEqual(self.fetch('second'), 'first')
+        cache.delete(caching.LOCK_KEY_PREFIX + 'key')
+        self.assertEqual(self.fetch('second'), 'second')
+
+    def test_cold_miss_waits_for_the_rebuild_in_progress(self):
+        self.hold_lock()
+
+        def rebuilt_elsewhere(seconds):
+            self.tick(seconds)
+            if self.sleep.call_count == 3:
+                cache.set(caching.ENTRY_KEY_PREFIX + 'key', {'tags': {}, 'value': 'other'})
+
+        self.sleep.side_effect = rebuilt_elsewhere
+        self.assertEqual(self.fetch('mine'), 'other')
+        self.assertEqual(self.builds, [])
+
+    def test_cold_miss_builds_after_waiting_too_long(self):
+        self.hold_lock()
+        self.assertEqual(self.fetch('mine'), 'mine')
+        self.assertGreaterEqual(self.now, 1_000_000.0 + caching.LOCK_WAIT)
+        # It didn't hold the lock, so it leaves it alone
+        self.assertIsNotNone(cache.get(caching.LOCK_KEY_PREFIX + 'key'))
+
+    def test_early_expiry(self):
+        self.fetch('first')  # took 2 seconds to build, expires 60 seconds later
+        self.now += 50
+        # -2 * log(1 - 0.9) = 4.6 seconds early: still fresh
+        self.random.return_value = 0.9
+        self.assertEqual(self.fetch('second'), 'first')
+        # -2 * log(1 - 0.999999) = 27.6 seconds early: refreshed ahead of expiry
+        self.random.return_value = 0.999999
+        self.assertEqual(self.fetch('second'), 'second')
+        self.assertEqual(self.builds, ['first', 'second'])
+
+
+class CachedQuerySetTests(TransactionTestCase):
+    """Results of CachedManager querysets (backend/querycache.py)."""
+
+    def setUp(self):
+        cache.clear()
+        for slug, label in CTAButton.SLUG_CHOICES[:3]:
+            CTAButton.objects.create(slug=slug, label=label, notification_email='cta@example.com')
+
+    def active_labels(self):
+        return list(CTAButton.objects.filter(is_active=True).values_list('label', flat=True))
+
+    def test_repeated_queries_are_served_from_cache(self):
+        expected = self.active_labels()
+        buttons = list(CTAButton.objects.filter(is_active=True))
+        with self.assertNumQueries(0):
+            self.assertEqual(self.active_labels(), expected)
+            self.assertEqual(list(CTAButton.objects.filter(is_active=True)), buttons)
+        # A different query is cached separately
+        with self.assertNumQueries(1):
+            CTAButton.objects.filter(is_active=False).first()
+
+    def test_writes_invalidate(self):
+        self.active_labels()
+        button = CTAButton.objects.first()
+        button.label = 'Renamed'
+        button.save()
+        self.assertIn('Renamed', self.active_labels())
+
+        CTAButton.objects.filter(pk=button.pk).update(is_active=False)
+        self.assertNotIn('Renamed', self.active_labels())
+
+        CTAButton.objects.all().delete()
+        self.assertEqual(self.active_labels(), [])
+
+    def test_queries_on_other_tables_are_not_cached(self):
+        Subject.objects.create(name='Science', slug='science')
+        with self.assertNumQueries(1):
+            list(Subject.objects.all())
+        with self.assertNumQueries(0):
+            list(Subject.objects.all())
+        with self.assertNumQueries(2):
+            list(Subject.objects.with_journal_counts())
+            list(Subject.objects.with_journal_counts())
+
+
+@override_settings(CACHES={
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'default'},
+    'shared': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'two-tier'},
+})
+class TwoTierCacheTests(SimpleTestCase):
+    """In-process LRU tier and cross-worker invalidation (backend/cache_backends.py)."""
+
+    def setUp(self):
+        self.shared = caches['shared']
+        self.shared.clear()
+        # Two workers sharing one backend
+        self.first, self.second = [
+            cache_backends.TwoTierCache(None, {'OPTIONS': {
+                'SHARED': 'shared', 'LOCAL_KEY_PREFIXES': ['tag:'], 'SYNC_INTERVAL': 0,
+            }})
+            for _ in range(2)
+        ]
+        # Start the stamp log so the workers follow it from here
+        self.second.set('tag:start', 0)
+        self.first.get('tag:start')
+
+    def test_local_hits(self):
+        self.shared.set('tag:a', 1)
+        self.shared.set('other', 1)
+        self.assertEqual(self.first.get('tag:a'), 1)
+        self.assertEqual(self.first.get('other'), 1)
+
+        # Changed behind the backend's back: only prefixed keys are held locally
+        self.shared.set('tag:a', 2)
+        self.shared.set('other', 2)
+        self.assertEqual(self.first.get('tag:a'), 1)
+        self.assertEqual(self.first.get_many(['tag:a', 'other']), {'tag:a': 1, 'other': 2})
+
+        # Mutable values are held pickled
+        self.first.set('tag:list', [1])
+        self.first.get('tag:list').append(2)
+        self.assertEqual(self.first.get('tag:list'), [1])
+
+    def test_writes_invalidate_other_workers(self):
+        self.shared.set_many({'tag:a': 1, 'tag:b': 1, 'tag:c': 1})
+        self.assertEqual(self.first.get_many(['tag:a', 'tag:b', 'tag:c']), {'tag:a': 1, 'tag:b': 1, 'tag:c': 1})
+
+        self.second.set('tag:a', 2)
+        self.second.delete('tag:b')
+        self.assertEqual(self.first.get('tag:a'), 2)
+        self.assertIsNone(self.first.get('tag:b'))
+
+        # Expired in the shared cache while still held here, then added again
+        self.first.get('tag:c')
+        self.shared.delete('tag:c')
+        self.assertTrue(self.second.add('tag:c', 3))
+        self.assertEqual(self.first.get('tag:c'), 3)
+        self.assertFalse(self.second.add('tag:c', 4))
+
+        # Only logged keys are dropped
+        self.first.set('tag:d', 1)
+        self.first.get('tag:d')
+        self.shared.set('tag:d', 2)
+        self.second.set('tag:a', 5)
+        self.assertEqual(self.first.get_many(['tag:a', 'tag:d']), {'tag:a': 5, 'tag:d': 1})
+
+    def test_falling_behind_the_log_flushes_everything(self):
+        self.first.set('tag:kept', 1)
+        self.first.get('tag:kept')
+        self.shared.set('tag:kept', 2)
+        self.assertEqual(self.first.get('tag:kept'), 1)
+
+        with mock.patch.object(cache_backends, 'MAX_LOG_ENTRIES', 3):
+            for i in range(4):
+                self.second.set('tag:other', i)
+            self.assertEqual(self.first.get('tag:kept'), 2)
+
+        # So does a cleared shared cache (the stamp is gone)
+        self.first.get('tag:kept')
+        self.shared.clear()
+        self.assertIsNone(self.first.get('tag:kept'))
+
+
+class JournalBundleTests(TestCase):
+    """GET /api/v1/journals/by-slug/{slug}/bundle/ (journals/bundle.py)."""
+
+    url = '/api/v1/journals/by-slug/first/bundle/'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.journal = Journal.objects.create(title='First', slug='first')
+        cls.volume = Volume.objects.create(journal=cls.journal, volume_number=1, year=2024)
+        cls.issue = Issue.objects.create(volume=cls.volume, issue_number=1, title='Spring')
+        for i in range(2):
+            Article.objects.create(
+                title=f'Article {i}', slug=f'article-{i}', issue=cls.issue, status='published',
+                published_date=date(2024, 3, i + 1),
+            )
+        Article.objects.create(title='Draft', slug='draft', issue=cls.issue)
+
+    def setUp(self):
+        cache.clear()
+
+    def bundle(self):
+        return self.client.get(self.url).json()
+
+    def test_matches_its_parts(self):
+        bundle = self.bundle()
+        self.assertEqual(bundle['journal'], self.client.get('/api/v1/journals/by-slug/first/').json())
+        volumes = self.client.get('/api/v1/volumes/by-journal/first/').json()
+        self.assertEqual(bundle['volumes'], volumes['results'])
+        self.assertEqual([article['slug'] for article in bundle['recent_articles']], ['article-1', 'article-0'])
+        with self.assertNumQueries(1):
+            self.assertEqual(self.bundle(), bundle)
+
+    def test_saves_invalidate_the_bundle(self):
+        self.bundle()
+        with self.captureOnCommitCallbacks(execute=True):
+            Volume.objects.create(journal=self.journal, volume_number=2, year=2025)
+        self.assertEqual([volume['volume_number'] for volume in self.bundle()['volumes']], [2, 1])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.issue.title = 'Autumn'
+            self.issue.save()
+        self.assertIn('Autumn', str(self.bundle()['volumes']))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            draft = Article.objects.get(slug='draft')
+            draft.status = 'published'
+            draft.published_date = date(2024, 3, 9)
+            draft.save()
+        self.assertEqual(self.bundle()['recent_articles'][0]['slug'], 'draft')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            FAQ.objects.create(journal=self.journal, question='Fees?', answer='None.')
+        self.assertEqual([faq['question'] for faq in self.bundle()['journal']['faqs']], ['Fees?'])
+
+    def test_site_content_leaves_the_bundle_cached(self):
+        # Announcements and CTA cards are site-wide and not part of the bundle
+        self.bundle()
+        with self.captureOnCommitCallbacks(execute=True):
+            Announcement.objects.create(title='News', content='Text', is_published=True)
+            CTACard.objects.create(image='cta_cards/card.png')
+        with self.assertNumQueries(1):
+            self.bundle()
+
+
+class StreamingListTests(TestCase):
+    """Streamed JSON list responses (backend/streaming.py)."""
+
+    url = '/api/v1/journals/indexing-platforms/'
+
+    def setUp(self):
+        cache.clear()
+
+    def fetch(self):
+        response = self.client.get(self.url)
+        self.assertTrue(response.streaming)
+        return json.loads(b''.join(response.streaming_content))
+
+    def expected(self):
+        queryset = IndexingPlatform.objects.order_by('display_order', 'name')
+        return json.loads(JSONRenderer().render(IndexingPlatformDetailSerializer(queryset, many=True).data))
+
+    def test_empty(self):
+        self.assertEqual(self.fetch(), [])
+
+    def test_one_item(self):
+        IndexingPlatform.objects.create(name='Scopus')
+        self.assertEqual(self.fetch(), self.expected())
+
+    def test_several_chunks(self):
+        for i, name in enumerate(['Scopus', 'DOAJ', 'Web of Science', 'Crossref', 'PubMed']):
+            IndexingPlatform.objects.create(name=name, display_order=i % 2)
+        with mock.patch.object(IndexingPlatformListView, 'stream_chunk_size', 2):
+            platforms = self.fetch()
+        self.assertEqual(platforms, self.expected())
+        self.assertEqual(len(platforms), 5)
+
+    def test_first_chunk_errors_are_raised_before_streaming(self):
+        IndexingPlatform.objects.create(name='Scopus')
+        with mock.patch.object(IndexingPlatformDetailSerializer, 'to_representation', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                self.client.get(self.url)
+
+
+class BatchViewTests(TestCase):
+    """POST /api/v1/batch/ (backend/batch.py)."""
+
+    @classmethod
+    def setUpTestData(cls):
+        Journal.objects.create(title='First', slug='first')
+
+    def batch(self, paths):
+        return self.client.post('/api/v1/batch/', {'paths': paths}, content_type='application/json')
+
+    def test_items_match_individual_requests(self):
+        paths = [
+            '/api/v1/journals/by-slug/first/',
+            '/api/v1/journals/?search=first',
+            '/api/v1/journals/subjects/',
+        ]
+        response = self.batch(paths)
+        self.assertEqual(response.status_code, 200)
+        for path, item in zip(paths, response.json()['responses']):
+            single = self.client.get(path)
+            self.assertEqual(item['path'], path)
+            self.assertEqual(item['status'], single.status_code)
+            self.assertEqual(item['body'], single.json())
+
+    def test_item_errors_and_permissions(self):
+        response = self.batch([
+            '/api/v1/journals/admin/',
+            '/api/v1/journals/by-slug/missing/',
+            '/api/v1/nothing-here/',
+            '/admin/',
+            '/api/v1/batch/',
+        ])
+        statuses = [item['status'] for item in response.json()['responses']]
+        self.assertEqual(statuses, [401, 404, 404, 400, 400])
+
+    def test_items_run_as_the_batch_caller(self):
+        admin = get_user_model().objects.create_superuser(email='admin@example.com', password='secret')
+        response = self.client.post(
+            '/api/v1/batch/', {'paths': ['/api/v1/journals/admin/']}, content_type='application/json',
+            HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(admin)}',
+        )
+        [item] = response.json()['responses']
+        self.assertEqual(item['status'], 200)
+        self.assertEqual(item['body']['count'], 1)
+
+    def test_non_json_items_are_closed_unread(self):
+        read = []
+
+        def chunks(params, base_url):
+            read.append(base_url)
+            yield '<OAI-PMH/>'
+
+        with mock.patch('syndication.oai.respond', chunks), \
+                mock.patch.object(StreamingHttpResponse, 'close', autospec=True) as close:
+            response = self.batch([
+                '/api/v1/journals/by-slug/first/',
+                '/api/v1/oai/?verb=Identify',
+                '/api/v1/feeds/rss/',
+                '/api/v1/feeds/nope/',
+            ])
+        items = response.json()['responses']
+        self.assertEqual([item['status'] for item in items], [200, 200, 200, 404])
+        self.assertEqual(items[0]['body']['slug'], 'first')
+        self.assertEqual([item['body'] for item in items[1:3]], [None, None])
+        self.assertEqual(read, [])
+        close.assert_called_once()
+
+    def test_item_permissions(self):
+        user = get_user_model().objects.create_user(email='reader@example.com', password='secret')
+        paths = ['/api/v1/journals/admin/', '/api/v1/journals/by-slug/first/']
+        response = self.batch(paths)
+        self.assertEqual([item['status'] for item in response.json()['responses']], [401, 200])
+        response = self.client.post(
+            '/api/v1/batch/', {'paths': paths}, content_type='application/json',
+            HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(user)}',
+        )
+        self.assertEqual([item['status'] for item in response.json()['responses']], [403, 200])
+
+    def test_size_limit(self):
+        self.assertEqual(self.batch(['/api/v1/journals/'] * 21).status_code, 400)
+        self.assertEqual(self.batch([]).status_code, 400)
+
+
+class ResolverTests(TestCase):
+    """Cached slug/number path resolution (journals/resolvers.py)."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.journal = Journal.objects.create(title='First', slug='first')
+        cls.other = Journal.objects.create(title='Other', slug='other')
+        cls.volume = Volume.objects.create(journal=cls.journal, volume_number=2, year=2024)
+        cls.issue = Issue.objects.create(volume=cls.volume, issue_number=1)
+        cls.article = Article.objects.create(
+            title='Article', slug='article', issue=cls.issue, status='published',
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_resolves_and_caches(self):
+        self.assertEqual(resolve_article('first', 'article'), self.article.pk)
+        self.assertEqual(resolve_volume('first', 2), self.volume.pk)
+        self.assertEqual(resolve_issue('first', 1), self.issue.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(resolve_article('first', 'article'), self.article.pk)
+            self.assertEqual(resolve_volume('first', 2), self.volume.pk)
+            self.assertEqual(resolve_issue('first', 1), self.issue.pk)
+        self.assertIsNone(resolve_article('other', 'article'))
+        self.assertIsNone(resolve_volume('first', 3))
+
+    def test_changes_are_picked_up(self):
+        url = '/api/v1/articles/by-journal/first/article/'
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.article.issue = None
+            self.article.journal = self.other
+            self.article.save()
+        self.assertEqual(self.client.get(url).status_code, 404)
+        self.assertEqual(self.client.get('/api/v1/articles/by-journal/other/article/').status_code, 200)
+
+        self.client.get('/api/v1/volumes/by-journal/first/2/')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.journal.slug = 'renamed'
+            self.journal.save()
+        self.assertEqual(self.client.get('/api/v1/volumes/by-journal/first/2/').status_code, 404)
+        self.assertEqual(self.client.get('/api/v1/volumes/by-journal/renamed/2/').status_code, 200)
+        self.assertEqual(self.client.get('/api/v1/issues/by-journal/renamed/1/').status_code, 200)
+
+    def test_moves_invalidate_the_old_journal(self):
+        self.assertEqual(resolve_article('first', 'article'), self.article.pk)
+        self.assertEqual(resolve_issue('first', 1), self.issue.pk)
+
+        other_volume = Volume.objects.create(journal=self.other, volume_number=7, year=2024)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.issue.volume = other_volume
+            self.issue.save()
+        self.assertIsNone(resolve_issue('first', 1))
+        self.assertIsNone(resolve_article('first', 'article'))
+        self.assertEqual(resolve_article('other', 'article'), self.article.pk)
+
+        self.assertEqual(resolve_volume('first', 2), self.volume.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.volume.journal = self.other
+            self.volume.save()
+        self.assertIsNone(resolve_volume('first', 2))
+        self.assertEqual(resolve_volume('other', 2), self.volume.pk)
+
+    def test_article_owner_is_checked_on_the_fetched_row(self):
+        # Its own journal takes precedence over its issue's
+        Article.objects.filter(pk=self.article.pk).update(journal=self.other)
+        self.assertIsNone(resolve_article('first', 'article'))
+        self.assertEqual(self.client.get('/api/v1/articles/by-journal/first/article/').status_code, 404)
+        self.assertEqual(self.client.get('/api/v1/articles/by-journal/other/article/').status_code, 200)
@@ -11,10 +11,12 @@ urlpatterns = [
     path('featured/', views.FeaturedJournalsView.as_view(), name='featured_journals'),
     path('search/', views.JournalSearchView.as_view(), name='journal_search'),
     path('by-slug/<slug:slug>/', views.JournalBySlugView.as_view(), name='journal_by_slug'),
+    path('by-slug/<slug:slug>/bundle/', views.JournalBundleView.as_view(), name='journal_bundle'),
     path('<int:pk>/', views.JournalDetailView.as_view(), name='journal_detail'),
     
     # Subject endpoints
     path('subjects/', views.SubjectListView.as_view(), name='subject_list'),
+    path('subjects/tree/', views.SubjectTreeView.as_view(), name='subject_tree'),
     path('subjects/<slug:slug>/', views.SubjectDetailView.as_view(), name='subject_detail'),
     path('subjects/<slug:slug>/journals/', views.JournalsBySubjectView.as_view(), name='journals_by_subject'),
     
@@ -1,14 +1,15 @@
 """Views for journals app."""
 
 from django.utils.decorators import method_decorator
-from django.views.decorators.cache import cache_page
 from django.views.decorators.cache import cache_control
 from rest_framework import generics, filters, status
+from rest_framework.views import APIView
+from rest_framework.exceptions import NotFound
 from rest_framework.permissions import IsAuthenticated, IsAdminUser, AllowAny
 from rest_framework.response import Response
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Q, Count, OuterRef, Subquery
+from django.db.models import Q, Count, OuterRef, Subquery, Prefetch
 
 from .models import (
     Subject, Journal, Announcement, CorporateAffiliation, 
@@ -16,10 +17,15 @@ from .models import (
     CTAButton, CTAFormSubmission, FAQ,
     IndexingPlatform, JournalIndexingLink
 )
+from backend.caching import cache_response, journal_tag, JOURNALS_TAG, HOMEPAGE_TAG
+from backend.streaming import StreamingListMixin
+from backend.fastpath import FastListMixin
+
+from .bundle import get_journal_bundle, build_journal_bundle
 from .serializers import (
     SubjectSerializer,
     SubjectListSerializer,
-    JournalListSerializer,
+    JournalListSerializer, JournalListValuesSerializer,
     JournalDetailSerializer,
     JournalCreateUpdateSerializer,
     AnnouncementListSerializer,
@@ -40,11 +46,16 @@ from .serializers import (
 )
 
 
+def subjects_prefetch():
+    """Prefetch journal subjects with their active journal counts in one query."""
+    return Prefetch('subjects', queryset=Subject.objects.with_journal_counts())
+
+
 # =============================================================================
 # Indexing Journal Views
 # =============================================================================
 
-class IndexingPlatformListView(generics.ListAPIView):
+class IndexingPlatformListView(StreamingListMixin, generics.ListAPIView):
     """Public: List all active indexing platforms with their linked journals."""
     permission_classes = [AllowAny]
     serializer_class = IndexingPlatformDetailSerializer
@@ -56,7 +67,7 @@ class IndexingPlatformListView(generics.ListAPIView):
         ).order_by('display_order', 'name')
 
 
-class IndexingPlatformAdminListView(generics.ListAPIView):
+class IndexingPlatformAdminListView(StreamingListMixin, generics.ListAPIView):
     """Admin: List all indexing platforms."""
     permission_classes = [IsAuthenticated, IsAdminUser]
     serializer_class = IndexingPlatformSerializer
@@ -109,16 +120,21 @@ class JournalIndexingLinkAdminDetailView(generics.RetrieveUpdateDestroyAPIView):
 # Public Journal Views
 # =============================================================================
 
-class JournalListView(generics.ListAPIView):
+class JournalListView(FastListMixin, generics.ListAPIView):
     """List all active journals."""
     
-    @method_decorator(cache_page(60 * 5))  # Cache for 5 minutes
-    @method_decorator(cache_control(max_age=300, public=True))
+    # Server-side copy is purged on change; keep browser caching short
+    @method_decorator(cache_control(max_age=60, public=True))
     def dispatch(self, *args, **kwargs):
         return super().dispatch(*args, **kwargs)
     
+    @cache_response(60 * 5, tags=[JOURNALS_TAG], item_tags=lambda item: [journal_tag(item['id'])])
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+    
     permission_classes = [AllowAny]
     serializer_class = JournalListSerializer
+    fast_serializer_class = JournalListValuesSerializer
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = {
         'is_featured': ['exact'],
@@ -131,18 +147,18 @@ class JournalListView(generics.ListAPIView):
     ordering = ['title']
     
     def get_queryset(self):
-        queryset = Journal.objects.filter(is_active=True).prefetch_related('subjects')
+        queryset = Journal.objects.filter(is_active=True).prefetch_related(subjects_prefetch())
         
         # Custom filtering for subject slug if provided in params
         subject_slug = self.request.query_params.get('subjects__slug')
         if subject_slug:
-            # Filter by subject slug, including journals in sub-subjects
-            try:
-                subject = Subject.objects.get(slug=subject_slug)
-                # Get all descendant subject IDs (1 level deep for now as per current structure)
-                subject_ids = [subject.id] + list(subject.children.values_list('id', flat=True))
-                queryset = queryset.filter(subjects__id__in=subject_ids).distinct()
-            except Subject.DoesNotExist:
+            # Filter by subject slug, including journals in any sub-subject
+            subject_path = Subject.objects.filter(
+                slug=subject_slug
+            ).values_list('path', flat=True).first()
+            if subject_path:
+                queryset = queryset.filter(subjects__path__startswith=subject_path).distinct()
+            else:
                 queryset = queryset.none()
         
         # Generic ISSN filter (checks both online and print)
@@ -156,29 +172,35 @@ class JournalListView(generics.ListAPIView):
         return queryset
 
 
-class FeaturedJournalsView(generics.ListAPIView):
+class FeaturedJournalsView(FastListMixin, generics.ListAPIView):
     """List featured journals for homepage."""
     
-    @method_decorator(cache_page(60 * 15))  # Cache for 15 minutes
-    @method_decorator(cache_control(max_age=900, public=True))
+    # Server-side copy is purged on change; keep browser caching short
+    @method_decorator(cache_control(max_age=60, public=True))
     def dispatch(self, *args, **kwargs):
         return super().dispatch(*args, **kwargs)
     
+    @cache_response(60 * 15, tags=[HOMEPAGE_TAG], item_tags=lambda item: [journal_tag(item['id'])])
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+    
     permission_classes = [AllowAny]
     serializer_class = JournalListSerializer
+    fast_serializer_class = JournalListValuesSerializer
     
     def get_queryset(self):
-        return Journal.objects.filter(is_active=True, is_featured=True).prefetch_related('subjects')
+        return Journal.objects.filter(is_active=True, is_featured=True).prefetch_related(subjects_prefetch())
 
 
-class JournalSearchView(generics.ListAPIView):
+class JournalSearchView(FastListMixin, generics.ListAPIView):
     """Search journals by title, description, or keywords."""
     
     permission_classes = [AllowAny]
     serializer_class = JournalListSerializer
+    fast_serializer_class = JournalListValuesSerializer
     
     def get_queryset(self):
-        queryset = Journal.objects.filter(is_active=True).prefetch_related('subjects')
+        queryset = Journal.objects.filter(is_active=True).prefetch_related(subjects_prefetch())
         query = self.request.query_params.get('q', '')
         
         if query:
@@ -208,6 +230,37 @@ class JournalBySlugView(generics.RetrieveAPIView):
         )
 
 
+class JournalBundleView(APIView):
+    """
+    Everything the journal page needs in a single payload.
+    
+    GET /api/v1/journals/by-slug/{slug}/bundle/
+    
+    Returns the journal detail, its active volumes (with issues) and the most
+    recent articles. Cached per journal and invalidated by model signals.
+    """
+    permission_classes = [AllowAny]
+    
+    def get(self, request, slug):
+        journal_id = Journal.objects.filter(
+            slug=slug, is_active=True
+        ).values_list('id', flat=True).first()
+        if journal_id is None:
+            raise NotFound('Journal not found.')
+        
+        # Staff see inactive issues, so never share their payload through the cache
+        if request.user and request.user.is_staff:
+            journal = Journal.objects.prefetch_related(
+                'subjects', 'editorial_board_members', 'indexing_entries'
+            ).get(pk=journal_id)
+            return Response(build_journal_bundle(journal, request))
+        
+        payload = get_journal_bundle(journal_id, request)
+        if payload is None:
+            raise NotFound('Journal not found.')
+        return Response(payload)
+
+
 class JournalDetailView(generics.RetrieveAPIView):
     """Get journal by ID."""
     
@@ -227,7 +280,12 @@ class JournalDetailView(generics.RetrieveAPIView):
 # =============================================================================
 
 class SubjectListView(generics.ListAPIView):
-    """List all active subjects."""
+    """
+    List all active top-level subjects with their children.
+    
+    The whole active tree is loaded in one annotated query and linked up in
+    memory, so journal counts and children cost no extra queries per node.
+    """
     
     permission_classes = [AllowAny]
     serializer_class = SubjectSerializer
@@ -236,8 +294,55 @@ class SubjectListView(generics.ListAPIView):
     ordering = ['display_order', 'name']
     
     def get_queryset(self):
+        return Subject.objects.filter(is_active=True).select_related('parent').with_journal_counts()
+    
+    def list(self, request, *args, **kwargs):
+        subjects = list(self.filter_queryset(self.get_queryset()))
         # Only return top-level subjects (no parent)
-        return Subject.objects.filter(is_active=True, parent__isnull=True)
+        roots = [
+            subject for subject in Subject.build_tree(subjects)
+            if subject.parent_id is None
+        ]
+        
+        page = self.paginate_queryset(roots)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+        serializer = self.get_serializer(roots, many=True)
+        return Response(serializer.data)
+
+
+class SubjectTreeView(APIView):
+    """
+    Full active subject tree, nested to any depth.
+    
+    GET /api/v1/journals/subjects/tree/
+    
+    Each node carries its active journal count. Built from a single query.
+    """
+    permission_classes = [AllowAny]
+    
+    def get(self, request):
+        subjects = list(
+            Subject.objects.filter(is_active=True)
+            .with_journal_counts()
+            .order_by('display_order', 'name')
+        )
+        roots = [
+            subject for subject in Subject.build_tree(subjects)
+            if subject.parent_id is None
+        ]
+        return Response([self._node(subject) for subject in roots])
+    
+    def _node(self, subject):
+        return {
+            'id': subject.id,
+            'name': subject.name,
+            'slug': subject.slug,
+            'depth': subject.depth,
+            'journal_count': subject.active_journal_count,
+            'children': [self._node(child) for child in subject.tree_children],
+        }
 
 
 class SubjectDetailView(generics.RetrieveAPIView):
@@ -248,32 +353,39 @@ class SubjectDetailView(generics.RetrieveAPIView):
     lookup_field = 'slug'
     
     def get_queryset(self):
-        return Subject.objects.filter(is_active=True)
+        return Subject.objects.filter(is_active=True).with_journal_counts()
 
 
-class JournalsBySubjectView(generics.ListAPIView):
-    """Get journals by subject slug."""
+class JournalsBySubjectView(FastListMixin, generics.ListAPIView):
+    """Get journals by subject slug, including journals in its sub-subjects."""
     
     permission_classes = [AllowAny]
     serializer_class = JournalListSerializer
+    fast_serializer_class = JournalListValuesSerializer
     
     def get_queryset(self):
         slug = self.kwargs.get('slug')
+        subject_path = Subject.objects.filter(
+            slug=slug
+        ).values_list('path', flat=True).first()
+        if not subject_path:
+            return Journal.objects.none()
         return Journal.objects.filter(
             is_active=True,
-            subjects__slug=slug
-        ).prefetch_related('subjects').distinct()
+            subjects__path__startswith=subject_path
+        ).prefetch_related(subjects_prefetch()).distinct()
 
 
 # =============================================================================
 # Admin Journal Views
 # =============================================================================
 
-class JournalAdminListView(generics.ListAPIView):
+class JournalAdminListView(FastListMixin, generics.ListAPIView):
     """Admin: List all journals (including inactive)."""
     
     permission_classes = [IsAuthenticated, IsAdminUser]
     serializer_class = JournalListSerializer
+    fast_serializer_class = JournalListValuesSerializer
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['is_active', 'is_featured', 'subjects', 'subjects__slug']
     search_fields = ['title', 'short_title', 'description', 'issn_online', 'issn_print']
@@ -281,7 +393,7 @@ class JournalAdminListView(generics.ListAPIView):
     ordering = ['-updated_at']
     
     def get_queryset(self):
-        return Journal.objects.all().prefetch_related('subjects')
+        return Journal.objects.all().prefetch_related(subjects_prefetch())
 
 
 class JournalCreateView(generics.CreateAPIView):
@@ -319,7 +431,7 @@ class SubjectAdminListView(generics.ListAPIView):
     ordering = ['display_order', 'name']
     
     def get_queryset(self):
-        return Subject.objects.all()
+        return Subject.objects.all().select_related('parent').with_journal_counts()
 
 
 class SubjectCreateView(generics.CreateAPIView):
@@ -456,7 +568,7 @@ class CTAFormSubmissionAdminListView(generics.ListAPIView):
 # Admin Announcement Views
 # =============================================================================
 
-class AnnouncementAdminListView(generics.ListAPIView):
+class AnnouncementAdminListView(StreamingListMixin, generics.ListAPIView):
     """Admin: List all announcements (including unpublished)."""
     
     permission_classes = [IsAuthenticated, IsAdminUser]
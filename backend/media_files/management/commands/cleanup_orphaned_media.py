@@ -0,0 +1,207 @@
+"""
+Management command to find and remove orphaned media files.
+
+Deleting articles, replacing uploaded files and re-parsing XML all leave
+files behind in MEDIA_ROOT. This command collects every path referenced by
+a FileField/ImageField in any installed app, then walks the storage and
+reports (or deletes) files that nothing points to any more.
+
+Referenced paths are spooled into a temporary on-disk SQLite index rather
+than a Python set, and storage is walked lazily, so memory use stays flat
+no matter how many files or rows there are.
+"""
+
+import os
+import sqlite3
+import tempfile
+from datetime import timedelta
+
+from django.apps import apps
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from django.db import models
+from django.utils import timezone
+
+
+# Files that live in MEDIA_ROOT on purpose and are never referenced by a model
+PROTECTED_FILES = {'.gitkeep'}
+# Generated directories (sitemaps and metadata dumps written by
+# build_sitemaps and export_metadata)
+PROTECTED_PREFIXES = ('sitemaps/', 'exports/')
+
+
+class Command(BaseCommand):
+    help = 'Report or delete media files that are not referenced by any FileField/ImageField'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--delete',
+            action='store_true',
+            help='Actually delete orphaned files (default is a dry-run report)',
+        )
+        parser.add_argument(
+            '--grace-hours',
+            type=int,
+            default=24,
+            help='Only consider files older than this many hours (default: 24)',
+        )
+        parser.add_argument(
+            '--prefix',
+            default='',
+            help='Only scan this sub-directory of the media storage (e.g. "articles/")',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=2000,
+            help='Rows/files processed per batch (default: 2000)',
+        )
+        parser.add_argument(
+            '--verbose-list',
+            action='store_true',
+            help='Print every orphaned file path',
+        )
+
+    def handle(self, *args, **options):
+        self.storage = default_storage
+        self.chunk_size = max(options['chunk_size'], 1)
+        delete = options['delete']
+        list_files = options['verbose_list']
+        cutoff = timezone.now() - timedelta(hours=options['grace_hours'])
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            index = sqlite3.connect(os.path.join(tmp_dir, 'referenced.sqlite3'))
+            try:
+                index.execute('CREATE TABLE refs (path TEXT PRIMARY KEY) WITHOUT ROWID')
+                referenced = self._build_reference_index(index)
+                self.stdout.write(f'Indexed {referenced} distinct referenced file paths.')
+
+                scanned = orphaned = skipped_recent = reclaimed = 0
+                batch = []
+                for name in self._walk(options['prefix'].strip('/')):
+                    batch.append(name)
+                    if len(batch) >= self.chunk_size:
+                        stats = self._process_batch(index, batch, cutoff, delete, list_files)
+                        scanned += len(batch)
+                        orphaned += stats[0]
+                        skipped_recent += stats[1]
+                        reclaimed += stats[2]
+                        batch = []
+                if batch:
+                    stats = self._process_batch(index, batch, cutoff, delete, list_files)
+                    scanned += len(batch)
+                    orphaned += stats[0]
+                    skipped_recent += stats[1]
+                    reclaimed += stats[2]
+            finally:
+                index.close()
+
+        action = 'Deleted' if delete else 'Found'
+        self.stdout.write('')
+        self.stdout.write(self.style.SUCCESS(
+            f'Scanned {scanned} files. {action} {orphaned} orphaned files '
+            f'({reclaimed / (1024 * 1024):.1f} MB). '
+            f'Skipped {skipped_recent} unreferenced files newer than the grace period.'
+        ))
+        if not delete and orphaned:
+            self.stdout.write('Re-run with --delete to remove them.')
+
+    def _file_fields(self):
+        """Yield (model, [field names]) for every concrete model with file fields."""
+        for model in apps.get_models():
+            if model._meta.proxy or not model._meta.managed:
+                continue
+            names = [
+                field.attname
+                for field in model._meta.concrete_fields
+                if isinstance(field, models.FileField)
+            ]
+            if names:
+                yield model, names
+
+    def _build_reference_index(self, index):
+        """
+        Stream every referenced path into the on-disk index, one query per
+        model. Returns the number of distinct paths.
+        """
+        for model, names in self._file_fields():
+            rows = model._base_manager.values_list(*names).iterator(chunk_size=self.chunk_size)
+            batch = []
+            for row in rows:
+                batch.extend((value,) for value in row if value)
+                if len(batch) >= self.chunk_size:
+                    index.executemany('INSERT OR IGNORE INTO refs (path) VALUES (?)', batch)
+                    batch = []
+            if batch:
+                index.executemany('INSERT OR IGNORE INTO refs (path) VALUES (?)', batch)
+        index.commit()
+        return index.execute('SELECT COUNT(*) FROM refs').fetchone()[0]
+
+    def _walk(self, prefix):
+        """Lazily yield every file name in the media storage below ``prefix``."""
+        try:
+            root = self.storage.path('')
+        except NotImplementedError:
+            root = None
+
+        if root is None:
+            # Remote storage: fall back to the generic (per-directory) listing API
+            pending = [prefix]
+            while pending:
+                directory = pending.pop()
+                dirs, files = self.storage.listdir(directory)
+                for name in files:
+                    yield f'{directory}/{name}' if directory else name
+                for name in dirs:
+                    pending.append(f'{directory}/{name}' if directory else name)
+            return
+
+        # Local storage: os.scandir streams entries instead of building lists
+        start = os.path.join(root, prefix) if prefix else root
+        if not os.path.isdir(start):
+            return
+        pending = [start]
+        while pending:
+            directory = pending.pop()
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        yield os.path.relpath(entry.path, root).replace(os.sep, '/')
+
+    def _process_batch(self, index, names, cutoff, delete, list_files):
+        """Check a batch of storage names against the index; returns (orphaned, recent, bytes)."""
+        known = set()
+        # Stay below SQLite's bound-parameter limit on older builds
+        for start in range(0, len(names), 500):
+            part = names[start:start + 500]
+            placeholders = ','.join('?' * len(part))
+            known.update(
+                row[0] for row in index.execute(
+                    f'SELECT path FROM refs WHERE path IN ({placeholders})', part
+                )
+            )
+
+        orphaned = recent = reclaimed = 0
+        for name in names:
+            if name in known or os.path.basename(name) in PROTECTED_FILES or name.startswith(PROTECTED_PREFIXES):
+                continue
+            try:
+                if self.storage.get_modified_time(name) > cutoff:
+                    recent += 1
+                    continue
+                size = self.storage.size(name)
+            except (OSError, NotImplementedError):
+                continue
+
+            orphaned += 1
+            reclaimed += size
+            if list_files:
+                self.stdout.write(f'  {name} ({size} bytes)')
+            if delete:
+                try:
+                    self.storage.delete(name)
+                except OSError as e:
+                    self.stdout.write(self.style.WARNING(f'  Could not delete {name}: {e}'))
+        return orphaned, recent, reclaimed
@@ -0,0 +1,33 @@
+"""
+Management command to recompute the admin dashboard statistics.
+
+Run it on a schedule (e.g. from cron) to keep the snapshot warm; the
+dashboard itself only recomputes when the snapshot has been marked stale.
+"""
+
+from django.core.management.base import BaseCommand
+
+from media_files.models import DashboardStatsSnapshot
+
+
+class Command(BaseCommand):
+    help = 'Recompute the admin dashboard statistics snapshot'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--if-stale',
+            action='store_true',
+            help='Only recompute if something changed since the last run',
+        )
+
+    def handle(self, *args, **options):
+        snapshot = DashboardStatsSnapshot.get_snapshot()
+        if options['if_stale'] and not snapshot.is_stale:
+            self.stdout.write('Dashboard stats are already up to date.')
+            return
+
+        snapshot.refresh()
+        self.stdout.write(self.style.SUCCESS(
+            f'Dashboard stats refreshed: {snapshot.stats["total_articles"]} articles '
+            f'across {len(snapshot.journals)} journals.'
+        ))
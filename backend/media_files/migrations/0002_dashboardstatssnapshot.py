@@ -0,0 +1,28 @@
+# Generated by Django 5.2.9 on 2026-10-19 06:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('media_files', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DashboardStatsSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('stats', models.JSONField(blank=True, default=dict, help_text='Site-wide totals')),
+                ('journals', models.JSONField(blank=True, default=list, help_text='Per-journal breakdown')),
+                ('version', models.PositiveBigIntegerField(default=0, help_text='Bumped on every change to the counted models')),
+                ('computed_version', models.PositiveBigIntegerField(blank=True, help_text='Value of version when the stats were last computed', null=True)),
+                ('computed_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'dashboard stats snapshot',
+                'verbose_name_plural': 'dashboard stats snapshot',
+            },
+        ),
+    ]
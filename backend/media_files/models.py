@@ -4,11 +4,15 @@ Site-wide settings and static pages models.
 Handles:
 - Global site configuration
 - CMS-managed static pages (About, Contact, etc.)
+- Precomputed admin dashboard statistics
 """
 
 from django.db import models
+from django.utils import timezone
 from django.utils.text import slugify
 
+from backend.querycache import CachedManager
+
 
 class SiteSettings(models.Model):
     """
@@ -101,6 +105,8 @@ class SiteSettings(models.Model):
     
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = CachedManager()
+    
     class Meta:
         verbose_name = 'site settings'
         verbose_name_plural = 'site settings'
@@ -192,6 +198,8 @@ class Page(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = CachedManager()
+    
     class Meta:
         verbose_name = 'page'
         verbose_name_plural = 'pages'
@@ -209,3 +217,79 @@ class Page(models.Model):
         if not self.meta_title:
             self.meta_title = self.title
         super().save(*args, **kwargs)
+
+
+class DashboardStatsSnapshot(models.Model):
+    """
+    Precomputed admin dashboard statistics (singleton).
+    
+    Committed writes to journals, volumes, issues, articles and authors bump
+    ``version`` (see media_files/signals.py); the snapshot is stale whenever
+    ``computed_version`` lags behind it and is recomputed on the next
+    dashboard load or by the ``refresh_dashboard_stats`` command.
+    """
+    
+    stats = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text='Site-wide totals'
+    )
+    journals = models.JSONField(
+        default=list,
+        blank=True,
+        help_text='Per-journal breakdown'
+    )
+    version = models.PositiveBigIntegerField(
+        default=0,
+        help_text='Bumped on every change to the counted models'
+    )
+    computed_version = models.PositiveBigIntegerField(
+        null=True,
+        blank=True,
+        help_text='Value of version when the stats were last computed'
+    )
+    computed_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        verbose_name = 'dashboard stats snapshot'
+        verbose_name_plural = 'dashboard stats snapshot'
+    
+    def __str__(self):
+        return f'Dashboard stats ({self.computed_at or "never computed"})'
+    
+    def save(self, *args, **kwargs):
+        # Ensure only one instance exists (singleton pattern)
+        self.pk = 1
+        super().save(*args, **kwargs)
+    
+    @classmethod
+    def get_snapshot(cls):
+        """Get or create the snapshot instance."""
+        snapshot, created = cls.objects.get_or_create(pk=1)
+        return snapshot
+    
+    @classmethod
+    def mark_stale(cls):
+        """Flag the snapshot as out of date (a single UPDATE, no read)."""
+        cls.objects.filter(pk=1).update(version=models.F('version') + 1)
+    
+    @property
+    def is_stale(self):
+        return self.computed_version != self.version
+    
+    def refresh(self):
+        """Recompute the stats and store them against the version read first."""
+        from .stats import compute_dashboard_stats
+        
+        version = type(self).objects.filter(pk=self.pk).values_list('version', flat=True).first() or 0
+        self.stats, self.journals = compute_dashboard_stats()
+        self.computed_version = version
+        self.computed_at = timezone.now()
+        type(self).objects.filter(pk=self.pk).update(
+            stats=self.stats,
+            journals=self.journals,
+            computed_version=self.computed_version,
+            computed_at=self.computed_at,
+        )
+        self.refresh_from_db(fields=['version'])
+        return self
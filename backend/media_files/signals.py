@@ -0,0 +1,28 @@
+"""
+Signal handlers for the media_files app.
+
+Marks the dashboard stats snapshot stale whenever one of the models it
+counts is written, so the next dashboard load recomputes it. The marker is
+bumped once the write commits, so writers never wait on the snapshot row
+inside their transactions.
+"""
+
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from articles.models import Article, Author
+from issues.models import Issue
+from journals.models import Journal
+from volumes.models import Volume
+
+from .models import DashboardStatsSnapshot
+
+
+@receiver([post_save, post_delete], sender=Journal)
+@receiver([post_save, post_delete], sender=Volume)
+@receiver([post_save, post_delete], sender=Issue)
+@receiver([post_save, post_delete], sender=Article)
+@receiver([post_save, post_delete], sender=Author)
+def counted_model_changed(sender, using=None, **kwargs):
+    transaction.on_commit(DashboardStatsSnapshot.mark_stale, using=using)
@@ -0,0 +1,89 @@
+"""
+Admin dashboard statistics.
+
+Every figure comes from conditional aggregation: one grouped query per
+table, where each group is a journal, so the site-wide totals and the
+per-journal breakdown are produced in the same pass. Results are stored in
+DashboardStatsSnapshot rather than computed on every dashboard load.
+"""
+
+from django.db.models import Count, F, Q
+from django.db.models.functions import Coalesce
+
+from articles.models import Article, Author
+from issues.models import Issue
+from journals.models import Journal
+from volumes.models import Volume
+
+
+ARTICLE_COUNTS = {
+    'articles': Count('pk'),
+    'published_articles': Count('pk', filter=Q(status='published')),
+    'draft_articles': Count('pk', filter=Q(status='draft')),
+    'archived_articles': Count('pk', filter=Q(status='archive')),
+    'featured_articles': Count('pk', filter=Q(is_featured=True)),
+}
+
+
+def _grouped(queryset, journal_field, counts):
+    """Run ``counts`` grouped by journal: {journal_id: {name: count}}."""
+    rows = queryset.order_by().annotate(
+        _journal=journal_field
+    ).values('_journal').annotate(**counts)
+    return {row.pop('_journal'): row for row in rows}
+
+
+def compute_dashboard_stats():
+    """
+    Compute the dashboard figures.
+
+    Returns ``(stats, journals)``: the site-wide totals (the keys the
+    dashboard has always used, plus archived_articles) and a list with one
+    breakdown dict per journal.
+    """
+    journal_rows = list(Journal.objects.order_by('title').values(
+        'id', 'title', 'slug', 'is_active', 'is_featured'
+    ))
+
+    volumes = _grouped(Volume.objects.all(), F('journal_id'), {
+        'volumes': Count('pk'),
+    })
+    issues = _grouped(Issue.objects.all(), F('volume__journal_id'), {
+        'issues': Count('pk'),
+    })
+    # An article belongs to a journal directly, through its volume or through its issue
+    articles = _grouped(
+        Article.objects.all(),
+        Coalesce('journal_id', 'volume__journal_id', 'issue__volume__journal_id'),
+        ARTICLE_COUNTS,
+    )
+    total_authors = Author.objects.count()
+
+    def total(groups, name):
+        return sum(row[name] for row in groups.values())
+
+    stats = {
+        'total_journals': len(journal_rows),
+        'active_journals': sum(1 for row in journal_rows if row['is_active']),
+        'total_volumes': total(volumes, 'volumes'),
+        'total_issues': total(issues, 'issues'),
+        'total_articles': total(articles, 'articles'),
+        'published_articles': total(articles, 'published_articles'),
+        'draft_articles': total(articles, 'draft_articles'),
+        'archived_articles': total(articles, 'archived_articles'),
+        'total_authors': total_authors,
+        'featured_journals': sum(1 for row in journal_rows if row['is_featured']),
+        'featured_articles': total(articles, 'featured_articles'),
+    }
+
+    empty_articles = dict.fromkeys(ARTICLE_COUNTS, 0)
+    journals = [
+        {
+            **row,
+            'volumes': volumes.get(row['id'], {}).get('volumes', 0),
+            'issues': issues.get(row['id'], {}).get('issues', 0),
+            **articles.get(row['id'], empty_articles),
+        }
+        for row in journal_rows
+    ]
+    return stats, journals
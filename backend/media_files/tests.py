@@ -1,3 +1,113 @@
-from django.test import TestCase
+import io
+import os
+import tempfile
+import time
+from pathlib import Path
 
-# Create your tests here.
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from journals.models import Journal
+
+from .models import DashboardStatsSnapshot
+
+
+class DashboardStatsSnapshotTests(TestCase):
+    """Staleness tracking of the dashboard stats snapshot."""
+
+    def test_marked_stale_after_commit(self):
+        snapshot = DashboardStatsSnapshot.get_snapshot().refresh()
+        self.assertFalse(snapshot.is_stale)
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            with CaptureQueriesContext(connection) as queries:
+                Journal.objects.create(title='Journal of Tests', slug='tests')
+        # The writer's transaction never touches the snapshot row
+        table = DashboardStatsSnapshot._meta.db_table
+        self.assertFalse([query for query in queries if table in query['sql']])
+        self.assertFalse(DashboardStatsSnapshot.get_snapshot().is_stale)
+
+        for callback in callbacks:
+            callback()
+        snapshot = DashboardStatsSnapshot.get_snapshot()
+        self.assertTrue(snapshot.is_stale)
+        self.assertEqual(snapshot.refresh().stats['total_journals'], 1)
+        self.assertFalse(snapshot.is_stale)
+
+
+class CleanupOrphanedMediaTests(TestCase):
+    """The cleanup_orphaned_media command."""
+
+    OLD_FILES = [
+        'journals/covers/used.png',
+        'journals/covers/orphan.png',
+        'articles/pdf/orphan.pdf',
+        '.gitkeep',
+        'articles/.gitkeep',
+        'sitemaps/sitemap.xml',
+        'exports/tests.jsonl.gz',
+    ]
+
+    def setUp(self):
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        self.enterContext(override_settings(MEDIA_ROOT=media_root.name))
+        self.root = Path(media_root.name)
+
+        old = time.time() - 48 * 60 * 60
+        for name in self.OLD_FILES:
+            self.write(name, mtime=old)
+        self.write('articles/pdf/new.pdf')
+        # Referenced twice, indexed once
+        Journal.objects.create(title='First', slug='first', cover_image='journals/covers/used.png')
+        Journal.objects.create(title='Second', slug='second', cover_image='journals/covers/used.png')
+
+    def write(self, name, mtime=None):
+        path = self.root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b'x' * 10)
+        if mtime is not None:
+            os.utime(path, (mtime, mtime))
+
+    def files(self):
+        return sorted(path.relative_to(self.root).as_posix() for path in self.root.rglob('*') if path.is_file())
+
+    def cleanup(self, *args):
+        out = io.StringIO()
+        call_command('cleanup_orphaned_media', '--verbose-list', *args, stdout=out)
+        return out.getvalue()
+
+    def test_dry_run_deletes_nothing(self):
+        before = self.files()
+        output = self.cleanup()
+        self.assertEqual(self.files(), before)
+        self.assertIn('Indexed 1 distinct referenced file paths.', output)
+        self.assertIn('Found 2 orphaned files', output)
+        self.assertIn('journals/covers/orphan.png', output)
+        self.assertIn('articles/pdf/orphan.pdf', output)
+        self.assertIn('Skipped 1 unreferenced files newer than the grace period.', output)
+
+    def test_delete_removes_only_old_unreferenced_files(self):
+        output = self.cleanup('--delete')
+        self.assertIn('Deleted 2 orphaned files', output)
+        self.assertEqual(self.files(), sorted([
+            '.gitkeep',
+            'articles/.gitkeep',
+            'articles/pdf/new.pdf',
+            'exports/tests.jsonl.gz',
+            'journals/covers/used.png',
+            'sitemaps/sitemap.xml',
+        ]))
+
+    def test_grace_period(self):
+        self.cleanup('--delete', '--grace-hours', '0')
+        self.assertNotIn('articles/pdf/new.pdf', self.files())
+        self.assertIn('sitemaps/sitemap.xml', self.files())
+
+    def test_prefix(self):
+        output = self.cleanup('--delete', '--prefix', 'articles/')
+        self.assertIn('Deleted 1 orphaned files', output)
+        self.assertIn('journals/covers/orphan.png', self.files())
+        self.assertNotIn('articles/pdf/orphan.pdf', self.files())
@@ -7,7 +7,9 @@ from rest_framework.permissions import IsAuthenticated, IsAdminUser, AllowAny
 from django_filters.rest_framework import DjangoFilterBackend
 from django.shortcuts import get_object_or_404
 
-from .models import SiteSettings, Page
+from backend.streaming import StreamingListMixin
+
+from .models import SiteSettings, Page, DashboardStatsSnapshot
 from .serializers import (
     SiteSettingsSerializer,
     PageListSerializer, PageDetailSerializer, PageCreateUpdateSerializer
@@ -55,7 +57,7 @@ class SiteSettingsView(APIView):
 # Public Page Views
 # =============================================================================
 
-class PageListView(generics.ListAPIView):
+class PageListView(StreamingListMixin, generics.ListAPIView):
     """
     List all active pages.
     
@@ -164,24 +166,22 @@ class DashboardStatsView(APIView):
     Get dashboard statistics for admin.
     
     GET /api/v1/site/admin/stats/
+    GET /api/v1/site/admin/stats/?refresh=true
+    
+    Served from the stats snapshot; it is only recomputed when something
+    has changed since it was built, or when ?refresh=true is passed.
+    Includes a per-journal breakdown under "journals".
     """
     permission_classes = [IsAuthenticated, IsAdminUser]
     
     def get(self, request):
-        from journals.models import Journal
-        from volumes.models import Volume
-        from issues.models import Issue
-        from articles.models import Article, Author
+        snapshot = DashboardStatsSnapshot.get_snapshot()
+        force = request.query_params.get('refresh', '').lower() in ('1', 'true', 'yes')
+        if force or snapshot.is_stale:
+            snapshot.refresh()
         
         return Response({
-            'total_journals': Journal.objects.count(),
-            'active_journals': Journal.objects.filter(is_active=True).count(),
-            'total_volumes': Volume.objects.count(),
-            'total_issues': Issue.objects.count(),
-            'total_articles': Article.objects.count(),
-            'published_articles': Article.objects.filter(status='published').count(),
-            'draft_articles': Article.objects.filter(status='draft').count(),
-            'total_authors': Author.objects.count(),
-            'featured_journals': Journal.objects.filter(is_featured=True).count(),
-            'featured_articles': Article.objects.filter(is_featured=True).count(),
+            **snapshot.stats,
+            'journals': snapshot.journals,
+            'computed_at': snapshot.computed_at,
         })
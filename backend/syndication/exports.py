@@ -0,0 +1,243 @@
+"""
+Per-journal metadata dumps for partners.
+
+Each active journal is exported to ``MEDIA_ROOT/exports/{slug}.jsonl.gz``:
+gzip-compressed JSON Lines, one object per line with a ``type`` of
+``journal`` (first line), ``volume``, ``issue``, ``author`` or ``article``.
+Articles list their authors by ID, in order. Only public content goes in
+the dumps (active volumes and issues, published and archived articles),
+and author e-mail addresses are left out.
+
+``manifest.json`` next to the dumps lists every file with its SHA-256
+checksum, size and record counts. Rows are streamed from server-side
+cursors, so memory use doesn't grow with the size of a journal.
+
+Exports are incremental: like the sitemaps (syndication/sitemaps.py), each
+journal has a fingerprint of the rows its dump is built from, including
+the authors of its articles and their order, and only journals whose fingerprint changed
+since the last run are written again. Dumps of journals that were removed
+or deactivated are deleted.
+"""
+
+import gzip
+import hashlib
+import json
+from pathlib import Path
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Prefetch
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from articles.models import ArticleAuthor, Author
+from issues.models import Issue
+from journals.models import Journal
+from volumes.models import Volume
+
+from .links import article_url, frontend_url
+from .sitemaps import PUBLIC_ARTICLE_STATUSES, digest, public_articles, summaries, write_atomic
+
+
+EXPORT_DIR = 'exports'
+MANIFEST_NAME = 'manifest.json'
+# Bump when the record layout changes, so every dump is written again
+FORMAT_VERSION = 1
+CHUNK_SIZE = 500
+HASH_BLOCK_SIZE = 1024 * 1024
+
+JOURNAL_FIELDS = [
+    'id', 'slug', 'title', 'short_title', 'issn_print', 'issn_online',
+    'publisher', 'founding_year', 'frequency', 'updated_at',
+]
+VOLUME_FIELDS = ['id', 'volume_number', 'year', 'title', 'is_archived', 'updated_at']
+ISSUE_FIELDS = [
+    'id', 'volume_id', 'issue_number', 'title', 'publication_date',
+    'is_special_issue', 'special_issue_title', 'updated_at',
+]
+AUTHOR_FIELDS = [
+    'id', 'first_name', 'last_name', 'orcid_id', 'affiliation',
+    'department', 'country', 'updated_at',
+]
+ARTICLE_FIELDS = [
+    'id', 'volume_id', 'issue_id', 'article_id_code', 'doi', 'title', 'slug',
+    'article_type', 'status', 'abstract', 'keywords', 'license_text',
+    'page_start', 'page_end', 'article_number', 'received_date', 'revised_date',
+    'accepted_date', 'published_date', 'is_open_access', 'is_special_issue', 'updated_at',
+]
+
+
+def export_root():
+    return Path(settings.MEDIA_ROOT) / EXPORT_DIR
+
+
+def _article_authors():
+    return ArticleAuthor.objects.filter(
+        article__status__in=PUBLIC_ARTICLE_STATUSES
+    ).annotate(
+        owner_id=Coalesce(
+            'article__journal_id', 'article__issue__volume__journal_id', 'article__volume__journal_id'
+        )
+    )
+
+
+def _author_listings():
+    """
+    {journal ID: digest of its articles' author rows}.
+
+    ``ArticleAuthor`` has no ``updated_at``, so the columns that end up in
+    the dumps are hashed instead: reordering authors, changing the
+    corresponding author or swapping the author of a row changes the digest.
+    """
+    rows = _article_authors().order_by('owner_id', 'pk').values_list(
+        'owner_id', 'pk', 'author_id', 'author_order', 'is_corresponding'
+    )
+    listings = {}
+    for owner_id, *row in rows.iterator(chunk_size=CHUNK_SIZE):
+        listings.setdefault(owner_id, hashlib.md5()).update(repr(row).encode())
+    return {owner_id: listing.hexdigest() for owner_id, listing in listings.items()}
+
+
+def fingerprints():
+    """{journal ID: fingerprint} for every journal that gets a dump."""
+    journals = list(Journal.objects.filter(is_active=True).values_list('pk', 'updated_at'))
+    articles = summaries(public_articles(), 'owner_id')
+    volumes = summaries(Volume.objects.filter(is_active=True), 'journal_id')
+    issues = summaries(Issue.objects.filter(is_active=True), 'volume__journal_id')
+    authors = summaries(_article_authors(), 'owner_id', 'author__updated_at')
+    listings = _author_listings()
+    return {
+        pk: digest(FORMAT_VERSION, updated_at, *[
+            found.get(pk) for found in (articles, volumes, issues, authors, listings)
+        ])
+        for pk, updated_at in journals
+    }
+
+
+# =============================================================================
+# Records
+# =============================================================================
+
+def journal_records(journal_id):
+    """Yield the (type, record) pairs of one journal's dump, in file order."""
+    journal = Journal.objects.filter(pk=journal_id).values(*JOURNAL_FIELDS).get()
+    yield 'journal', {**journal, 'url': frontend_url(journal['slug'])}
+
+    volumes = Volume.objects.filter(
+        journal_id=journal_id, is_active=True
+    ).order_by('volume_number', 'pk').values(*VOLUME_FIELDS)
+    for volume in volumes.iterator(chunk_size=CHUNK_SIZE):
+        yield 'volume', volume
+
+    issues = Issue.objects.filter(
+        volume__journal_id=journal_id, is_active=True
+    ).order_by('volume__volume_number', 'issue_number', 'pk').values(*ISSUE_FIELDS)
+    for issue in issues.iterator(chunk_size=CHUNK_SIZE):
+        yield 'issue', issue
+
+    authors = Author.objects.filter(
+        pk__in=_article_authors().filter(owner_id=journal_id).values('author_id')
+    ).order_by('pk').values(*AUTHOR_FIELDS)
+    for author in authors.iterator(chunk_size=CHUNK_SIZE):
+        yield 'author', author
+
+    articles = public_articles().filter(owner_id=journal_id).select_related(
+        'journal', 'issue__volume__journal', 'volume__journal'
+    ).prefetch_related(Prefetch(
+        'article_authors', queryset=ArticleAuthor.objects.order_by('author_order')
+    )).order_by('pk')
+    for article in articles.iterator(chunk_size=CHUNK_SIZE):
+        record = {field: getattr(article, field) for field in ARTICLE_FIELDS}
+        record['url'] = article_url(article)
+        record['authors'] = [
+            {
+                'author_id': article_author.author_id,
+                'order': article_author.author_order,
+                'is_corresponding': article_author.is_corresponding,
+            }
+            for article_author in article.article_authors.all()
+        ]
+        yield 'article', record
+
+
+def _sha256(path):
+    checksum = hashlib.sha256()
+    with open(path, 'rb') as fh:
+        for block in iter(lambda: fh.read(HASH_BLOCK_SIZE), b''):
+            checksum.update(block)
+    return checksum.hexdigest()
+
+
+def write_dump(root, journal_id):
+    """Write one journal's dump; returns its manifest entry."""
+    counts = {}
+    slug = Journal.objects.values_list('slug', flat=True).get(pk=journal_id)
+    name = f'{slug}.jsonl.gz'
+
+    def write(fh):
+        # mtime=0 keeps the checksum of unchanged content stable
+        with gzip.GzipFile(fileobj=fh, mode='wb', mtime=0) as gz:
+            for record_type, record in journal_records(journal_id):
+                counts[record_type] = counts.get(record_type, 0) + 1
+                line = json.dumps({'type': record_type, **record}, cls=DjangoJSONEncoder, ensure_ascii=False)
+                gz.write(line.encode('utf-8') + b'\n')
+
+    write_atomic(root / name, write)
+    return {
+        'journal_id': journal_id,
+        'slug': slug,
+        'file': name,
+        'sha256': _sha256(root / name),
+        'size': (root / name).stat().st_size,
+        'records': counts,
+        'exported_at': timezone.now().isoformat(),
+    }
+
+
+def load_manifest(root):
+    try:
+        with open(root / MANIFEST_NAME) as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return {'journals': []}
+
+
+def export_metadata(force=False, journal_ids=None):
+    """
+    Bring the dumps up to date (only ``journal_ids`` if given). Returns
+    (exported, unchanged, removed) manifest entries.
+    """
+    root = export_root()
+    root.mkdir(parents=True, exist_ok=True)
+    previous = {entry['journal_id']: entry for entry in load_manifest(root)['journals']}
+    current = fingerprints()
+
+    exported, unchanged, entries = [], [], {}
+    for journal_id, fingerprint in current.items():
+        old = previous.get(journal_id)
+        selected = journal_ids is None or journal_id in journal_ids
+        up_to_date = old and old['fingerprint'] == fingerprint and (root / old['file']).exists()
+        if old and (not selected or (up_to_date and not force)):
+            entries[journal_id] = old
+            unchanged.append(old)
+            continue
+        if not selected:
+            continue
+        entry = {**write_dump(root, journal_id), 'fingerprint': fingerprint}
+        if old and old['file'] != entry['file']:
+            # The journal's slug changed
+            (root / old['file']).unlink(missing_ok=True)
+        entries[journal_id] = entry
+        exported.append(entry)
+
+    removed = [entry for journal_id, entry in previous.items() if journal_id not in current]
+    for entry in removed:
+        (root / entry['file']).unlink(missing_ok=True)
+
+    manifest = {
+        'format_version': FORMAT_VERSION,
+        'generated_at': timezone.now().isoformat(),
+        'journals': sorted(entries.values(), key=lambda entry: entry['slug']),
+    }
+    write_atomic(root / MANIFEST_NAME, lambda fh: fh.write(json.dumps(manifest, indent=2).encode()))
+    return exported, unchanged, removed
@@ -0,0 +1,254 @@
+"""
+RSS 2.0 and Atom feeds of newly published articles.
+
+Feeds exist site-wide, per journal and per subject (the journals filed
+under the subject or any subject below it), each listing the latest
+``FEED_SIZE`` public articles.
+
+Entries are rendered once per article and format and kept in the tagged
+cache (backend/caching.py) with the article's and its journal's tags, so
+they are dropped whenever the article, its authors or its journal change.
+Articles are rendered when they are published (syndication/signals.py);
+anything missing is rendered on the next request. Building a feed document
+is then one query for the IDs of its articles, two cache reads for their
+entries, and joining strings.
+
+Responses carry an ETag (a hash of the document) and a Last-Modified date
+(the latest change of a listed article), and conditional requests with a
+matching If-None-Match/If-Modified-Since get a 304 without a body.
+"""
+
+import hashlib
+from datetime import datetime, time, timezone as dt_timezone
+from xml.sax.saxutils import escape, quoteattr
+
+from django.db.models import F, Prefetch
+from django.utils.feedgenerator import rfc2822_date, rfc3339_date
+
+from articles.models import Article, ArticleAuthor
+from backend import caching
+from journals.models import Journal, Subject
+
+from .links import article_url, frontend_url
+from .oai import INVALID_XML_CHARS
+from .sitemaps import PUBLIC_ARTICLE_STATUSES, public_articles
+
+
+FEED_SIZE = 50
+ENTRY_TIMEOUT = 60 * 60 * 24 * 7
+ENTRY_KEY_PREFIX = 'feed-entry'
+
+FORMATS = {
+    'rss': 'application/rss+xml; charset=utf-8',
+    'atom': 'application/atom+xml; charset=utf-8',
+}
+
+
+def _element(tag, value, **attrs):
+    if value in (None, ''):
+        return ''
+    attributes = ''.join(f' {name}={quoteattr(str(attr))}' for name, attr in attrs.items())
+    return f'<{tag}{attributes}>{escape(INVALID_XML_CHARS.sub("", str(value)))}</{tag}>'
+
+
+# =============================================================================
+# Entries
+# =============================================================================
+
+def entry_key(output, article_id):
+    return f'{ENTRY_KEY_PREFIX}:{output}:{article_id}'
+
+
+def entry_tags(article):
+    return [caching.article_tag(article.pk), caching.journal_tag(article.get_journal.pk)]
+
+
+def _published(article):
+    """When the article was published, as an aware datetime."""
+    if article.published_date:
+        return datetime.combine(article.published_date, time.min, tzinfo=dt_timezone.utc)
+    return article.created_at
+
+
+def _entry_id(article):
+    return f'https://doi.org/{article.doi}' if article.doi else article_url(article)
+
+
+def rss_item(article):
+    journal = article.get_journal
+    authors = [aa.author.full_name for aa in article.article_authors.all()]
+    return ''.join([
+        '<item>',
+        _element('title', article.title),
+        _element('link', article_url(article)),
+        _element('guid', _entry_id(article), isPermaLink='false'),
+        _element('pubDate', rfc2822_date(_published(article))),
+        *[_element('dc:creator', name) for name in authors],
+        _element('description', article.abstract),
+        *[_element('category', keyword) for keyword in article.keywords or []],
+        _element('source', journal.title, url=frontend_url(journal.slug)) if journal else '',
+        '</item>',
+    ])
+
+
+def atom_entry(article):
+    url = article_url(article)
+    authors = ''.join(
+        f'<author>{_element("name", aa.author.full_name)}</author>'
+        for aa in article.article_authors.all()
+    )
+    return ''.join([
+        '<entry>',
+        _element('title', article.title),
+        _element('id', _entry_id(article)),
+        f'<link rel="alternate" type="text/html" href={quoteattr(url)}/>' if url else '',
+        _element('published', rfc3339_date(_published(article))),
+        _element('updated', rfc3339_date(article.updated_at)),
+        authors,
+        _element('summary', article.abstract),
+        *[f'<category term={quoteattr(keyword)}/>' for keyword in article.keywords or []],
+        '</entry>',
+    ])
+
+
+RENDERERS = {'rss': rss_item, 'atom': atom_entry}
+
+
+def entry_queryset():
+    return Article.objects.select_related(
+        'journal', 'issue__volume__journal', 'volume__journal'
+    ).prefetch_related(Prefetch(
+        'article_authors',
+        queryset=ArticleAuthor.objects.select_related('author').order_by('author_order')
+    ))
+
+
+def render_entries(article_ids, outputs=FORMATS):
+    """
+    Render and cache the entries of ``article_ids`` in ``outputs``; returns them by key.
+
+    Articles that aren't placed in a journal are skipped: they have no
+    public page to link to or identify them by, and no feed lists them.
+    """
+    articles = [
+        article
+        for article in entry_queryset().filter(pk__in=article_ids, status__in=PUBLIC_ARTICLE_STATUSES)
+        if article.get_journal is not None
+    ]
+    tags = {article.pk: entry_tags(article) for article in articles}
+    # Versions taken before rendering, so a purge meanwhile isn't missed
+    versions = caching.tag_versions(tag for article_tags in tags.values() for tag in article_tags)
+    values = {
+        entry_key(output, article.pk): RENDERERS[output](article)
+        for article in articles for output in outputs
+    }
+    caching.set_entries(
+        values,
+        {entry_key(output, article.pk): tags[article.pk] for article in articles for output in outputs},
+        ENTRY_TIMEOUT,
+        versions=versions
+    )
+    return values
+
+
+def entries(output, article_ids):
+    """Cached entries of ``article_ids`` in order, rendering the missing ones."""
+    keys = [entry_key(output, pk) for pk in article_ids]
+    found = caching.get_entries(keys)
+    missing = [pk for pk, key in zip(article_ids, keys) if key not in found]
+    if missing:
+        found.update(render_entries(missing, [output]))
+    return [found[key] for key in keys if key in found]
+
+
+# =============================================================================
+# Feeds
+# =============================================================================
+
+class Feed:
+    """One feed: its channel metadata and the articles it lists."""
+
+    def __init__(self, title, link, description, articles, author=''):
+        self.title = title
+        self.link = link
+        self.description = description
+        self.articles = articles
+        self.author = author
+
+    @classmethod
+    def site(cls):
+        from media_files.models import SiteSettings
+
+        site = SiteSettings.get_settings()
+        return cls(
+            site.site_name, frontend_url(), site.site_description,
+            public_articles().filter(owner_id__isnull=False), site.site_name,
+        )
+
+    @classmethod
+    def journal(cls, slug):
+        journal = Journal.objects.filter(slug=slug, is_active=True).first()
+        if journal is None:
+            return None
+        return cls(
+            journal.title, frontend_url(journal.slug),
+            journal.short_description or journal.description,
+            public_articles().filter(owner_id=journal.pk),
+            journal.publisher or journal.title,
+        )
+
+    @classmethod
+    def subject(cls, slug):
+        subject = Subject.objects.filter(slug=slug, is_active=True).first()
+        if subject is None:
+            return None
+        journal_ids = Journal.objects.filter(
+            is_active=True, subjects__in=Subject.objects.descendants_of(subject)
+        ).values('pk')
+        return cls(
+            subject.name, frontend_url('subjects'), subject.description,
+            public_articles().filter(owner_id__in=journal_ids), subject.name,
+        )
+
+    def latest(self):
+        """(pk, updated_at) of the listed articles, newest publication first."""
+        return list(self.articles.order_by(
+            F('published_date').desc(nulls_last=True), '-pk'
+        ).values_list('pk', 'updated_at')[:FEED_SIZE])
+
+    def render(self, output, self_url):
+        """The feed document in ``output`` format and its last-modified time."""
+        rows = self.latest()
+        last_modified = max((updated_at for _, updated_at in rows), default=None)
+        items = ''.join(entries(output, [pk for pk, _ in rows]))
+        if output == 'rss':
+            document = (
+                '<rss version="2.0" xmlns:atom="http://www.w3.org/2005/Atom"'
+                ' xmlns:dc="http://purl.org/dc/elements/1.1/"><channel>'
+                f'{_element("title", self.title)}'
+                f'{_element("link", self.link)}'
+                f'{_element("description", self.description or self.title)}'
+                f'{_element("lastBuildDate", rfc2822_date(last_modified) if last_modified else None)}'
+                f'<atom:link href={quoteattr(self_url)} rel="self" type="application/rss+xml"/>'
+                f'{items}'
+                '</channel></rss>'
+            )
+        else:
+            document = (
+                '<feed xmlns="http://www.w3.org/2005/Atom">'
+                f'{_element("title", self.title)}'
+                f'{_element("subtitle", self.description)}'
+                f'{_element("id", self_url)}'
+                f'<link rel="alternate" type="text/html" href={quoteattr(self.link)}/>'
+                f'<link rel="self" href={quoteattr(self_url)}/>'
+                f'{_element("updated", rfc3339_date(last_modified or datetime.now(dt_timezone.utc)))}'
+                f'<author>{_element("name", self.author or self.title)}</author>'
+                f'{items}'
+                '</feed>'
+            )
+        content = f'<?xml version="1.0" encoding="UTF-8"?>\n{document}'.encode('utf-8')
+        return content, last_modified
+
+
+def etag(content):
+    return f'"{hashlib.md5(content).hexdigest()}"'
@@ -0,0 +1,17 @@
+"""Public (frontend) URLs of journals and articles, for harvesters and feeds."""
+
+from django.conf import settings
+
+
+def frontend_url(*parts):
+    """Absolute URL on the public site, e.g. frontend_url('tests', 'article', 'slug')."""
+    path = '/'.join(str(part).strip('/') for part in parts if part not in (None, ''))
+    return f'{settings.FRONTEND_URL}/{path}' if path else f'{settings.FRONTEND_URL}/'
+
+
+def article_url(article):
+    """Public page of ``article``, or None if it isn't placed in a journal."""
+    journal = article.get_journal
+    if journal is None:
+        return None
+    return frontend_url(journal.slug, 'article', article.slug)
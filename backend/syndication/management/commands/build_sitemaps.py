@@ -0,0 +1,29 @@
+"""
+Management command to (re)build the sitemap files.
+
+Run it on a schedule (e.g. from cron); only the sitemap groups whose
+content changed since the last run are rewritten (see syndication/sitemaps.py).
+"""
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from syndication.sitemaps import INDEX_NAME, build_sitemaps
+
+
+class Command(BaseCommand):
+    help = 'Rebuild changed sitemap shards and the sitemap index under MEDIA_ROOT/sitemaps/'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Rewrite every shard, changed or not',
+        )
+
+    def handle(self, *args, **options):
+        rebuilt, unchanged, removed = build_sitemaps(force=options['force'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Sitemaps: {len(rebuilt)} groups rebuilt, {len(unchanged)} unchanged, '
+            f'{len(removed)} removed. Index: {settings.SITEMAP_URL}{INDEX_NAME}'
+        ))
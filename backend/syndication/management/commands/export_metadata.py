@@ -0,0 +1,48 @@
+"""
+Management command to write the per-journal metadata dumps.
+
+Meant to run nightly (e.g. from cron); only journals whose content changed
+since the last run are exported again (see syndication/exports.py).
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from journals.models import Journal
+from syndication.exports import MANIFEST_NAME, export_metadata, export_root
+
+
+class Command(BaseCommand):
+    help = 'Write gzip JSON Lines metadata dumps per journal to MEDIA_ROOT/exports/ with a checksum manifest'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--journal',
+            action='append',
+            default=[],
+            help='Only export this journal (slug); can be repeated',
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Export even if nothing changed since the last run',
+        )
+
+    def handle(self, *args, **options):
+        journal_ids = None
+        if options['journal']:
+            found = dict(Journal.objects.filter(slug__in=options['journal']).values_list('slug', 'pk'))
+            unknown = sorted(set(options['journal']) - set(found))
+            if unknown:
+                raise CommandError(f'Unknown journal(s): {", ".join(unknown)}')
+            journal_ids = set(found.values())
+
+        exported, unchanged, removed = export_metadata(force=options['force'], journal_ids=journal_ids)
+        for entry in exported:
+            self.stdout.write(
+                f'  {entry["file"]}: {entry["records"].get("article", 0)} articles, '
+                f'{entry["size"] / 1024:.1f} KB'
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f'Exported {len(exported)} journals ({len(unchanged)} unchanged, {len(removed)} removed). '
+            f'Manifest: {export_root() / MANIFEST_NAME}'
+        ))
@@ -0,0 +1,527 @@
+"""
+OAI-PMH 2.0 provider for article metadata.
+
+Indexers harvest published and archived articles through the six protocol
+verbs, in two metadata formats: unqualified Dublin Core (``oai_dc``) and
+the JATS ``<front>`` of each article (``jats``). Each active journal is a
+set, named by its slug.
+
+Lists are ordered by (``updated_at``, ``pk``) and split into pages of
+``PAGE_SIZE`` records. The resumption token carries the position of the
+last record sent (keyset pagination) together with the harvest arguments,
+signed so it can't be tampered with, so every page is one indexed range
+query - no OFFSET, no COUNT - and tokens never expire. Selective
+harvesting with ``from``/``until`` filters on ``updated_at``.
+
+Records are read from a server-side cursor and written out one at a time
+(``stream_list``), so a page starts arriving as soon as its first row is
+read. Protocol errors are reported before streaming starts.
+
+Datestamps follow ``Article.updated_at``, which changes whenever the
+article itself is saved.
+"""
+
+import re
+from datetime import datetime, timedelta, timezone as dt_timezone
+from itertools import chain
+from urllib.parse import urlsplit
+from xml.sax.saxutils import escape, quoteattr
+
+from django.conf import settings
+from django.core import signing
+from django.db.models import Min, Prefetch, Q
+from django.utils import timezone
+
+from articles.models import Article, ArticleAuthor
+from journals.models import Journal
+
+from .links import article_url
+
+
+PAGE_SIZE = 100
+CHUNK_SIZE = 50
+PUBLIC_ARTICLE_STATUSES = ['published', 'archive']
+
+VERBS = ('Identify', 'ListMetadataFormats', 'ListSets', 'ListIdentifiers', 'ListRecords', 'GetRecord')
+
+# Allowed arguments per verb: (required, optional, exclusive)
+VERB_ARGUMENTS = {
+    'Identify': (set(), set(), None),
+    'ListMetadataFormats': (set(), {'identifier'}, None),
+    'ListSets': (set(), set(), 'resumptionToken'),
+    'ListIdentifiers': ({'metadataPrefix'}, {'from', 'until', 'set'}, 'resumptionToken'),
+    'ListRecords': ({'metadataPrefix'}, {'from', 'until', 'set'}, 'resumptionToken'),
+    'GetRecord': ({'identifier', 'metadataPrefix'}, set(), None),
+}
+
+METADATA_FORMATS = {
+    'oai_dc': (
+        'http://www.openarchives.org/OAI/2.0/oai_dc.xsd',
+        'http://www.openarchives.org/OAI/2.0/oai_dc/',
+    ),
+    'jats': (
+        'https://jats.nlm.nih.gov/publishing/1.3/xsd/JATS-journalpublishing1-3.xsd',
+        'https://jats.nlm.nih.gov/ns/archiving/1.3/',
+    ),
+}
+
+TOKEN_SALT = 'syndication.oai'
+DATESTAMP_FORMAT = '%Y-%m-%dT%H:%M:%SZ'
+
+# Characters XML 1.0 doesn't allow, even escaped
+INVALID_XML_CHARS = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]')
+
+
+class OAIError(Exception):
+    """A protocol error, reported as <error code="...">."""
+
+    def __init__(self, code, message):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+
+# =============================================================================
+# XML helpers
+# =============================================================================
+
+def _text(value):
+    return escape(INVALID_XML_CHARS.sub('', str(value)))
+
+
+def _element(tag, value, **attrs):
+    """``<tag attrs>value</tag>``, or '' when there is no value."""
+    if value in (None, ''):
+        return ''
+    attributes = ''.join(
+        f' {name.replace("_", "-")}={quoteattr(str(attr))}'
+        for name, attr in attrs.items()
+    )
+    return f'<{tag}{attributes}>{_text(value)}</{tag}>'
+
+
+def _datestamp(value):
+    return value.astimezone(dt_timezone.utc).strftime(DATESTAMP_FORMAT)
+
+
+def response_date():
+    return _datestamp(timezone.now())
+
+
+# =============================================================================
+# Arguments and resumption tokens
+# =============================================================================
+
+def parse_arguments(params):
+    """
+    Validate the request arguments (a QueryDict) and return the verb and a
+    dict of arguments. Raises OAIError for bad verbs and arguments.
+    """
+    verb = params.get('verb')
+    if verb not in VERBS or len(params.getlist('verb')) != 1:
+        raise OAIError('badVerb', 'Illegal or missing OAI-PMH verb.')
+
+    arguments = {}
+    for name, values in params.lists():
+        if name == 'verb':
+            continue
+        if len(values) != 1:
+            raise OAIError('badArgument', f'Argument "{name}" is repeated.')
+        arguments[name] = values[0]
+
+    required, optional, exclusive = VERB_ARGUMENTS[verb]
+    if exclusive and exclusive in arguments:
+        if len(arguments) != 1:
+            raise OAIError('badArgument', f'"{exclusive}" is an exclusive argument.')
+        return verb, arguments
+    unknown = set(arguments) - required - optional
+    if unknown:
+        raise OAIError('badArgument', f'Illegal argument(s): {", ".join(sorted(unknown))}.')
+    missing = required - set(arguments)
+    if missing:
+        raise OAIError('badArgument', f'Missing argument(s): {", ".join(sorted(missing))}.')
+    return verb, arguments
+
+
+def parse_datestamp(value, name):
+    """(datetime in UTC, whether it has day granularity) for a from/until value."""
+    for fmt, is_day in ((DATESTAMP_FORMAT, False), ('%Y-%m-%d', True)):
+        try:
+            parsed = datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+        return parsed.replace(tzinfo=dt_timezone.utc), is_day
+    raise OAIError('badArgument', f'"{name}" must be YYYY-MM-DD or YYYY-MM-DDThh:mm:ssZ.')
+
+
+def encode_token(state):
+    return signing.dumps(state, salt=TOKEN_SALT, compress=True)
+
+
+def decode_token(token):
+    try:
+        state = signing.loads(token, salt=TOKEN_SALT)
+    except signing.BadSignature:
+        raise OAIError('badResumptionToken', 'The resumption token is invalid.')
+    return state
+
+
+def list_state(arguments):
+    """
+    Harvest state for ListIdentifiers/ListRecords: metadata prefix, set,
+    date range (ISO strings) and the keyset position after the last record.
+    """
+    if 'resumptionToken' in arguments:
+        return decode_token(arguments['resumptionToken'])
+
+    prefix = arguments['metadataPrefix']
+    if prefix not in METADATA_FORMATS:
+        raise OAIError('cannotDisseminateFormat', f'Unsupported metadata format "{prefix}".')
+
+    start = end = None
+    granularities = set()
+    if 'from' in arguments:
+        start, is_day = parse_datestamp(arguments['from'], 'from')
+        granularities.add(is_day)
+    if 'until' in arguments:
+        until, is_day = parse_datestamp(arguments['until'], 'until')
+        granularities.add(is_day)
+        # until is inclusive at its own granularity
+        end = until + (timedelta(days=1) if is_day else timedelta(seconds=1))
+    if len(granularities) > 1:
+        raise OAIError('badArgument', '"from" and "until" must have the same granularity.')
+    if start and end and start >= end:
+        raise OAIError('badArgument', '"from" is later than "until".')
+
+    set_spec = arguments.get('set')
+    if set_spec and not Journal.objects.filter(slug=set_spec, is_active=True).exists():
+        raise OAIError('noRecordsMatch', f'No set "{set_spec}".')
+
+    return {
+        'prefix': prefix,
+        'set': set_spec,
+        'from': start.isoformat() if start else None,
+        'until': end.isoformat() if end else None,
+        'after': None,
+    }
+
+
+# =============================================================================
+# Records
+# =============================================================================
+
+def repository_domain():
+    return urlsplit(settings.FRONTEND_URL).hostname or 'localhost'
+
+
+def oai_identifier(article):
+    return f'oai:{repository_domain()}:article/{article.pk}'
+
+
+def article_pk_from_identifier(identifier):
+    match = re.fullmatch(rf'oai:{re.escape(repository_domain())}:article/(\d+)', identifier)
+    if match is None:
+        raise OAIError('idDoesNotExist', f'Unknown identifier "{identifier}".')
+    return int(match.group(1))
+
+
+def harvest_queryset(with_metadata=True):
+    """Public articles in harvest order, with what headers and records need."""
+    queryset = Article.objects.filter(
+        status__in=PUBLIC_ARTICLE_STATUSES
+    ).select_related(
+        'journal', 'issue__volume__journal', 'volume__journal'
+    ).order_by('updated_at', 'pk')
+    if with_metadata:
+        queryset = queryset.prefetch_related(Prefetch(
+            'article_authors',
+            queryset=ArticleAuthor.objects.select_related('author').order_by('author_order')
+        ))
+    return queryset
+
+
+def list_queryset(state, with_metadata):
+    queryset = harvest_queryset(with_metadata)
+    if state['set']:
+        queryset = queryset.filter(
+            Q(journal__slug=state['set']) |
+            Q(issue__volume__journal__slug=state['set']) |
+            Q(volume__journal__slug=state['set'])
+        )
+    if state['from']:
+        queryset = queryset.filter(updated_at__gte=datetime.fromisoformat(state['from']))
+    if state['until']:
+        queryset = queryset.filter(updated_at__lt=datetime.fromisoformat(state['until']))
+    if state['after']:
+        updated_at, pk = state['after']
+        updated_at = datetime.fromisoformat(updated_at)
+        queryset = queryset.filter(
+            Q(updated_at__gt=updated_at) | Q(updated_at=updated_at, pk__gt=pk)
+        )
+    return queryset
+
+
+def header(article):
+    journal = article.get_journal
+    return (
+        '<header>'
+        f'{_element("identifier", oai_identifier(article))}'
+        f'{_element("datestamp", _datestamp(article.updated_at))}'
+        f'{_element("setSpec", journal.slug if journal else None)}'
+        '</header>'
+    )
+
+
+def dublin_core(article):
+    """Unqualified Dublin Core record of ``article``."""
+    journal = article.get_journal
+    parts = [
+        _element('dc:title', article.title),
+        *[_element('dc:creator', aa.author.citation_name) for aa in article.article_authors.all()],
+        *[_element('dc:subject', keyword) for keyword in article.keywords or []],
+        _element('dc:description', article.abstract),
+        _element('dc:publisher', journal.publisher if journal else None),
+        _element('dc:date', article.published_date.isoformat() if article.published_date else None),
+        _element('dc:type', 'Text'),
+        _element('dc:type', article.get_article_type_display()),
+        _element('dc:identifier', article_url(article)),
+        _element('dc:identifier', f'https://doi.org/{article.doi}' if article.doi else None),
+        _element('dc:source', journal.title if journal else None),
+        _element('dc:source', journal.issn_online if journal else None),
+        _element('dc:rights', article.license_text),
+    ]
+    return (
+        '<oai_dc:dc xmlns:oai_dc="http://www.openarchives.org/OAI/2.0/oai_dc/"'
+        ' xmlns:dc="http://purl.org/dc/elements/1.1/"'
+        ' xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance"'
+        ' xsi:schemaLocation="http://www.openarchives.org/OAI/2.0/oai_dc/'
+        ' http://www.openarchives.org/OAI/2.0/oai_dc.xsd">'
+        f'{"".join(parts)}'
+        '</oai_dc:dc>'
+    )
+
+
+def _jats_date(tag, value, **attrs):
+    if value is None:
+        return ''
+    attributes = ''.join(f' {name.replace("_", "-")}={quoteattr(attr)}' for name, attr in attrs.items())
+    return (
+        f'<{tag}{attributes}>'
+        f'<day>{value.day:02d}</day><month>{value.month:02d}</month><year>{value.year}</year>'
+        f'</{tag}>'
+    )
+
+
+def _jats_contrib(article_author):
+    author = article_author.author
+    corresp = ' corresp="yes"' if article_author.is_corresponding else ''
+    orcid = author.orcid_id
+    if orcid and not orcid.startswith('http'):
+        orcid = f'https://orcid.org/{orcid}'
+    return (
+        f'<contrib contrib-type="author"{corresp}>'
+        f'{_element("contrib-id", orcid, contrib_id_type="orcid")}'
+        '<name>'
+        f'{_element("surname", author.last_name)}'
+        f'{_element("given-names", author.first_name)}'
+        '</name>'
+        f'{_element("email", author.email)}'
+        f'{_element("aff", author.affiliation)}'
+        '</contrib>'
+    )
+
+
+def jats_front(article):
+    """JATS <article> with the <front> (journal and article metadata) of ``article``."""
+    journal = article.get_journal
+    journal_meta = ''
+    if journal is not None:
+        journal_meta = (
+            '<journal-meta>'
+            f'{_element("journal-id", journal.slug, journal_id_type="publisher-id")}'
+            f'<journal-title-group>{_element("journal-title", journal.title)}'
+            f'{_element("abbrev-journal-title", journal.short_title)}</journal-title-group>'
+            f'{_element("issn", journal.issn_print, pub_type="ppub")}'
+            f'{_element("issn", journal.issn_online, pub_type="epub")}'
+            f'{"<publisher>" + _element("publisher-name", journal.publisher) + "</publisher>" if journal.publisher else ""}'
+            '</journal-meta>'
+        )
+
+    contribs = ''.join(_jats_contrib(aa) for aa in article.article_authors.all())
+    history = ''.join([
+        _jats_date('date', article.received_date, date_type='received'),
+        _jats_date('date', article.revised_date, date_type='rev-recd'),
+        _jats_date('date', article.accepted_date, date_type='accepted'),
+    ])
+    url = article_url(article)
+    keywords = ''.join(_element('kwd', keyword) for keyword in article.keywords or [])
+    article_meta = (
+        '<article-meta>'
+        f'{_element("article-id", article.doi, pub_id_type="doi")}'
+        f'{_element("article-id", article.article_id_code, pub_id_type="publisher-id")}'
+        f'<title-group>{_element("article-title", article.title)}</title-group>'
+        f'{"<contrib-group>" + contribs + "</contrib-group>" if contribs else ""}'
+        f'{_jats_date("pub-date", article.published_date, date_type="pub", publication_format="electronic")}'
+        f'{_element("volume", article.volume_number)}'
+        f'{_element("issue", article.issue_number)}'
+        f'{_element("fpage", article.page_start)}'
+        f'{_element("lpage", article.page_end)}'
+        f'{_element("elocation-id", article.article_number)}'
+        f'{"<history>" + history + "</history>" if history else ""}'
+        f'{"<permissions><license>" + _element("license-p", article.license_text) + "</license></permissions>" if article.license_text else ""}'
+        f'{"<self-uri xlink:href=" + quoteattr(url) + "/>" if url else ""}'
+        f'{"<abstract>" + _element("p", article.abstract) + "</abstract>" if article.abstract else ""}'
+        f'{"<kwd-group>" + keywords + "</kwd-group>" if keywords else ""}'
+        '</article-meta>'
+    )
+    return (
+        f'<article xmlns="{METADATA_FORMATS["jats"][1]}"'
+        ' xmlns:xlink="http://www.w3.org/1999/xlink"'
+        f' article-type={quoteattr(article.article_type)}>'
+        f'<front>{journal_meta}{article_meta}</front>'
+        '</article>'
+    )
+
+
+RENDERERS = {'oai_dc': dublin_core, 'jats': jats_front}
+
+
+def record(article, prefix):
+    return f'<record>{header(article)}<metadata>{RENDERERS[prefix](article)}</metadata></record>'
+
+
+# =============================================================================
+# Verbs
+# =============================================================================
+
+def identify(base_url):
+    from media_files.models import SiteSettings
+
+    site = SiteSettings.get_settings()
+    earliest = Article.objects.filter(
+        status__in=PUBLIC_ARTICLE_STATUSES
+    ).aggregate(earliest=Min('updated_at'))['earliest']
+    return (
+        '<Identify>'
+        f'{_element("repositoryName", site.site_name or repository_domain())}'
+        f'{_element("baseURL", base_url)}'
+        '<protocolVersion>2.0</protocolVersion>'
+        f'{_element("adminEmail", site.contact_email or settings.DEFAULT_FROM_EMAIL)}'
+        f'{_element("earliestDatestamp", _datestamp(earliest or timezone.now()))}'
+        '<deletedRecord>no</deletedRecord>'
+        '<granularity>YYYY-MM-DDThh:mm:ssZ</granularity>'
+        '</Identify>'
+    )
+
+
+def list_metadata_formats(arguments):
+    if 'identifier' in arguments:
+        get_article(arguments['identifier'])
+    formats = ''.join(
+        '<metadataFormat>'
+        f'{_element("metadataPrefix", prefix)}{_element("schema", schema)}'
+        f'{_element("metadataNamespace", namespace)}'
+        '</metadataFormat>'
+        for prefix, (schema, namespace) in METADATA_FORMATS.items()
+    )
+    return f'<ListMetadataFormats>{formats}</ListMetadataFormats>'
+
+
+def list_sets():
+    journals = Journal.objects.filter(is_active=True).order_by('slug').values_list('slug', 'title')
+    sets = ''.join(
+        f'<set>{_element("setSpec", slug)}{_element("setName", title)}</set>'
+        for slug, title in journals
+    )
+    return f'<ListSets>{sets}</ListSets>'
+
+
+def get_article(identifier):
+    article = harvest_queryset().filter(pk=article_pk_from_identifier(identifier)).first()
+    if article is None:
+        raise OAIError('idDoesNotExist', f'Unknown identifier "{identifier}".')
+    return article
+
+
+def get_record(arguments):
+    prefix = arguments['metadataPrefix']
+    if prefix not in METADATA_FORMATS:
+        raise OAIError('cannotDisseminateFormat', f'Unsupported metadata format "{prefix}".')
+    article = get_article(arguments['identifier'])
+    return f'<GetRecord>{record(article, prefix)}</GetRecord>'
+
+
+def stream_list(verb, arguments):
+    """
+    Chunks of the ListIdentifiers/ListRecords element for one page.
+
+    The first row is read before returning, so an empty result raises
+    noRecordsMatch instead of producing an empty list.
+    """
+    state = list_state(arguments)
+    with_metadata = verb == 'ListRecords'
+    rows = list_queryset(state, with_metadata)[:PAGE_SIZE + 1].iterator(chunk_size=CHUNK_SIZE)
+    first = next(rows, None)
+    if first is None:
+        raise OAIError('noRecordsMatch', 'No records match the request.')
+
+    def chunks():
+        yield f'<{verb}>'
+        last = None
+        sent = 0
+        for article in chain([first], rows):
+            if sent == PAGE_SIZE:
+                # One row past the page: there is more, resume after the last sent
+                token = encode_token({**state, 'after': [last.updated_at.isoformat(), last.pk]})
+                yield _element('resumptionToken', token)
+                break
+            yield record(article, state['prefix']) if with_metadata else header(article)
+            last = article
+            sent += 1
+        else:
+            if state['after']:
+                # Last page of a list that was split
+                yield '<resumptionToken/>'
+        yield f'</{verb}>'
+
+    return chunks()
+
+
+def respond(params, base_url):
+    """
+    The OAI-PMH response to ``params`` as an iterable of str chunks.
+
+    Errors are detected before the first chunk is produced.
+    """
+    verb = None
+    arguments = {}
+    try:
+        verb, arguments = parse_arguments(params)
+        if verb == 'Identify':
+            body = [identify(base_url)]
+        elif verb == 'ListMetadataFormats':
+            body = [list_metadata_formats(arguments)]
+        elif verb == 'ListSets':
+            if 'resumptionToken' in arguments:
+                raise OAIError('badResumptionToken', 'ListSets is not split into pages.')
+            body = [list_sets()]
+        elif verb == 'GetRecord':
+            body = [get_record(arguments)]
+        else:
+            body = stream_list(verb, arguments)
+        request_element = _element('request', base_url, verb=verb, **arguments)
+    except OAIError as error:
+        # Arguments are echoed only when the request itself was well-formed
+        echo = {'verb': verb, **arguments} if error.code not in ('badVerb', 'badArgument') else {}
+        request_element = _element('request', base_url, **echo)
+        body = [_element('error', error.message, code=error.code)]
+
+    return chain([
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<OAI-PMH xmlns="http://www.openarchives.org/OAI/2.0/"'
+        ' xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance"'
+        ' xsi:schemaLocation="http://www.openarchives.org/OAI/2.0/'
+        ' http://www.openarchives.org/OAI/2.0/OAI-PMH.xsd">'
+        f'{_element("responseDate", response_date())}'
+        f'{request_element}'
+    ], body, ['</OAI-PMH>'])
@@ -0,0 +1,22 @@
+"""
+Signal handlers for the syndication app.
+
+Renders the feed entries of an article (syndication/feeds.py) as soon as
+it is published, once the publishing transaction has committed.
+"""
+
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from articles.models import Article
+
+from . import feeds
+
+
+@receiver(post_save, sender=Article)
+def article_published(sender, instance, raw=False, **kwargs):
+    if raw or instance.status not in feeds.PUBLIC_ARTICLE_STATUSES:
+        return
+    article_id = instance.pk
+    transaction.on_commit(lambda: feeds.render_entries([article_id]))
@@ -0,0 +1,295 @@
+"""
+Sharded, incrementally rebuilt XML sitemaps.
+
+Sitemaps are written as static files under ``MEDIA_ROOT/sitemaps/`` and
+published at ``SITEMAP_URL``:
+
+- ``sitemap.xml``: the sitemap index, listing every shard
+- ``site-{n}.xml.gz``: the frontend's static pages (``SITE_PATHS``) and
+  news posts
+- ``journal-{id}-{n}.xml.gz``: one group per active journal - its home,
+  volumes, issues and articles - split into shards of at most
+  ``MAX_URLS_PER_SHARD`` URLs
+
+Each group has a fingerprint of the rows it is built from: count, latest
+``updated_at`` and sum of primary keys per model, read with one grouped
+query per model for all journals together. A build only rewrites the
+groups whose fingerprint changed since the last one (recorded in
+``manifest.json``); the rows of a group are streamed from a server-side
+cursor into gzip files written next to the old ones and swapped in
+atomically. Groups of journals that were removed or deactivated are
+deleted.
+
+An article belongs to the journal ``Article.get_journal`` returns: its own
+journal, else its issue's volume's journal, else its volume's journal.
+
+Only URLs the frontend has a route for are listed. CMS pages (Page rows)
+have none - the frontend's about, contact and information pages are static
+routes, and a journal's sections are tabs of its home page - so they are
+not listed on their own.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.db.models import Count, Max, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from articles.models import Article
+from issues.models import Issue
+from journals.models import Announcement, Journal
+from volumes.models import Volume
+
+from .links import frontend_url
+
+
+SITEMAP_DIR = 'sitemaps'
+INDEX_NAME = 'sitemap.xml'
+MANIFEST_NAME = 'manifest.json'
+MAX_URLS_PER_SHARD = 50000
+CHUNK_SIZE = 2000
+PUBLIC_ARTICLE_STATUSES = ['published', 'archive']
+
+# Static routes of the frontend (frontend/src/app), except search and admin
+SITE_PATHS = [
+    '', 'journals', 'subjects', 'news', 'indexing-journals',
+    'about', 'about/open-access-policy', 'contact', 'publish-with-us', 'services',
+    'information/ethical-guidelines',
+    'information/ethical-guidelines/aethra-advisory-board',
+    'information/ethical-guidelines/allegations-from-whistleblowers',
+    'information/ethical-guidelines/conflict-of-interest',
+    'information/ethical-guidelines/fabricating-and-stating-false-information',
+    'information/ethical-guidelines/plagiarism-prevention',
+    'information/ethical-guidelines/post-publication-discussions-and-corrections',
+    'information/ethical-guidelines/publishing-ethics',
+    'information/ethical-guidelines/research-misconduct',
+    'information/for-authors/archiving-policies',
+    'information/for-authors/article-processing-charges-policy',
+    'information/for-authors/author-benefits',
+    'information/for-authors/author-support-services',
+    'information/for-authors/authorship',
+    'information/for-authors/institutional-membership',
+    'information/for-authors/instructions-for-authors',
+    'information/for-authors/manuscript-transfer-facility',
+    'information/for-authors/special-fee-waivers-and-discount',
+    'information/for-editors-and-reviewers',
+    'information/for-editors-and-reviewers/editorial-management',
+    'information/for-editors-and-reviewers/editorial-policies',
+    'information/for-editors-and-reviewers/ensuring-content-integrity',
+    'information/for-editors-and-reviewers/ethical-guidelines-for-new-editors',
+    'information/for-editors-and-reviewers/guest-editors-guidelines',
+    'information/for-editors-and-reviewers/guidelines-for-reviewers',
+    'information/for-editors-and-reviewers/peer-review-workflow',
+    'information/for-editors-and-reviewers/publication-process',
+    'information/for-editors-and-reviewers/virtual-special-issues',
+]
+
+XMLNS = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+
+
+def sitemap_root():
+    return Path(settings.MEDIA_ROOT) / SITEMAP_DIR
+
+
+def public_articles():
+    """Public articles, annotated with the ID of the journal they belong to."""
+    return Article.objects.filter(status__in=PUBLIC_ARTICLE_STATUSES).annotate(
+        owner_id=Coalesce('journal_id', 'issue__volume__journal_id', 'volume__journal_id')
+    )
+
+
+def _lastmod(value):
+    return value.date().isoformat() if value else None
+
+
+# =============================================================================
+# Fingerprints
+# =============================================================================
+
+def summaries(queryset, group_field, updated_field='updated_at'):
+    """{group: (count, latest update, sum of pks)} in one grouped query."""
+    rows = queryset.order_by().values(group_field).annotate(
+        n=Count('pk'), latest=Max(updated_field), keys=Sum('pk')
+    ).values_list(group_field, 'n', 'latest', 'keys')
+    return {group: (n, latest, keys) for group, n, latest, keys in rows}
+
+
+def summary(queryset):
+    """(count, latest updated_at, sum of pks) of the whole queryset."""
+    totals = queryset.aggregate(n=Count('pk'), latest=Max('updated_at'), keys=Sum('pk'))
+    return totals['n'], totals['latest'], totals['keys']
+
+
+def digest(*parts):
+    return hashlib.md5(repr(parts).encode()).hexdigest()
+
+
+def fingerprints():
+    """{group name: (fingerprint, lastmod)} for every group the sitemap has now."""
+    journals = list(Journal.objects.filter(is_active=True).values_list('pk', 'slug', 'updated_at'))
+    articles = summaries(public_articles(), 'owner_id')
+    volumes = summaries(Volume.objects.filter(is_active=True), 'journal_id')
+    issues = summaries(Issue.objects.filter(is_active=True), 'volume__journal_id')
+
+    groups = {}
+    for pk, slug, updated_at in journals:
+        parts = (slug, updated_at, articles.get(pk), volumes.get(pk), issues.get(pk))
+        latest = max(
+            [updated_at] + [found[pk][1] for found in (articles, volumes, issues) if pk in found]
+        )
+        groups[f'journal-{pk}'] = (digest(*parts), latest)
+
+    news = summary(Announcement.objects.filter(is_published=True))
+    groups['site'] = (digest(SITE_PATHS, news), news[1])
+    return groups
+
+
+# =============================================================================
+# URL entries
+# =============================================================================
+
+def site_entries():
+    for path in SITE_PATHS:
+        yield frontend_url(path), None
+    announcements = Announcement.objects.filter(is_published=True).order_by('pk').values_list('slug', 'updated_at')
+    for slug, updated_at in announcements.iterator(chunk_size=CHUNK_SIZE):
+        yield frontend_url('news', slug), updated_at
+
+
+def journal_entries(journal_id):
+    slug, updated_at = Journal.objects.filter(pk=journal_id).values_list('slug', 'updated_at').get()
+    yield frontend_url(slug), updated_at
+    yield frontend_url(slug, 'volumes'), None
+
+    volumes = Volume.objects.filter(
+        journal_id=journal_id, is_active=True
+    ).order_by('volume_number').values_list('volume_number', 'updated_at')
+    for number, updated_at in volumes.iterator(chunk_size=CHUNK_SIZE):
+        yield frontend_url(slug, 'volumes', number), updated_at
+
+    # Issue pages are addressed by number alone
+    issues = Issue.objects.filter(
+        volume__journal_id=journal_id, is_active=True
+    ).order_by('issue_number').values('issue_number').annotate(latest=Max('updated_at'))
+    for row in issues:
+        yield frontend_url(slug, 'issue', row['issue_number']), row['latest']
+
+    articles = public_articles().filter(owner_id=journal_id).order_by('pk').values_list('slug', 'updated_at')
+    for article_slug, updated_at in articles.iterator(chunk_size=CHUNK_SIZE):
+        yield frontend_url(slug, 'article', article_slug), updated_at
+
+
+# =============================================================================
+# Files
+# =============================================================================
+
+def write_atomic(path, write):
+    """Write ``path`` through ``write(file)`` on a temporary file, then swap it in."""
+    tmp = path.with_name(f'.{path.name}.tmp')
+    with open(tmp, 'wb') as fh:
+        write(fh)
+    os.replace(tmp, path)
+
+
+def write_shards(root, group, entries):
+    """Write ``entries`` as gzip shards ``{group}-{n}.xml.gz``; returns their names."""
+    names = []
+    entries = iter(entries)
+    pending = next(entries, None)
+    while pending is not None or not names:
+        name = f'{group}-{len(names) + 1}.xml.gz'
+
+        def write(fh):
+            nonlocal pending
+            # mtime=0 keeps unchanged shards byte-identical between builds
+            with gzip.GzipFile(fileobj=fh, mode='wb', mtime=0) as gz:
+                gz.write(f'<?xml version="1.0" encoding="UTF-8"?>\n<urlset xmlns="{XMLNS}">\n'.encode())
+                written = 0
+                while pending is not None and written < MAX_URLS_PER_SHARD:
+                    loc, updated_at = pending
+                    lastmod = _lastmod(updated_at)
+                    gz.write((
+                        f'<url><loc>{escape(loc)}</loc>'
+                        f'{f"<lastmod>{lastmod}</lastmod>" if lastmod else ""}</url>\n'
+                    ).encode())
+                    written += 1
+                    pending = next(entries, None)
+                gz.write(b'</urlset>\n')
+
+        write_atomic(root / name, write)
+        names.append(name)
+    return names
+
+
+def write_index(root, manifest):
+    base_url = settings.SITEMAP_URL
+
+    def write(fh):
+        fh.write(f'<?xml version="1.0" encoding="UTF-8"?>\n<sitemapindex xmlns="{XMLNS}">\n'.encode())
+        for group in sorted(manifest['groups']):
+            info = manifest['groups'][group]
+            lastmod = f'<lastmod>{info["lastmod"]}</lastmod>' if info['lastmod'] else ''
+            for name in info['files']:
+                fh.write(f'<sitemap><loc>{escape(base_url + name)}</loc>{lastmod}</sitemap>\n'.encode())
+        fh.write(b'</sitemapindex>\n')
+
+    write_atomic(root / INDEX_NAME, write)
+
+
+def load_manifest(root):
+    try:
+        with open(root / MANIFEST_NAME) as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return {'groups': {}}
+
+
+def build_sitemaps(force=False):
+    """
+    Bring the sitemap files up to date. Returns (rebuilt, unchanged,
+    removed) group names.
+    """
+    root = sitemap_root()
+    root.mkdir(parents=True, exist_ok=True)
+    manifest = load_manifest(root)
+    previous = manifest['groups']
+    current = fingerprints()
+
+    rebuilt, unchanged = [], []
+    groups = {}
+    for group, (fingerprint, latest) in current.items():
+        old = previous.get(group)
+        if (
+            not force and old and old['fingerprint'] == fingerprint
+            and all((root / name).exists() for name in old['files'])
+        ):
+            groups[group] = old
+            unchanged.append(group)
+            continue
+        if group == 'site':
+            entries = site_entries()
+        else:
+            entries = journal_entries(int(group.split('-', 1)[1]))
+        files = write_shards(root, group, entries)
+        # Shards left over from a larger earlier build
+        for name in set(old['files'] if old else []) - set(files):
+            (root / name).unlink(missing_ok=True)
+        groups[group] = {'fingerprint': fingerprint, 'files': files, 'lastmod': _lastmod(latest)}
+        rebuilt.append(group)
+
+    removed = sorted(set(previous) - set(current))
+    for group in removed:
+        for name in previous[group]['files']:
+            (root / name).unlink(missing_ok=True)
+
+    manifest = {'built_at': timezone.now().isoformat(), 'groups': groups}
+    if rebuilt or removed or not (root / INDEX_NAME).exists():
+        write_index(root, manifest)
+    write_atomic(root / MANIFEST_NAME, lambda fh: fh.write(json.dumps(manifest, indent=2).encode()))
+    return rebuilt, unchanged, removed
@@ -0,0 +1,326 @@
+import gzip
+import hashlib
+import json
+import tempfile
+from datetime import datetime, timezone
+from unittest import mock
+from xml.etree import ElementTree
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from articles.models import Article, ArticleAuthor, Author
+from issues.models import Issue
+from journals.models import Announcement, Journal, Subject
+from media_files.models import Page
+from volumes.models import Volume
+
+from . import exports, feeds, oai, sitemaps
+
+
+NS = {
+    'oai': 'http://www.openarchives.org/OAI/2.0/',
+    'dc': 'http://purl.org/dc/elements/1.1/',
+    'jats': 'https://jats.nlm.nih.gov/ns/archiving/1.3/',
+}
+
+
+@override_settings(FRONTEND_URL='https://example.org')
+class OAIPMHTests(TestCase):
+    """GET /api/v1/oai/ (syndication/oai.py)."""
+
+    @classmethod
+    def setUpTestData(cls):
+        journal = Journal.objects.create(title='Journal of Tests', slug='tests', publisher='Test Press')
+        other = Journal.objects.create(title='Other', slug='other')
+        volume = Volume.objects.create(journal=journal, volume_number=1, year=2024)
+        issue = Issue.objects.create(volume=volume, issue_number=2)
+        author = Author.objects.create(first_name='Ada', last_name='Lovelace')
+        cls.articles = []
+        for i in range(5):
+            article = Article.objects.create(
+                title=f'Article {i}', slug=f'article-{i}', issue=issue, status='published',
+                doi=f'10.1234/a{i}', keywords=['engines'],
+            )
+            ArticleAuthor.objects.create(article=article, author=author, author_order=1)
+            cls.articles.append(article)
+        Article.objects.create(title='Elsewhere', slug='elsewhere', journal=other, status='archive')
+        Article.objects.create(title='Draft', slug='draft', journal=journal)
+        # Spread the datestamps over five days
+        for day, article in enumerate(cls.articles, start=1):
+            Article.objects.filter(pk=article.pk).update(
+                updated_at=datetime(2024, 1, day, 12, tzinfo=timezone.utc)
+            )
+
+    def oai(self, **params):
+        response = self.client.get('/api/v1/oai/', params)
+        self.assertEqual(response.status_code, 200)
+        return ElementTree.fromstring(b''.join(response.streaming_content))
+
+    def error_code(self, root):
+        error = root.find('oai:error', NS)
+        return error.get('code') if error is not None else None
+
+    def test_list_records_pages_with_resumption_tokens(self):
+        harvested = []
+        params = {'verb': 'ListRecords', 'metadataPrefix': 'oai_dc'}
+        with mock.patch.object(oai, 'PAGE_SIZE', 2):
+            for _ in range(10):
+                root = self.oai(**params)
+                harvested += [e.text for e in root.iterfind('.//dc:title', NS)]
+                token = root.find('.//oai:resumptionToken', NS)
+                if not (token is not None and token.text):
+                    break
+                params = {'verb': 'ListRecords', 'resumptionToken': token.text}
+        self.assertEqual(harvested, [f'Article {i}' for i in range(5)] + ['Elsewhere'])
+
+    def test_selective_harvesting(self):
+        root = self.oai(verb='ListIdentifiers', metadataPrefix='oai_dc', set='tests',
+                        **{'from': '2024-01-02', 'until': '2024-01-03'})
+        identifiers = [e.text for e in root.iterfind('.//oai:identifier', NS)]
+        self.assertEqual(identifiers, [oai.oai_identifier(a) for a in self.articles[1:3]])
+        self.assertEqual(root.find('.//oai:setSpec', NS).text, 'tests')
+
+    def test_get_record_in_jats(self):
+        identifier = oai.oai_identifier(self.articles[0])
+        root = self.oai(verb='GetRecord', metadataPrefix='jats', identifier=identifier)
+        front = root.find('.//jats:front', NS)
+        self.assertEqual(front.find('.//jats:article-id[@pub-id-type="doi"]', NS).text, '10.1234/a0')
+        self.assertEqual(front.find('.//jats:surname', NS).text, 'Lovelace')
+        self.assertEqual(front.find('.//jats:issue', NS).text, '2')
+        self.assertEqual(front.find('.//jats:publisher-name', NS).text, 'Test Press')
+
+    def test_protocol_errors(self):
+        self.assertEqual(self.error_code(self.oai(verb='Nope')), 'badVerb')
+        self.assertEqual(self.error_code(self.oai(verb='ListRecords')), 'badArgument')
+        self.assertEqual(self.error_code(self.oai(verb='ListRecords', metadataPrefix='marc')), 'cannotDisseminateFormat')
+        self.assertEqual(self.error_code(self.oai(verb='ListRecords', resumptionToken='forged')), 'badResumptionToken')
+        self.assertEqual(self.error_code(
+            self.oai(verb='ListRecords', metadataPrefix='oai_dc', **{'from': '2030-01-01'})
+        ), 'noRecordsMatch')
+        self.assertEqual(self.error_code(
+            self.oai(verb='GetRecord', metadataPrefix='oai_dc', identifier='oai:example.org:article/0')
+        ), 'idDoesNotExist')
+
+    def test_identify_and_sets(self):
+        root = self.oai(verb='Identify')
+        self.assertEqual(root.find('.//oai:earliestDatestamp', NS).text, '2024-01-01T12:00:00Z')
+        root = self.oai(verb='ListSets')
+        self.assertEqual([e.text for e in root.iterfind('.//oai:setSpec', NS)], ['other', 'tests'])
+
+
+class SitemapTests(TestCase):
+    """Incremental sitemap builds (syndication/sitemaps.py)."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.journal = Journal.objects.create(title='Journal of Tests', slug='tests')
+        volume = Volume.objects.create(journal=cls.journal, volume_number=1, year=2024)
+        issue = Issue.objects.create(volume=volume, issue_number=1)
+        for i in range(5):
+            Article.objects.create(title=f'Article {i}', slug=f'article-{i}', issue=issue, status='published')
+        Article.objects.create(title='Draft', slug='draft', issue=issue)
+
+    def setUp(self):
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        self.enterContext(override_settings(
+            MEDIA_ROOT=media_root.name, FRONTEND_URL='https://example.org',
+            SITEMAP_URL='https://example.org/media/sitemaps/',
+        ))
+        self.root = sitemaps.sitemap_root()
+
+    def urls(self, name):
+        with gzip.open(self.root / name) as fh:
+            return [e.text for e in ElementTree.parse(fh).iterfind('.//sm:loc', {'sm': sitemaps.XMLNS})]
+
+    def test_only_changed_groups_are_rebuilt(self):
+        group = f'journal-{self.journal.pk}'
+        with mock.patch.object(sitemaps, 'MAX_URLS_PER_SHARD', 4):
+            rebuilt, _, _ = sitemaps.build_sitemaps()
+            self.assertEqual(sorted(rebuilt), [group, 'site'])
+            # Home, volume list, volume, issue and five articles in shards of four
+            urls = self.urls(f'{group}-1.xml.gz') + self.urls(f'{group}-2.xml.gz') + self.urls(f'{group}-3.xml.gz')
+            self.assertEqual(len(urls), 9)
+            self.assertIn('https://example.org/tests/article/article-4', urls)
+
+            self.assertEqual(sitemaps.build_sitemaps(), ([], [group, 'site'], []))
+
+            Article.objects.filter(slug__startswith='article').exclude(slug='article-0').delete()
+            rebuilt, unchanged, _ = sitemaps.build_sitemaps()
+            self.assertEqual((rebuilt, unchanged), ([group], ['site']))
+            self.assertEqual(sorted(p.name for p in self.root.glob(f'{group}-*')), [f'{group}-1.xml.gz', f'{group}-2.xml.gz'])
+
+            # Two journal shards and the site pages in shards of four
+            index = ElementTree.parse(self.root / sitemaps.INDEX_NAME)
+            site_shards = -(-len(sitemaps.SITE_PATHS) // 4)
+            self.assertEqual(len(index.findall('.//{%s}sitemap' % sitemaps.XMLNS)), 2 + site_shards)
+
+        Journal.objects.filter(pk=self.journal.pk).update(is_active=False)
+        self.assertEqual(sitemaps.build_sitemaps()[2], [group])
+        self.assertFalse(list(self.root.glob(f'{group}-*')))
+
+    def test_pages_are_frontend_routes(self):
+        Page.objects.create(title='About us', slug='about-us')
+        Page.objects.create(title='About the journal', slug='about-j', journal=self.journal)
+        Announcement.objects.create(title='Launch', slug='launch', content='Hello', is_published=True)
+        sitemaps.build_sitemaps()
+
+        urls = [
+            url for name in sorted(p.name for p in self.root.glob('*.xml.gz'))
+            for url in self.urls(name)
+        ]
+        for url in [
+            'https://example.org/', 'https://example.org/about', 'https://example.org/contact',
+            'https://example.org/information/for-authors/authorship',
+            'https://example.org/news/launch', 'https://example.org/tests', 'https://example.org/tests/volumes',
+            'https://example.org/tests/volumes/1', 'https://example.org/tests/issue/1',
+        ]:
+            self.assertIn(url, urls)
+        # CMS pages have no frontend route of their own
+        self.assertFalse([url for url in urls if url.endswith(('/about-us', '/about-j'))])
+        self.assertEqual(len(urls), len(set(urls)))
+
+
+@override_settings(FRONTEND_URL='https://example.org')
+class FeedTests(TestCase):
+    """RSS/Atom feeds (syndication/feeds.py)."""
+
+    @classmethod
+    def setUpTestData(cls):
+        subject = Subject.objects.create(name='Physics', slug='physics')
+        cls.journal = Journal.objects.create(title='Journal of Tests', slug='tests')
+        cls.journal.subjects.add(subject)
+        other = Journal.objects.create(title='Other', slug='other')
+        cls.author = Author.objects.create(first_name='Ada', last_name='Lovelace')
+        for i in range(3):
+            article = Article.objects.create(
+                title=f'Article {i}', slug=f'article-{i}', journal=cls.journal, status='published',
+                published_date=datetime(2024, 1, i + 1).date(),
+            )
+            ArticleAuthor.objects.create(article=article, author=cls.author, author_order=1)
+        Article.objects.create(title='Elsewhere', slug='elsewhere', journal=other, status='published')
+        Article.objects.create(title='Draft', slug='draft', journal=cls.journal)
+
+    def setUp(self):
+        cache.clear()
+
+    def titles(self, response, path):
+        root = ElementTree.fromstring(response.content)
+        return [e.text for e in root.iterfind(path, {'atom': 'http://www.w3.org/2005/Atom'})]
+
+    def test_feeds_per_scope(self):
+        response = self.client.get('/api/v1/feeds/journals/tests/rss/')
+        self.assertEqual(response['Content-Type'], 'application/rss+xml; charset=utf-8')
+        self.assertEqual(self.titles(response, './channel/item/title'), ['Article 2', 'Article 1', 'Article 0'])
+
+        response = self.client.get('/api/v1/feeds/subjects/physics/atom/')
+        self.assertEqual(self.titles(response, './atom:entry/atom:title'), ['Article 2', 'Article 1', 'Article 0'])
+
+        response = self.client.get('/api/v1/feeds/rss/')
+        self.assertEqual(len(self.titles(response, './channel/item/title')), 4)
+        self.assertEqual(self.client.get('/api/v1/feeds/journals/nope/rss/').status_code, 404)
+
+    def test_articles_without_a_journal_are_not_listed(self):
+        orphan = Article.objects.create(title='Orphan', slug='orphan', status='published')
+        self.assertEqual(feeds.render_entries([orphan.pk]), {})
+
+        response = self.client.get('/api/v1/feeds/atom/')
+        root = ElementTree.fromstring(response.content)
+        entries = root.findall('atom:entry', {'atom': 'http://www.w3.org/2005/Atom'})
+        self.assertEqual(len(entries), 4)
+        for entry in entries:
+            self.assertTrue(entry.findtext('atom:id', namespaces={'atom': 'http://www.w3.org/2005/Atom'}))
+        self.assertNotIn('Orphan', self.titles(response, './atom:entry/atom:title'))
+
+    def test_entries_are_cached_and_refreshed(self):
+        self.client.get('/api/v1/feeds/journals/tests/atom/')
+        # Journal, article IDs - entries come from the cache
+        with self.assertNumQueries(2):
+            self.client.get('/api/v1/feeds/journals/tests/atom/')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.author.last_name = 'Byron'
+            self.author.save()
+        response = self.client.get('/api/v1/feeds/journals/tests/atom/')
+        self.assertIn(b'Ada Byron', response.content)
+
+    def test_conditional_get(self):
+        response = self.client.get('/api/v1/feeds/journals/tests/rss/')
+        self.assertEqual(response.status_code, 200)
+        response = self.client.get('/api/v1/feeds/journals/tests/rss/', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+        response = self.client.get('/api/v1/feeds/journals/tests/rss/', HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        self.assertEqual(response.status_code, 304)
+
+
+class MetadataExportTests(TestCase):
+    """Per-journal metadata dumps (syndication/exports.py)."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.journal = Journal.objects.create(title='Journal of Tests', slug='tests')
+        cls.other = Journal.objects.create(title='Other', slug='other')
+        volume = Volume.objects.create(journal=cls.journal, volume_number=1, year=2024)
+        issue = Issue.objects.create(volume=volume, issue_number=1)
+        cls.author = Author.objects.create(first_name='Ada', last_name='Lovelace', email='ada@example.org')
+        for i in range(3):
+            article = Article.objects.create(title=f'Article {i}', slug=f'article-{i}', issue=issue, status='published')
+            ArticleAuthor.objects.create(article=article, author=cls.author, author_order=1)
+        Article.objects.create(title='Draft', slug='draft', issue=issue)
+
+    def setUp(self):
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        self.enterContext(override_settings(MEDIA_ROOT=media_root.name))
+        self.root = exports.export_root()
+
+    def records(self, name):
+        with gzip.open(self.root / name, 'rt') as fh:
+            return [json.loads(line) for line in fh]
+
+    def test_dump_contents_and_manifest(self):
+        exported, _, _ = exports.export_metadata()
+        self.assertEqual(sorted(entry['slug'] for entry in exported), ['other', 'tests'])
+
+        records = self.records('tests.jsonl.gz')
+        self.assertEqual([r['type'] for r in records], ['journal', 'volume', 'issue', 'author'] + ['article'] * 3)
+        self.assertNotIn('email', records[3])
+        self.assertEqual(records[4]['authors'], [{'author_id': self.author.pk, 'order': 1, 'is_corresponding': False}])
+
+        manifest = json.loads((self.root / exports.MANIFEST_NAME).read_text())
+        entry = next(entry for entry in manifest['journals'] if entry['slug'] == 'tests')
+        self.assertEqual(entry['sha256'], hashlib.sha256((self.root / 'tests.jsonl.gz').read_bytes()).hexdigest())
+        self.assertEqual(entry['records']['article'], 3)
+
+    def test_only_changed_journals_are_rewritten(self):
+        exports.export_metadata()
+        self.assertEqual(exports.export_metadata()[0], [])
+
+        self.author.last_name = 'Byron'
+        self.author.save()
+        exported, unchanged, _ = exports.export_metadata()
+        self.assertEqual([entry['slug'] for entry in exported], ['tests'])
+        self.assertEqual([entry['slug'] for entry in unchanged], ['other'])
+        self.assertEqual(self.records('tests.jsonl.gz')[3]['last_name'], 'Byron')
+
+        # Author rows have no updated_at of their own
+        second = Author.objects.create(first_name='Alan', last_name='Turing')
+        article = Article.objects.get(slug='article-0')
+        ArticleAuthor.objects.create(article=article, author=second, author_order=2)
+        exports.export_metadata()
+        ArticleAuthor.objects.filter(article=article, author=self.author).update(author_order=2)
+        ArticleAuthor.objects.filter(article=article, author=second).update(author_order=1, is_corresponding=True)
+        exported, _, _ = exports.export_metadata()
+        self.assertEqual([entry['slug'] for entry in exported], ['tests'])
+        record = next(r for r in self.records('tests.jsonl.gz') if r['type'] == 'article' and r['id'] == article.pk)
+        self.assertEqual(
+            record['authors'],
+            [{'author_id': second.pk, 'order': 1, 'is_corresponding': True},
+             {'author_id': self.author.pk, 'order': 2, 'is_corresponding': False}]
+        )
+
+        Journal.objects.filter(pk=self.other.pk).update(is_active=False)
+        self.assertEqual([entry['slug'] for entry in exports.export_metadata()[2]], ['other'])
+        self.assertFalse((self.root / 'other.jsonl.gz').exists())
@@ -0,0 +1,16 @@
+"""URL configuration for syndication app."""
+
+from django.urls import path
+from . import views
+
+app_name = 'syndication'
+
+urlpatterns = [
+    # Metadata harvesting
+    path('oai/', views.OAIPMHView.as_view(), name='oai_pmh'),
+    
+    # RSS / Atom feeds
+    path('feeds/<str:output>/', views.FeedView.as_view(), name='feed'),
+    path('feeds/journals/<slug:slug>/<str:output>/', views.FeedView.as_view(scope='journal'), name='journal_feed'),
+    path('feeds/subjects/<slug:slug>/<str:output>/', views.FeedView.as_view(scope='subject'), name='subject_feed'),
+]
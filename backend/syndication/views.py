@@ -0,0 +1,84 @@
+"""Views for syndication app."""
+
+from django.http import Http404, HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.decorators import method_decorator
+from django.utils.http import http_date
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+
+from . import feeds, oai
+
+
+FEED_MAX_AGE = 60 * 5
+
+
+# =============================================================================
+# OAI-PMH
+# =============================================================================
+
+@method_decorator(csrf_exempt, name='dispatch')
+class OAIPMHView(View):
+    """
+    OAI-PMH 2.0 endpoint for metadata harvesters (see syndication/oai.py).
+    
+    GET  /api/v1/oai/?verb=ListRecords&metadataPrefix=oai_dc[&set=&from=&until=]
+    POST /api/v1/oai/ (application/x-www-form-urlencoded, same arguments)
+    
+    Verbs: Identify, ListMetadataFormats, ListSets, ListIdentifiers,
+    ListRecords, GetRecord. Metadata formats: oai_dc, jats.
+    """
+    
+    def get(self, request):
+        return self.respond(request, request.GET)
+    
+    def post(self, request):
+        return self.respond(request, request.POST)
+    
+    def respond(self, request, params):
+        base_url = request.build_absolute_uri(request.path)
+        chunks = oai.respond(params, base_url)
+        return StreamingHttpResponse(
+            (chunk.encode('utf-8') for chunk in chunks),
+            content_type='text/xml; charset=utf-8'
+        )
+
+
+# =============================================================================
+# Feeds
+# =============================================================================
+
+class FeedView(View):
+    """
+    RSS 2.0 / Atom feed of the latest articles (see syndication/feeds.py).
+    
+    GET /api/v1/feeds/{rss|atom}/
+    GET /api/v1/feeds/journals/{journal_slug}/{rss|atom}/
+    GET /api/v1/feeds/subjects/{subject_slug}/{rss|atom}/
+    
+    Supports conditional GET (ETag / Last-Modified).
+    """
+    scope = 'site'
+    
+    def get(self, request, output, slug=None):
+        if output not in feeds.FORMATS:
+            raise Http404('No feed matches the given query.')
+        if self.scope == 'site':
+            feed = feeds.Feed.site()
+        else:
+            feed = getattr(feeds.Feed, self.scope)(slug)
+            if feed is None:
+                raise Http404('No feed matches the given query.')
+        
+        content, last_modified = feed.render(output, request.build_absolute_uri(request.path))
+        etag = feeds.etag(content)
+        # Whole seconds, as If-Modified-Since has no finer resolution
+        last_modified = int(last_modified.timestamp()) if last_modified else None
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = HttpResponse(content, content_type=feeds.FORMATS[output])
+        response['ETag'] = etag
+        if last_modified:
+            response['Last-Modified'] = http_date(last_modified)
+        patch_cache_control(response, public=True, max_age=FEED_MAX_AGE)
+        return response
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.9 on 2026-10-19 06:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('volumes', '0002_volume_is_archived'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='volume',
+            name='total_articles',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Number of published/archived articles in this volume or its issues (maintained automatically)'),
+        ),
+        migrations.AddField(
+            model_name='volume',
+            name='total_issues',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Number of active issues (maintained automatically)'),
+        ),
+    ]
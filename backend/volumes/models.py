@@ -7,8 +7,10 @@ URL pattern: /{journal_slug}/volume/{volume_number}
 
 from django.db import models
 
+from backend.counterfields import CounterFieldsMixin
 
-class Volume(models.Model):
+
+class Volume(CounterFieldsMixin, models.Model):
     """
     A volume represents a yearly or periodic collection of issues.
     
@@ -55,6 +57,19 @@ class Volume(models.Model):
         help_text='Is this volume archived?'
     )
     
+    # Denormalized counters, kept up to date by journals/counters.py
+    total_issues = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        help_text='Number of active issues (maintained automatically)'
+    )
+    total_articles = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        help_text='Number of published/archived articles in this volume or its issues (maintained automatically)'
+    )
+    COUNTER_FIELDS = ('total_issues', 'total_articles')
+    
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
@@ -73,17 +88,3 @@ class Volume(models.Model):
     def display_name(self):
         """Human-readable volume name."""
         return f'Volume {self.volume_number} ({self.year})'
-    
-    @property
-    def total_issues(self):
-        """Count of issues in this volume."""
-        return self.issues.filter(is_active=True).count()
-    
-    @property
-    def total_articles(self):
-        """Count of articles across all issues in this volume."""
-        from articles.models import Article
-        return Article.objects.filter(
-            models.Q(issue__volume=self) | models.Q(volume=self),
-            status__in=['published', 'archive']
-        ).count()
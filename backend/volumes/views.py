@@ -7,6 +7,7 @@ from django.shortcuts import get_object_or_404
 
 from .models import Volume
 from journals.models import Journal
+from journals.resolvers import volume_or_404
 from .serializers import (
     VolumeListSerializer, VolumeDetailSerializer,
     VolumeCreateUpdateSerializer,
@@ -80,14 +81,10 @@ class VolumeByNumberView(generics.RetrieveAPIView):
     serializer_class = VolumeDetailSerializer
     
     def get_object(self):
-        journal_slug = self.kwargs['journal_slug']
-        volume_number = self.kwargs['volume_number']
-        journal = get_object_or_404(Journal, slug=journal_slug, is_active=True)
-        return get_object_or_404(
-            Volume,
-            journal=journal,
-            volume_number=volume_number,
-            is_active=True
+        return volume_or_404(
+            Volume.objects.all(),
+            self.kwargs['journal_slug'],
+            self.kwargs['volume_number']
         )
 
 
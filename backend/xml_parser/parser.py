@@ -75,6 +75,7 @@ class ParsedArticle:
     title: str = ''
     doi: str = ''
     article_id_code: str = ''
+    article_ids: List[Tuple[str, str]] = field(default_factory=list)
     article_type: str = ''
     abstract: str = ''
     keywords: List[str] = field(default_factory=list)
@@ -218,6 +219,7 @@ class JATSParser(BaseXMLParser):
             result.title = self._parse_title()
             result.doi = self._parse_doi()
             result.article_id_code = self._parse_article_id_code()
+            result.article_ids = self._parse_article_ids()
             result.article_type = self.root.get('article-type', '')
             result.abstract = self._parse_abstract_text()
             result.keywords = self._parse_keywords()
@@ -343,6 +345,19 @@ class JATSParser(BaseXMLParser):
             return id_elem.text.strip()
         return ''
 
+    def _parse_article_ids(self) -> List[Tuple[str, str]]:
+        """Extract every (pub-id-type, value) pair from article-meta's article-ids."""
+        article_meta = self._find_any(self.root, ['.//front/article-meta', './/article-meta'])
+        if article_meta is None:
+            return []
+
+        article_ids = []
+        for elem in article_meta.findall('article-id'):
+            value = etree.tostring(elem, method='text', encoding='unicode').strip()
+            if value:
+                article_ids.append((elem.get('pub-id-type', '').strip().lower(), value))
+        return article_ids
+
     def _parse_date(self, date_type: str) -> Optional[str]:
         """Extract a date of a specific type (received, accepted, etc.)."""
         # For pub-date
@@ -220,6 +220,9 @@ class XMLProcessingService:
             
             self.article.save()
             
+            # Index every article-id of the XML for identifier lookups
+            self.article.sync_identifiers(xml_ids=parsed.article_ids)
+            
             # Create Author records
             self._create_author_records(parsed.authors, force_update=update_meta)
             
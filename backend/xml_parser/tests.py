@@ -1,3 +1,85 @@
 from django.test import TestCase
 
-# Create your tests here.
+from articles.models import Article, ArticleIdentifier
+from journals.models import Journal
+
+from .parser import parse_article_xml
+from .services import process_article_xml
+
+
+JATS_ARTICLE = """<?xml version="1.0" encoding="UTF-8"?>
+<article article-type="research-article" dtd-version="1.2">
+  <front>
+    <article-meta>
+      <article-id pub-id-type="doi">10.1234/Test.2024.001</article-id>
+      <article-id pub-id-type="publisher-id">JT-2024-001</article-id>
+      <article-id pub-id-type="pmid">38000001</article-id>
+      <article-id pub-id-type="PMCID"> PMC1000001 </article-id>
+      <title-group><article-title>Parsing Articles</article-title></title-group>
+      <contrib-group>
+        <contrib contrib-type="author">
+          <name><surname>Lovelace</surname><given-names>Ada</given-names></name>
+        </contrib>
+      </contrib-group>
+      <fpage>10</fpage>
+      <lpage>19</lpage>
+      <abstract><p>An abstract that is long enough to be kept.</p></abstract>
+    </article-meta>
+  </front>
+  <body>
+    <sec id="s1"><title>Introduction</title><p>Text.</p></sec>
+  </body>
+  <back>
+    <ref-list>
+      <ref id="r1">
+        <element-citation>
+          <article-title>Cited work</article-title>
+          <pub-id pub-id-type="doi">10.9999/cited</pub-id>
+          <article-id pub-id-type="pmid">11111111</article-id>
+        </element-citation>
+      </ref>
+    </ref-list>
+  </back>
+</article>
+"""
+
+
+class JATSParserTests(TestCase):
+
+    def test_parse_collects_article_meta_ids(self):
+        parsed = parse_article_xml(JATS_ARTICLE)
+
+        self.assertTrue(parsed.success, parsed.errors)
+        self.assertEqual(parsed.title, 'Parsing Articles')
+        self.assertEqual(parsed.doi, '10.1234/Test.2024.001')
+        self.assertEqual(parsed.article_id_code, 'JT-2024-001')
+        # IDs inside references are not the article's own
+        self.assertEqual(parsed.article_ids, [
+            ('doi', '10.1234/Test.2024.001'),
+            ('publisher-id', 'JT-2024-001'),
+            ('pmid', '38000001'),
+            ('pmcid', 'PMC1000001'),
+        ])
+
+    def test_parse_without_article_meta(self):
+        parsed = parse_article_xml('<article article-type="editorial"><body><p>Hi</p></body></article>')
+
+        self.assertTrue(parsed.success, parsed.errors)
+        self.assertEqual(parsed.article_ids, [])
+
+    def test_processing_indexes_xml_ids(self):
+        journal = Journal.objects.create(title='Journal of Tests', slug='tests')
+        article = Article.objects.create(title='Draft', slug='draft', journal=journal)
+
+        result = process_article_xml(article.pk, JATS_ARTICLE)
+
+        self.assertTrue(result['success'], result['errors'])
+        resolved = ArticleIdentifier.objects.resolve(
+            ['38000001', 'pmc1000001', 'https://doi.org/10.1234/test.2024.001']
+        )
+        self.assertEqual({value: row.article_id for value, row in resolved.items()}, {
+            '38000001': article.pk,
+            'pmc1000001': article.pk,
+            'https://doi.org/10.1234/test.2024.001': article.pk,
+        })
+        self.assertEqual(resolved['38000001'].scheme, 'pmid')